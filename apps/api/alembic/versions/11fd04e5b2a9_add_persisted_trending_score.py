@@ -0,0 +1,58 @@
+"""add persisted trending score
+
+Revision ID: 11fd04e5b2a9
+Revises: 5c7b6b9c7a59
+Create Date: 2026-10-18 09:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "11fd04e5b2a9"
+down_revision: Union[str, Sequence[str], None] = "5c7b6b9c7a59"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "posts",
+        sa.Column(
+            "trending_score",
+            sa.Float(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "posts",
+        sa.Column("trending_scored_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+
+    # Initial scoring pass so existing posts are ranked immediately
+    op.execute(
+        """
+        UPDATE posts
+        SET trending_score = log(like_count * 2 + reply_count * 3 + 1)
+            / power(extract(epoch FROM now() - created_at) / 3600 + 2, 1.1),
+            trending_scored_at = now()
+        WHERE status = 'active'
+        """
+    )
+
+    op.create_index(
+        "idx_posts_status_trending",
+        "posts",
+        ["status", "trending_score", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_posts_status_trending", table_name="posts")
+    op.drop_column("posts", "trending_scored_at")
+    op.drop_column("posts", "trending_score")
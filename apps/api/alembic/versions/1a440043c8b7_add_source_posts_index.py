@@ -0,0 +1,60 @@
+"""add source posts index
+
+Revision ID: 1a440043c8b7
+Revises: 5f10cb740f79
+Create Date: 2026-10-18 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1a440043c8b7"
+down_revision: Union[str, Sequence[str], None] = "5f10cb740f79"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_evidence_source_id", "evidence", ["source_id"])
+
+    op.create_table(
+        "source_posts",
+        sa.Column(
+            "source_id",
+            sa.Uuid(),
+            sa.ForeignKey("sources.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "post_id",
+            sa.Uuid(),
+            sa.ForeignKey("posts.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("evidence_count", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+    op.create_index(
+        "ix_source_posts_post_source",
+        "source_posts",
+        ["post_id", "source_id"],
+    )
+
+    op.execute(
+        """
+        INSERT INTO source_posts (source_id, post_id, evidence_count)
+        SELECT source_id, post_id, count(*)
+        FROM evidence
+        WHERE source_id IS NOT NULL
+        GROUP BY source_id, post_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_source_posts_post_source", table_name="source_posts")
+    op.drop_table("source_posts")
+    op.drop_index("ix_evidence_source_id", table_name="evidence")
@@ -0,0 +1,62 @@
+"""add post truth aggregates
+
+Revision ID: 2d38c66306a0
+Revises: ae0403ea886f
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d38c66306a0"
+down_revision: Union[str, Sequence[str], None] = "ae0403ea886f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "posts",
+        sa.Column("support_weight", sa.Float(), server_default=sa.text("0"), nullable=False),
+    )
+    op.add_column(
+        "posts",
+        sa.Column("contradict_weight", sa.Float(), server_default=sa.text("0"), nullable=False),
+    )
+    op.add_column(
+        "posts",
+        sa.Column("evidence_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+
+    # Seed aggregates from existing evidence (same rules as truth_engine)
+    op.execute(
+        """
+        UPDATE posts p
+        SET support_weight = agg.support,
+            contradict_weight = agg.contradict,
+            evidence_count = agg.n,
+            truth_score = greatest(0, least((agg.support - agg.contradict + 1) / 2, 1)),
+            truth_confidence = least(agg.n / 5.0, 1)
+        FROM (
+            SELECT post_id,
+                   sum(CASE WHEN direction = 'supports'
+                       THEN coalesce(nullif(credibility_score, 0), 0.3) ELSE 0 END) AS support,
+                   sum(CASE WHEN direction = 'supports'
+                       THEN 0 ELSE coalesce(nullif(credibility_score, 0), 0.3) END) AS contradict,
+                   count(*) AS n
+            FROM evidence
+            GROUP BY post_id
+        ) agg
+        WHERE agg.post_id = p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "evidence_count")
+    op.drop_column("posts", "contradict_weight")
+    op.drop_column("posts", "support_weight")
@@ -0,0 +1,28 @@
+"""add evidence http validators
+
+Revision ID: 427a6f97d1fb
+Revises: fa69bf0b533f
+Create Date: 2026-10-18 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "427a6f97d1fb"
+down_revision: Union[str, Sequence[str], None] = "fa69bf0b533f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("evidence", sa.Column("source_etag", sa.Text(), nullable=True))
+    op.add_column("evidence", sa.Column("source_last_modified", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("evidence", "source_last_modified")
+    op.drop_column("evidence", "source_etag")
@@ -0,0 +1,138 @@
+"""partition notifications by month
+
+Revision ID: 4c7efe27e795
+Revises: 56a7ce846f5f
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c7efe27e795"
+down_revision: Union[str, Sequence[str], None] = "56a7ce846f5f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = "id, user_id, type, payload, group_key, actor_count, read_at, created_at"
+
+LEGACY_INDEXES = [
+    "ix_notifications_created_at",
+    "ix_notifications_user_id",
+    "ix_notifications_user_unread",
+    "ix_notifications_user_created",
+    "ux_notifications_open_group",
+]
+
+
+def _create_indexes(*, partitioned: bool) -> None:
+    if partitioned:
+        op.create_index(
+            "ix_notifications_user_unread",
+            "notifications",
+            ["user_id"],
+            postgresql_where=sa.text("read_at IS NULL"),
+        )
+    else:
+        op.create_index(op.f("ix_notifications_created_at"), "notifications", ["created_at"])
+        op.create_index(op.f("ix_notifications_user_id"), "notifications", ["user_id"])
+        op.create_index("ix_notifications_user_unread", "notifications", ["user_id", "read_at"])
+
+    op.create_index(
+        "ix_notifications_user_created",
+        "notifications",
+        ["user_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ux_notifications_open_group",
+        "notifications",
+        ["user_id", "group_key", "created_at"],
+        unique=True,
+        postgresql_where=sa.text("read_at IS NULL AND group_key IS NOT NULL"),
+    )
+
+
+def _set_aside_current_table() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_old")
+    op.execute("ALTER TABLE notifications_old RENAME CONSTRAINT notifications_pkey TO notifications_old_pkey")
+
+    for name in LEGACY_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    _set_aside_current_table()
+
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            id uuid NOT NULL,
+            user_id uuid NOT NULL,
+            type text NOT NULL,
+            payload json NOT NULL,
+            group_key text,
+            actor_count integer NOT NULL DEFAULT 1,
+            read_at timestamptz,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT notifications_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    _create_indexes(partitioned=True)
+
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+
+    # Monthly partitions (UTC) from the oldest row through three months
+    # ahead; app.jobs.notification_partitions keeps extending them
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month timestamp := date_trunc(
+                'month',
+                coalesce((SELECT min(created_at) FROM notifications_old), now()) AT TIME ZONE 'UTC'
+            );
+            last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months';
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_p' || to_char(month, 'YYYYMM'),
+                    month AT TIME ZONE 'UTC',
+                    (month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$;
+        """
+    )
+
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_old")
+    op.execute("DROP TABLE notifications_old")
+
+
+def downgrade() -> None:
+    _set_aside_current_table()
+
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("type", sa.Text(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("group_key", sa.Text(), nullable=True),
+        sa.Column("actor_count", sa.Integer(), server_default=sa.text("1"), nullable=False),
+        sa.Column("read_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    _create_indexes(partitioned=False)
+
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_old")
+
+    # Drops every partition with it; archived partitions are left alone
+    op.execute("DROP TABLE notifications_old")
@@ -0,0 +1,40 @@
+"""add notification coalescing
+
+Revision ID: 56a7ce846f5f
+Revises: b3ec4d944ea6
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "56a7ce846f5f"
+down_revision: Union[str, Sequence[str], None] = "b3ec4d944ea6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("notifications", sa.Column("group_key", sa.Text(), nullable=True))
+    op.add_column(
+        "notifications",
+        sa.Column("actor_count", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+
+    op.create_index(
+        "ux_notifications_open_group",
+        "notifications",
+        ["user_id", "group_key", "created_at"],
+        unique=True,
+        postgresql_where=sa.text("read_at IS NULL AND group_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_notifications_open_group", table_name="notifications")
+    op.drop_column("notifications", "actor_count")
+    op.drop_column("notifications", "group_key")
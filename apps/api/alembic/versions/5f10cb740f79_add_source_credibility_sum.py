@@ -0,0 +1,51 @@
+"""add source credibility sum
+
+Revision ID: 5f10cb740f79
+Revises: 2d38c66306a0
+Create Date: 2026-10-18 14:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f10cb740f79"
+down_revision: Union[str, Sequence[str], None] = "2d38c66306a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sources",
+        sa.Column("credibility_sum", sa.Float(), server_default=sa.text("0"), nullable=False),
+    )
+
+    # Seed running aggregates from existing citations
+    op.execute(
+        """
+        UPDATE sources s
+        SET credibility_sum = agg.credibility,
+            citation_count = agg.n,
+            tamper_events = agg.tampered,
+            reputation_score = agg.credibility / agg.n,
+            last_evaluated_at = now()
+        FROM (
+            SELECT source_id,
+                   sum(coalesce(nullif(credibility_score, 0), 0.3)) AS credibility,
+                   sum(CASE WHEN tampered THEN 1 ELSE 0 END) AS tampered,
+                   count(*) AS n
+            FROM evidence
+            WHERE source_id IS NOT NULL
+            GROUP BY source_id
+        ) agg
+        WHERE agg.source_id = s.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("sources", "credibility_sum")
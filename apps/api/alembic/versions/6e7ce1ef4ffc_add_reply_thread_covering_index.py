@@ -0,0 +1,56 @@
+"""add reply thread covering index
+
+Revision ID: 6e7ce1ef4ffc
+Revises: 11fd04e5b2a9
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e7ce1ef4ffc"
+down_revision: Union[str, Sequence[str], None] = "11fd04e5b2a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Resync the denormalized counter before listings start trusting it
+    op.execute(
+        """
+        UPDATE replies
+        SET like_count = counts.like_count
+        FROM (
+            SELECT reply_id, count(*) AS like_count
+            FROM reply_likes
+            GROUP BY reply_id
+        ) AS counts
+        WHERE replies.id = counts.reply_id
+          AND replies.like_count <> counts.like_count
+        """
+    )
+    op.execute(
+        """
+        UPDATE replies
+        SET like_count = 0
+        WHERE like_count <> 0
+          AND NOT EXISTS (
+              SELECT 1 FROM reply_likes WHERE reply_likes.reply_id = replies.id
+          )
+        """
+    )
+
+    op.create_index(
+        "idx_replies_post_parent_status_created",
+        "replies",
+        ["post_id", "parent_reply_id", "status", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_replies_post_parent_status_created", table_name="replies")
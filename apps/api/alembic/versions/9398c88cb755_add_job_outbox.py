@@ -0,0 +1,43 @@
+"""add job outbox
+
+Revision ID: 9398c88cb755
+Revises: ac97c48a3ec5
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9398c88cb755"
+down_revision: Union[str, Sequence[str], None] = "ac97c48a3ec5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_outbox",
+        sa.Column("id", sa.UUID(), primary_key=True),
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("idempotency_key", sa.Text(), nullable=True),
+        sa.Column("coalesce_key", sa.Text(), nullable=True),
+        sa.Column("max_attempts", sa.Integer(), nullable=True),
+        sa.Column("delay_seconds", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_job_outbox_created_at", "job_outbox", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_outbox_created_at", table_name="job_outbox")
+    op.drop_table("job_outbox")
@@ -0,0 +1,40 @@
+"""make evidence.archive_version nullable
+
+Revision ID: 9a7de8c5d978
+Revises: 4c7efe27e795
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a7de8c5d978"
+down_revision: Union[str, Sequence[str], None] = "4c7efe27e795"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column("evidence", "archive_version", existing_type=sa.Integer(), nullable=True)
+
+    # Rows that defaulted to 1 without ever being archived
+    op.execute(
+        """
+        UPDATE evidence e
+        SET archive_version = NULL
+        WHERE NOT EXISTS (
+            SELECT 1 FROM archive_versions v
+            WHERE v.source_url = e.source_url
+              AND v.version = e.archive_version
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE evidence SET archive_version = 1 WHERE archive_version IS NULL")
+    op.alter_column("evidence", "archive_version", existing_type=sa.Integer(), nullable=False)
@@ -0,0 +1,57 @@
+"""drop notifications default partition
+
+Revision ID: ac97c48a3ec5
+Revises: 9a7de8c5d978
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ac97c48a3ec5"
+down_revision: Union[str, Sequence[str], None] = "9a7de8c5d978"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = "id, user_id, type, payload, group_key, actor_count, read_at, created_at"
+
+
+def upgrade() -> None:
+    # A default partition rules out an ordered Append for inbox reads;
+    # the API (app.services.notification_partitions) keeps months created ahead instead
+    op.execute("ALTER TABLE notifications DETACH PARTITION notifications_default")
+
+    # Give any rows that landed there a monthly partition of their own
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month timestamp;
+        BEGIN
+            FOR month IN
+                SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')
+                FROM notifications_default
+            LOOP
+                IF to_regclass('notifications_p' || to_char(month, 'YYYYMM')) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                        'notifications_p' || to_char(month, 'YYYYMM'),
+                        month AT TIME ZONE 'UTC',
+                        (month + interval '1 month') AT TIME ZONE 'UTC'
+                    );
+                END IF;
+            END LOOP;
+        END $$;
+        """
+    )
+
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_default")
+    op.execute("DROP TABLE notifications_default")
+
+
+def downgrade() -> None:
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
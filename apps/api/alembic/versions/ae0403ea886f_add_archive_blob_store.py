@@ -0,0 +1,74 @@
+"""add archive blob store
+
+Revision ID: ae0403ea886f
+Revises: 427a6f97d1fb
+Create Date: 2026-10-18 13:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ae0403ea886f"
+down_revision: Union[str, Sequence[str], None] = "427a6f97d1fb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "archive_blobs",
+        sa.Column("content_hash", sa.String(), primary_key=True),
+        sa.Column("codec", sa.String(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "base_hash",
+            sa.String(),
+            sa.ForeignKey("archive_blobs.content_hash"),
+            nullable=True,
+        ),
+        sa.Column("chain_depth", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("raw_size", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+    op.create_table(
+        "archive_versions",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("source_url", sa.Text(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "content_hash",
+            sa.String(),
+            sa.ForeignKey("archive_blobs.content_hash"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.UniqueConstraint("source_url", "version", name="uq_archive_versions_url_version"),
+    )
+    op.create_index(
+        "ix_archive_versions_content_hash",
+        "archive_versions",
+        ["content_hash"],
+    )
+
+    # Existing archived_content is moved over by app.jobs.backfill_archive_store
+
+
+def downgrade() -> None:
+    op.drop_index("ix_archive_versions_content_hash", table_name="archive_versions")
+    op.drop_table("archive_versions")
+    op.drop_table("archive_blobs")
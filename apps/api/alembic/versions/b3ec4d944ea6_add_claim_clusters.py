@@ -0,0 +1,75 @@
+"""add claim clusters
+
+Revision ID: b3ec4d944ea6
+Revises: bbe139329386
+Create Date: 2026-10-18 16:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3ec4d944ea6"
+down_revision: Union[str, Sequence[str], None] = "bbe139329386"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Widen the membership index so member pages are keyset scans
+    op.drop_index("idx_posts_claim_cluster_id", table_name="posts")
+    op.create_index(
+        "idx_posts_claim_cluster_created",
+        "posts",
+        ["claim_cluster_id", "created_at", "id"],
+    )
+
+    op.create_table(
+        "claim_clusters",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("member_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("support_weight", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.Column("contradict_weight", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.Column("evidence_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "last_activity_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_claim_clusters_last_activity_at",
+        "claim_clusters",
+        ["last_activity_at"],
+    )
+
+    op.execute(
+        """
+        INSERT INTO claim_clusters
+            (id, member_count, support_weight, contradict_weight, evidence_count,
+             created_at, last_activity_at)
+        SELECT claim_cluster_id, count(*) FILTER (WHERE status = 'active'), sum(support_weight), sum(contradict_weight),
+               sum(evidence_count), coalesce(min(created_at), now()),
+               coalesce(max(updated_at), now())
+        FROM posts
+        WHERE claim_cluster_id IS NOT NULL
+        GROUP BY claim_cluster_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_claim_clusters_last_activity_at", table_name="claim_clusters")
+    op.drop_table("claim_clusters")
+    op.drop_index("idx_posts_claim_cluster_created", table_name="posts")
+    op.create_index("idx_posts_claim_cluster_id", "posts", ["claim_cluster_id"])
@@ -0,0 +1,61 @@
+"""add claim minhash index
+
+Revision ID: bbe139329386
+Revises: 1a440043c8b7
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "bbe139329386"
+down_revision: Union[str, Sequence[str], None] = "1a440043c8b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_posts_claim_cluster_id", "posts", ["claim_cluster_id"])
+
+    op.create_table(
+        "claim_signatures",
+        sa.Column(
+            "post_id",
+            sa.Uuid(),
+            sa.ForeignKey("posts.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+    op.create_table(
+        "claim_lsh_buckets",
+        sa.Column("band", sa.Integer(), primary_key=True),
+        sa.Column("bucket", sa.BigInteger(), primary_key=True),
+        sa.Column(
+            "post_id",
+            sa.Uuid(),
+            sa.ForeignKey("posts.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+    op.create_index("ix_claim_lsh_buckets_post_id", "claim_lsh_buckets", ["post_id"])
+
+    # Existing claims are indexed by app.jobs.backfill_claim_clusters
+
+
+def downgrade() -> None:
+    op.drop_index("ix_claim_lsh_buckets_post_id", table_name="claim_lsh_buckets")
+    op.drop_table("claim_lsh_buckets")
+    op.drop_table("claim_signatures")
+    op.drop_index("idx_posts_claim_cluster_id", table_name="posts")
@@ -0,0 +1,31 @@
+"""add keyset pagination indexes
+
+Revision ID: da301212e895
+Revises: 6e7ce1ef4ffc
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "da301212e895"
+down_revision: Union[str, Sequence[str], None] = "6e7ce1ef4ffc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notifications_user_created",
+        "notifications",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_user_created", table_name="notifications")
@@ -0,0 +1,62 @@
+"""add evidence archive status
+
+Revision ID: fa69bf0b533f
+Revises: da301212e895
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "fa69bf0b533f"
+down_revision: Union[str, Sequence[str], None] = "da301212e895"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+archive_status = sa.Enum(
+    "pending",
+    "archived",
+    "failed",
+    "skipped",
+    name="archive_status",
+)
+
+
+def upgrade() -> None:
+    archive_status.create(op.get_bind(), checkfirst=True)
+
+    op.add_column(
+        "evidence",
+        sa.Column(
+            "archive_status",
+            archive_status,
+            server_default="pending",
+            nullable=False,
+        ),
+    )
+    op.add_column("evidence", sa.Column("weight", sa.Float(), nullable=True))
+    op.add_column("evidence", sa.Column("archive_url", sa.Text(), nullable=True))
+
+    # Rows created before the pipeline were archived inline (or not at all)
+    op.execute(
+        """
+        UPDATE evidence
+        SET archive_status = CASE
+            WHEN source_url IS NULL THEN 'skipped'::archive_status
+            WHEN content_hash IS NOT NULL THEN 'archived'::archive_status
+            ELSE 'failed'::archive_status
+        END
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("evidence", "archive_url")
+    op.drop_column("evidence", "weight")
+    op.drop_column("evidence", "archive_status")
+    archive_status.drop(op.get_bind(), checkfirst=True)
@@ -1,11 +1,29 @@
-async def build_reply_tree(replies):
-    reply_map = {r.id: r for r in replies}
+async def build_reply_tree(replies, max_depth=None):
+    """
+    Assemble a flat reply window into a tree in one pass.
+
+    `replies` must be ordered parents-before-children (e.g. by depth, then
+    created_at). Replies at `max_depth` keep children=None so clients know
+    to lazy-load them.
+    """
+    reply_map = {}
     tree = []
+
     for reply in replies:
+        depth = getattr(reply, "depth", None)
+
+        if max_depth is not None and depth is not None and depth >= max_depth:
+            reply.children = None
+        else:
+            reply.children = []
+
+        reply_map[reply.id] = reply
+
         if reply.parent_reply_id:
             parent = reply_map.get(reply.parent_reply_id)
-            if parent:
+            if parent and parent.children is not None:
                 parent.children.append(reply)
         else:
             tree.append(reply)
+
     return tree
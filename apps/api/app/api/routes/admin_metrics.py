@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends
+
+from app.core.auth.admin import require_admin
+from app.services.feed_cache import get_feed_cache_stats
+from app.core.job_queue import get_queue_stats
+from app.core.http_client import get_http_client_stats
+from app.services.fetch_cache import get_fetch_cache_stats
+from app.services.notification_stream import get_notification_stream_stats
+
+router = APIRouter(prefix="/admin/metrics", tags=["admin-metrics"])
+
+
+@router.get("/feed-cache")
+async def feed_cache_metrics(
+    admin=Depends(require_admin),
+):
+    return get_feed_cache_stats()
+
+
+@router.get("/jobs")
+async def job_queue_metrics(
+    admin=Depends(require_admin),
+):
+    return await get_queue_stats()
+
+
+@router.get("/http-client")
+async def http_client_metrics(
+    admin=Depends(require_admin),
+):
+    return get_http_client_stats()
+
+
+@router.get("/fetch-cache")
+async def fetch_cache_metrics(
+    admin=Depends(require_admin),
+):
+    return get_fetch_cache_stats()
+
+
+@router.get("/notification-streams")
+async def notification_stream_metrics(
+    admin=Depends(require_admin),
+):
+    return get_notification_stream_stats()
@@ -0,0 +1,48 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.schemas.claim_cluster import ClaimClusterRead, ClaimClusterMemberPage
+from app.services.claim_clustering import get_claim_cluster, get_cluster_members
+from app.core.database import get_db
+
+
+router = APIRouter(prefix="/claim-clusters", tags=["claim-clusters"])
+
+
+# 🔓 Cluster aggregates
+@router.get("/{cluster_id}", response_model=ClaimClusterRead)
+async def read_claim_cluster(
+    cluster_id: str,
+    db: AsyncSession = Depends(get_db),
+):
+    cluster = await get_claim_cluster(db, cluster_id)
+
+    if not cluster:
+        raise HTTPException(status_code=404, detail="Claim cluster not found")
+
+    return cluster
+
+
+# 🔓 Cluster members, newest first (keyset)
+@router.get("/{cluster_id}/posts", response_model=ClaimClusterMemberPage)
+async def list_claim_cluster_posts(
+    cluster_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        posts, next_cursor = await get_cluster_members(
+            db,
+            cluster_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return {
+        "items": posts,
+        "next_cursor": next_cursor,
+    }
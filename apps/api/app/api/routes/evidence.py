@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
@@ -6,14 +6,29 @@ from uuid import UUID
 from app.core.database import get_db
 from app.core.models.evidence import Evidence
 from app.core.models.source import Source
-from app.services.truth_engine import update_post_truth
-from app.api.schemas.evidence import EvidenceCreate, EvidenceResponse
+from app.core.models.user import User
+from app.core.enums import ArchiveStatus
+from app.core.auth.dependencies import get_current_user
+from app.core.auth.admin import require_admin
+from app.api.schemas.evidence import (
+    ArchiveDiffResponse,
+    EvidenceCreate,
+    EvidenceResponse,
+)
 from app.services.evidence_weight import calculate_evidence_weight
-from app.services.archive_service import fetch_page_content, generate_content_hash
 from app.services.credibility_engine import calculate_credibility_score
-from app.services.integrity_verifier import verify_evidence_integrity
-from app.services.source_intelligence import update_source_reputation
-from app.services.narrative_intelligence import analyze_post_narrative
+from app.services.archive_store import diff_versions, get_latest_version
+from app.services.truth_engine import record_evidence_added
+from app.services.source_intelligence import record_citation_added
+from app.services.narrative_intelligence import link_source_post
+from app.services.graph_intelligence import invalidate_post_network
+from app.services.feed_cache import invalidate_post
+from app.jobs.verify_integrity import enqueue_integrity_verification
+from app.core.job_outbox import relay_jobs
+from app.jobs.evidence_pipeline import (
+    stage_evidence_archive,
+    stage_post_recompute,
+)
 
 
 
@@ -24,15 +39,17 @@ router = APIRouter(prefix="/evidence", tags=["evidence"])
 async def create_evidence(
     payload: EvidenceCreate,
     session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
     Add evidence supporting or contradicting a claim (post).
+
+    The row is committed immediately with archive_status=pending; archiving
+    and score recomputation run on the job worker.
     """
 
     source_id = None
     source_reputation = None
-    archive_url = None
-    content_hash = None
 
     # --------------------------------
     # SOURCE HANDLING
@@ -77,29 +94,13 @@ async def create_evidence(
         False,
     )
 
-    # --------------------------------
-    # ARCHIVE + CONTENT HASH
-    # --------------------------------
-
-    if payload.source_url:
-        try:
-            page_content = await fetch_page_content(str(payload.source_url))
-            content_hash = generate_content_hash(page_content)
-
-            # archive.org snapshot link
-            archive_url = f"https://web.archive.org/save/{payload.source_url}"
-
-        except Exception:
-            # archiving failure should NOT block evidence submission
-            content_hash = None
-            archive_url = None
-
     # --------------------------------
     # CREATE EVIDENCE RECORD
     # --------------------------------
 
     evidence = Evidence(
         post_id=payload.post_id,
+        submitted_by=current_user.id,
         evidence_type=payload.evidence_type,
         direction=payload.direction,
         source_description=payload.source_description,
@@ -107,28 +108,39 @@ async def create_evidence(
         upload_path=payload.upload_path,
         source_id=source_id,
         weight=weight,
-        archive_url=archive_url,
-        content_hash=content_hash,
         credibility_score=credibility_score,
-
+        archive_status=(
+            ArchiveStatus.pending if payload.source_url else ArchiveStatus.skipped
+        ),
     )
 
     session.add(evidence)
-    await session.commit()
-    await session.refresh(evidence)
+    await session.flush()
+
+    # Post truth, source reputation and the source -> post index move in
+    # the same transaction as the insert
+    await record_evidence_added(session, evidence)
+    await record_citation_added(session, evidence)
+    await link_source_post(session, evidence)
 
     # --------------------------------
-    # RECALCULATE TRUTH SCORE
+    # ARCHIVE + RECALCULATE SCORES (job worker)
     # --------------------------------
 
-    await update_post_truth(session, payload.post_id)
+    # Staged in the same transaction so a Redis outage can't lose them
+    jobs = [stage_post_recompute(session, payload.post_id)]
+    if evidence.source_url:
+        jobs.insert(0, stage_evidence_archive(session, evidence.id))
 
-    if source_id:
-        await update_source_reputation(session, source_id)
+    await session.commit()
+    await session.refresh(evidence)
 
-    
-    await analyze_post_narrative(session, payload.post_id)
+    # Network metrics and the feed cards showing their flags are stale
+    await invalidate_post_network(payload.post_id)
+    await invalidate_post(payload.post_id)
 
+    # Rows not relayed here are swept by the worker (relay_pending_jobs)
+    await relay_jobs(session, jobs)
 
     return evidence
 
@@ -149,9 +161,56 @@ async def get_post_evidence(
     return result.scalars().all()
 
 
+@router.get("/{evidence_id}/archive-diff", response_model=ArchiveDiffResponse)
+async def get_evidence_archive_diff(
+    evidence_id: UUID,
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    Diff the snapshot this evidence was archived with against the latest
+    snapshot of its source URL.
+    """
+    evidence = await session.get(Evidence, evidence_id)
+
+    if not evidence or not evidence.source_url:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+
+    if evidence.archive_version is None:
+        raise HTTPException(status_code=404, detail="No archived snapshot")
+
+    latest = await get_latest_version(session, evidence.source_url)
+
+    if not latest:
+        raise HTTPException(status_code=404, detail="No archived snapshot")
+
+    diff = await diff_versions(
+        session,
+        evidence.source_url,
+        evidence.archive_version,
+        latest.version,
+    )
+
+    if diff is None:
+        raise HTTPException(status_code=404, detail="No archived snapshot")
+
+    return {
+        "evidence_id": evidence.id,
+        "source_url": evidence.source_url,
+        "from_version": evidence.archive_version,
+        "to_version": latest.version,
+        "diff": diff,
+    }
+
+
 @router.post("/verify-integrity")
 async def verify_integrity(
-    session: AsyncSession = Depends(get_db),
+    admin=Depends(require_admin),
 ):
-    await verify_evidence_integrity(session)
-    return {"status": "verification_complete"}
\ No newline at end of file
+    """
+    Queue a full integrity pass on the job worker (see app.jobs.verify_integrity).
+    """
+    job_id = await enqueue_integrity_verification()
+
+    return {
+        "status": "verification_queued" if job_id else "verification_already_queued",
+    }
\ No newline at end of file
@@ -1,48 +1,90 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import update
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from datetime import timezone
-from app.api.schemas.notification import NotificationRead
+from app.api.schemas.notification import NotificationRead, NotificationPage
 from app.services.notification_service import (
     get_user_notifications,
     mark_notification_read,
+    mark_all_notifications_read,
     get_unread_count,
 )
+from app.services.notification_stream import stream_notifications
+from app.core.utils.cursor import decode_created_at_cursor
 from app.core.database import get_db
-from app.core.auth.dependencies import get_current_user
+from app.core.auth.dependencies import (
+    get_current_user,
+    get_current_user_id,
+    get_current_user_claims,
+)
 from app.core.models.user import User
-from app.core.models.notification import Notification
-from datetime import datetime
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
-@router.get("", response_model=List[NotificationRead])
+@router.get("", response_model=NotificationPage)
 async def list_notifications(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
 ):
-    return await get_user_notifications(
-        db,
-        user.id,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        notifications, next_cursor = await get_user_notifications(
+            db,
+            user.id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
+    return {
+        "items": notifications,
+        "next_cursor": next_cursor,
+    }
 
+
+# Highest-QPS endpoint: token-only auth plus one Redis GET when warm
 @router.get("/unread-count")
 async def unread_count(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
 ):
-    count = await get_unread_count(db, user.id)
+    count = await get_unread_count(db, user_id)
     return {"count": count}
 
 
+# Real-time push (SSE); no Postgres connection is held while idle
+@router.get("/stream")
+async def notification_stream(
+    claims: dict = Depends(get_current_user_claims),
+    last_event_id: Optional[str] = Header(default=None),
+):
+    if last_event_id:
+        try:
+            decode_created_at_cursor(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    return StreamingResponse(
+        # The stream re-checks revocation, expiry and lockout while open
+        stream_notifications(
+            UUID(claims["sub"]),
+            last_event_id,
+            session_id=claims["sid"],
+            expires_at=claims.get("exp"),
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable proxy buffering (nginx) so events flush immediately
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.post("/{notification_id}/read")
 async def read_notification(
     notification_id: UUID,
@@ -62,16 +104,6 @@ async def read_all_notifications(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    stmt = (
-        update(Notification)
-        .where(
-            Notification.user_id == user.id,
-            Notification.read_at.is_(None),
-        )
-        .values(read_at=datetime.now(timezone.utc))
-    )
-
-    await db.execute(stmt)
-    await db.commit()
+    await mark_all_notifications_read(db, user_id=user.id)
 
     return {"ok": True}
@@ -4,15 +4,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from app.api.schemas.post import PostRead, PostCreate
-from app.api.schemas.feed import PostCard, UserPublic
-from app.services.post_service import get_feed, get_post_by_id
+from app.services.post_service import get_post_by_id
+from app.services.feed_cache import get_feed_page, invalidate_feed_head
 from app.core.database import get_db
 from app.core.models.post import Post
 from app.core.models.user import User
 from app.core.enums import ContentStatus, FeedMode
 from app.core.auth.dependencies import get_current_user, get_optional_user
-from app.services.evidence_agent import investigate_claim
-from app.services.claim_clustering import cluster_claim
+from app.core.job_outbox import relay_jobs
+from app.jobs.post_analysis import stage_post_analysis
 
 
 
@@ -29,43 +29,16 @@ async def get_feed_route(
     db: AsyncSession = Depends(get_db),
     current_user: User | None = Depends(get_optional_user),
 ):
-    posts, next_cursor = await get_feed(
-        db,
-        mode=mode,
-        limit=limit,
-        cursor=cursor,
-        current_user_id=current_user.id if current_user else None,
-    )
-
-    feed = []
-
-    for post in posts:
-        feed.append(
-            PostCard(
-                id=post.id,
-                post_type=post.post_type,
-                title=post.title,
-                created_at=post.created_at,
-                status=post.status,
-                evidence_count=post.reply_count,
-                confidence_state="no_review",
-                trending_score=post.trending_score,
-                like_count=post.like_count,
-                reply_count=post.reply_count,
-                has_liked=post.liked_by_current_user,
-                author=UserPublic(
-                    id=post.author.id,
-                    username=post.author.username,
-                    display_name=post.author.display_name,
-                    bio=post.author.bio,
-                ),
-            )
+    try:
+        return await get_feed_page(
+            db,
+            mode=mode,
+            limit=limit,
+            cursor=cursor,
+            current_user_id=current_user.id if current_user else None,
         )
-
-    return {
-        "items": feed,
-        "next_cursor": next_cursor,
-    }
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 # 🔓 Public single post
@@ -98,22 +71,19 @@ async def create_post(
     )
 
     db.add(post)
+    await db.flush()
+
+    # 🧠 Claim clustering + 🔎 evidence discovery run on the job worker;
+    # staged in the same transaction so a Redis outage can't lose them
+    jobs = stage_post_analysis(db, post.id)
 
     await db.commit()
     await db.refresh(post)
 
-    # 🧠 Step 1 — Cluster similar claims
-    try:
-        await cluster_claim(db, post)
-    except Exception:
-        pass
+    await invalidate_feed_head()
 
-    # 🔎 Step 2 — Trigger AI evidence discovery
-    try:
-        await investigate_claim(db, post.id)
-    except Exception:
-        # investigation failures should not block post creation
-        pass
+    # Rows not relayed here are swept by the worker (relay_pending_jobs)
+    await relay_jobs(db, jobs)
 
     return post
 
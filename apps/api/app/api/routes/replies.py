@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.api.schemas.reply import ReplyCreate, ReplyRead
 from app.services.reply_service import create_reply, get_replies_for_post, get_children_for_reply
-from app.api.schemas.reply import ReplyTreeRead
+from app.api.schemas.reply import ReplyTreeRead, ReplyPage
 from app.api.deps.reply_tree import build_reply_tree
 from app.core.database import get_db
 from app.core.models.user import User
@@ -34,11 +34,11 @@ async def create_reply_route(
 
 
 
-@router.get("/{post_id}/replies", response_model=List[ReplyRead])
+@router.get("/{post_id}/replies", response_model=ReplyPage)
 async def list_replies(
     post_id: UUID,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     load_children: bool = Query(False),
     db: AsyncSession = Depends(get_db),
 ):
@@ -46,31 +46,46 @@ async def list_replies(
     Returns top-level replies for a post.
     If load_children=True, fetch nested replies recursively.
     """
-    return await get_replies_for_post(
-        db, 
-        post_id, 
-        limit=limit, 
-        offset=offset, 
-        load_children=load_children
-    )
+    try:
+        replies, next_cursor = await get_replies_for_post(
+            db,
+            post_id,
+            limit=limit,
+            cursor=cursor,
+            load_children=load_children
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return {
+        "items": replies,
+        "next_cursor": next_cursor,
+    }
 
-@router.get("/{reply_id}/children", response_model=List[ReplyRead])
+@router.get("/{reply_id}/children", response_model=ReplyPage)
 async def fetch_reply_children(
     reply_id: UUID,
     db: AsyncSession = Depends(get_db),
     status: Optional[ContentStatus] = Query(ContentStatus.active),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
 ):
     """
     Fetch direct children of a single reply (lazy).
-    Pagination supported.
+    Cursor pagination supported.
     """
-    children = await get_children_for_reply(
-        db,
-        parent_reply_id=reply_id,  # use the correct keyword argument
-        status=status,
-        limit=limit,
-        offset=offset,
-    )
-    return children
+    try:
+        children, next_cursor = await get_children_for_reply(
+            db,
+            parent_reply_id=reply_id,  # use the correct keyword argument
+            status=status,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return {
+        "items": children,
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from datetime import datetime
+from uuid import UUID
+from typing import Optional, List
+
+from app.core.enums import PostType
+
+
+class ClaimClusterRead(BaseModel):
+    id: str
+    member_count: int
+    support_weight: float
+    contradict_weight: float
+    evidence_count: int
+    created_at: datetime
+    last_activity_at: datetime
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ClaimClusterMember(BaseModel):
+    id: UUID
+    post_type: PostType
+    title: str
+    created_at: datetime
+    claim_similarity_score: Optional[float] = None
+    truth_score: Optional[float] = None
+    evidence_count: int
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ClaimClusterMemberPage(BaseModel):
+    items: List[ClaimClusterMember]
+    next_cursor: Optional[str] = None
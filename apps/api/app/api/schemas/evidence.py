@@ -42,8 +42,17 @@ class EvidenceResponse(BaseModel):
 
     weight: float | None = None
     source_id: Optional[UUID] = None
+    archive_status: Optional[str] = None
 
     created_at: Optional[datetime]
 
     class Config:
         from_attributes = True
+
+
+class ArchiveDiffResponse(BaseModel):
+    evidence_id: UUID
+    source_url: str
+    from_version: int
+    to_version: int
+    diff: list[str]
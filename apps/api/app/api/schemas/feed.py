@@ -25,4 +25,7 @@ class PostCard(BaseModel):
     has_liked: bool = False
     like_count: int
     reply_count: int
+    # Evidence network flags (app.services.graph_intelligence)
+    single_source_risk: bool = False
+    confirmation_cluster: bool = False
 
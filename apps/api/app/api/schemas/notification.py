@@ -1,16 +1,23 @@
 from pydantic import BaseModel
 from datetime import datetime
 from uuid import UUID
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 
 class NotificationRead(BaseModel):
     id: UUID
     type: str
     payload: Dict
+    # > 1 for coalesced notifications; payload["actor_ids"] holds a sample
+    actor_count: int = 1
     read_at: Optional[datetime]
     created_at: datetime
 
     model_config = {
         "from_attributes": True
     }
+
+
+class NotificationPage(BaseModel):
+    items: List[NotificationRead]
+    next_cursor: Optional[str] = None
@@ -41,3 +41,8 @@ class ReplyTreeRead(ReplyRead):
     children: list["ReplyTreeRead"] = []
 
 ReplyTreeRead.model_rebuild()
+
+
+class ReplyPage(BaseModel):
+    items: List[ReplyRead]
+    next_cursor: Optional[str] = None
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from jose import jwt, JWTError
 from uuid import UUID
-from app.core.database import get_db
+from app.core.database import get_db, async_session
 from app.core.models.user import User
 from app.core.security import SECRET_KEY, ALGORITHM
 from datetime import datetime, timezone
@@ -67,6 +67,67 @@ async def get_current_user(
     return user
 
 
+async def get_current_token_claims(
+    access_token: str | None = Cookie(default=None),
+) -> dict:
+    """
+    Token-only authentication for hot read paths that must not hit Postgres.
+
+    Validates the JWT and the Redis revocation list but skips the user
+    lookup, so verification and lockout state are not enforced. Returns the
+    claims (sub, sid, exp) so long-lived responses can re-check the session.
+    """
+    if not access_token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    try:
+        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
+
+        user_id: str | None = payload.get("sub")
+        token_sid: str | None = payload.get("sid")
+
+        if not user_id or not token_sid:
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+        if await redis_client.get(f"revoked:{token_sid}"):
+            raise HTTPException(
+                status_code=401,
+                detail="Session revoked"
+            )
+
+        UUID(user_id)
+
+        return payload
+
+    except (JWTError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+
+async def get_current_user_claims(
+    access_token: str | None = Cookie(default=None),
+) -> dict:
+    """
+    Full get_current_user checks (verification, lockout) for long-lived
+    responses. The user is loaded on its own session, released before the
+    response starts, so nothing pins a Postgres connection while it is
+    open. Returns the token claims for re-checking the session later.
+    """
+    async with async_session() as db:
+        await get_current_user(db=db, access_token=access_token)
+
+    return await get_current_token_claims(access_token)
+
+
+async def get_current_user_id(
+    claims: dict = Depends(get_current_token_claims),
+) -> UUID:
+    """
+    See get_current_token_claims. Use only for endpoints that expose
+    nothing beyond the caller's own counters.
+    """
+    return UUID(claims["sub"])
+
+
 async def get_optional_user(
     db: AsyncSession = Depends(get_db),
     access_token: str | None = Cookie(default=None),
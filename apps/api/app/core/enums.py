@@ -17,6 +17,13 @@ class ContentStatus(str, Enum):
     removed_illegal = "removed_illegal"
 
 
+class ArchiveStatus(str, Enum):
+    pending = "pending"
+    archived = "archived"
+    failed = "failed"
+    skipped = "skipped"  # no source_url to archive
+
+
 class UserStatus(str, Enum):
     ACTIVE = "active"
     SUSPENDED = "suspended"
@@ -0,0 +1,112 @@
+"""
+Transactional outbox for background jobs.
+
+stage_job() writes the job to job_outbox in the caller's transaction, so it
+commits or rolls back with the change that needs it. After the commit,
+relay_jobs() pushes the staged rows to Redis and deletes them; anything a
+Redis outage kept from being pushed is picked up by relay_pending_jobs(),
+which the worker runs periodically. Jobs may be pushed twice (crash between
+push and delete); idempotency/coalesce keys make that harmless.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from redis.exceptions import RedisError
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.job_queue import DEFAULT_MAX_ATTEMPTS, enqueue
+from app.core.models.job_outbox import JobOutbox
+
+
+# Rows younger than this are left to the request that staged them
+JOB_OUTBOX_GRACE_SECONDS = int(os.getenv("JOB_OUTBOX_GRACE_SECONDS", "30"))
+JOB_OUTBOX_BATCH_SIZE = int(os.getenv("JOB_OUTBOX_BATCH_SIZE", "200"))
+
+
+def stage_job(
+    session: AsyncSession,
+    name: str,
+    payload: dict,
+    *,
+    idempotency_key: str | None = None,
+    coalesce_key: str | None = None,
+    max_attempts: int | None = None,
+    delay_seconds: float = 0,
+) -> JobOutbox:
+    """Add a job to the outbox; it is written when the caller commits."""
+    row = JobOutbox(
+        name=name,
+        payload=payload,
+        idempotency_key=idempotency_key,
+        coalesce_key=coalesce_key,
+        max_attempts=max_attempts,
+        delay_seconds=delay_seconds,
+    )
+    session.add(row)
+    return row
+
+
+async def _push(row: JobOutbox):
+    await enqueue(
+        row.name,
+        row.payload,
+        idempotency_key=row.idempotency_key,
+        coalesce_key=row.coalesce_key,
+        max_attempts=row.max_attempts or DEFAULT_MAX_ATTEMPTS,
+        delay_seconds=row.delay_seconds,
+    )
+
+
+async def relay_jobs(session: AsyncSession, rows: Iterable[JobOutbox]) -> int:
+    """
+    Push committed outbox rows to Redis and delete the ones pushed. Never
+    raises for Redis errors; returns the number relayed. Commits.
+    """
+    relayed = []
+
+    for row in rows:
+        try:
+            await _push(row)
+        except RedisError:
+            # Left for relay_pending_jobs
+            break
+        relayed.append(row.id)
+
+    if relayed:
+        await session.execute(delete(JobOutbox).where(JobOutbox.id.in_(relayed)))
+        await session.commit()
+
+    return len(relayed)
+
+
+async def relay_pending_jobs(session: AsyncSession) -> int:
+    """
+    Relay outbox rows older than JOB_OUTBOX_GRACE_SECONDS, oldest first.
+    SKIP LOCKED lets several workers sweep at once. Returns the number
+    relayed.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=JOB_OUTBOX_GRACE_SECONDS)
+    total = 0
+
+    while True:
+        result = await session.execute(
+            select(JobOutbox)
+            .where(JobOutbox.created_at < cutoff)
+            .order_by(JobOutbox.created_at)
+            .limit(JOB_OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.scalars().all()
+
+        if not rows:
+            await session.rollback()
+            return total
+
+        relayed = await relay_jobs(session, rows)
+        total += relayed
+
+        if relayed < len(rows):
+            await session.rollback()
+            return total
@@ -0,0 +1,310 @@
+"""
+Redis-backed background job queue.
+
+Jobs are JSON envelopes pushed onto a Redis list. Workers (app.jobs.worker)
+move them atomically onto a per-worker processing list while they run.
+Each worker keeps a heartbeat key alive; any worker requeues the processing
+list of one whose heartbeat lapsed, so a crashed worker's jobs come back
+without it restarting. Failed jobs are retried with exponential backoff
+through a delayed sorted set and end up on a dead-letter list once
+max_attempts is exhausted.
+
+Producers that must not lose a job to a Redis outage stage it in the
+Postgres outbox instead (app.core.job_outbox).
+"""
+import asyncio
+import json
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from app.core.cache import redis as redis_cache
+
+
+QUEUE_KEY = "jobs:queue"
+DELAYED_KEY = "jobs:delayed"
+DEAD_KEY = "jobs:dead"
+PROCESSING_KEY_PREFIX = "jobs:processing"
+HEARTBEAT_KEY_PREFIX = "jobs:worker"
+IDEMPOTENCY_KEY_PREFIX = "jobs:idem"
+COALESCE_KEY_PREFIX = "jobs:coalesce"
+
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "2"))
+RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "600"))
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("JOB_IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+# Safety net so a lost job can't block its coalesce key forever
+COALESCE_TTL_SECONDS = int(os.getenv("JOB_COALESCE_TTL_SECONDS", "600"))
+# A worker silent for this long is presumed dead and its jobs are requeued
+WORKER_HEARTBEAT_TTL_SECONDS = int(os.getenv("WORKER_HEARTBEAT_TTL_SECONDS", "30"))
+
+# Dedup claims and the push in one step: a job is either queued with its
+# keys claimed, or dropped with nothing written.
+# KEYS: queue, delayed, [idempotency key], [coalesce key]
+# ARGV: job id, job json, run at (0 = now), has idempotency key,
+#       has coalesce key, idempotency ttl, coalesce ttl
+_ENQUEUE_SCRIPT = """
+local n = 2
+local idempotency, coalesce
+if ARGV[4] == '1' then n = n + 1; idempotency = KEYS[n] end
+if ARGV[5] == '1' then n = n + 1; coalesce = KEYS[n] end
+if idempotency and redis.call('EXISTS', idempotency) == 1 then return 0 end
+if coalesce and redis.call('EXISTS', coalesce) == 1 then return 0 end
+if idempotency then redis.call('SET', idempotency, ARGV[1], 'EX', ARGV[6]) end
+if coalesce then redis.call('SET', coalesce, ARGV[1], 'EX', ARGV[7]) end
+if tonumber(ARGV[3]) > 0 then
+    redis.call('ZADD', KEYS[2], ARGV[3], ARGV[2])
+else
+    redis.call('LPUSH', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+
+# -------------------------
+# Handler registry
+# -------------------------
+
+@dataclass
+class JobHandler:
+    name: str
+    func: Callable[..., Awaitable]
+    max_concurrency: Optional[int] = None
+    semaphore: Optional[asyncio.Semaphore] = None
+
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def register_job(name: str, *, max_concurrency: Optional[int] = None):
+    """
+    Register an async handler called as `await func(**payload)`.
+
+    max_concurrency caps how many jobs of this type one worker runs at once.
+    """
+    def decorator(func):
+        _handlers[name] = JobHandler(
+            name=name,
+            func=func,
+            max_concurrency=max_concurrency,
+        )
+        return func
+
+    return decorator
+
+
+def get_handler(name: str) -> Optional[JobHandler]:
+    return _handlers.get(name)
+
+
+# -------------------------
+# Producer side
+# -------------------------
+
+async def enqueue(
+    name: str,
+    payload: dict,
+    *,
+    idempotency_key: Optional[str] = None,
+    coalesce_key: Optional[str] = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    delay_seconds: float = 0,
+) -> Optional[str]:
+    """
+    Queue a job. Returns the job id, or None if it was dropped because:
+
+    - idempotency_key was already used within IDEMPOTENCY_TTL_SECONDS, or
+    - a job with the same coalesce_key is still waiting to start (the
+      pending job will see the latest state when it runs).
+    """
+    job_id = uuid.uuid4().hex
+
+    job = {
+        "id": job_id,
+        "name": name,
+        "payload": payload,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "idempotency_key": idempotency_key,
+        "coalesce_key": coalesce_key,
+        "enqueued_at": time.time(),
+    }
+
+    keys = [QUEUE_KEY, DELAYED_KEY]
+    if idempotency_key:
+        keys.append(f"{IDEMPOTENCY_KEY_PREFIX}:{idempotency_key}")
+    if coalesce_key:
+        keys.append(f"{COALESCE_KEY_PREFIX}:{coalesce_key}")
+
+    queued = await redis_cache.redis_client.eval(
+        _ENQUEUE_SCRIPT,
+        len(keys),
+        *keys,
+        job_id,
+        json.dumps(job),
+        time.time() + delay_seconds if delay_seconds > 0 else 0,
+        "1" if idempotency_key else "0",
+        "1" if coalesce_key else "0",
+        IDEMPOTENCY_TTL_SECONDS,
+        COALESCE_TTL_SECONDS,
+    )
+
+    return job_id if queued else None
+
+
+# -------------------------
+# Metrics
+# -------------------------
+
+async def get_queue_stats() -> dict:
+    client = redis_cache.redis_client
+
+    processing = 0
+    async for key in client.scan_iter(match=f"{PROCESSING_KEY_PREFIX}:*"):
+        processing += await client.llen(key)
+
+    return {
+        "queued": await client.llen(QUEUE_KEY),
+        "delayed": await client.zcard(DELAYED_KEY),
+        "processing": processing,
+        "dead": await client.llen(DEAD_KEY),
+    }
+
+
+# -------------------------
+# Consumer side (used by app.jobs.worker)
+# -------------------------
+
+def default_worker_id() -> str:
+    """WORKER_ID if set, else unique per process (several workers may share a host)."""
+    return os.getenv("WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def processing_key(worker_id: str) -> str:
+    return f"{PROCESSING_KEY_PREFIX}:{worker_id}"
+
+
+def heartbeat_key(worker_id: str) -> str:
+    return f"{HEARTBEAT_KEY_PREFIX}:{worker_id}"
+
+
+async def heartbeat(worker_id: str):
+    await redis_cache.redis_client.set(
+        heartbeat_key(worker_id),
+        time.time(),
+        ex=WORKER_HEARTBEAT_TTL_SECONDS,
+    )
+
+
+def retry_delay(attempts: int) -> float:
+    delay = min(RETRY_BASE_SECONDS * (2 ** (attempts - 1)), RETRY_MAX_SECONDS)
+
+    # Jitter so a burst of failures doesn't retry in lockstep
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def requeue_orphans(worker_id: str) -> int:
+    """Return jobs left on this worker's processing list by a crash."""
+    client = redis_cache.redis_client
+    moved = 0
+
+    while await client.lmove(processing_key(worker_id), QUEUE_KEY, "RIGHT", "RIGHT"):
+        moved += 1
+
+    return moved
+
+
+async def reap_stale_workers() -> int:
+    """
+    Requeue the processing lists of workers whose heartbeat lapsed.
+    Returns the number of jobs requeued.
+    """
+    client = redis_cache.redis_client
+    prefix = f"{PROCESSING_KEY_PREFIX}:"
+    moved = 0
+
+    async for key in client.scan_iter(match=f"{prefix}*"):
+        worker_id = key[len(prefix):]
+
+        if not await client.exists(heartbeat_key(worker_id)):
+            moved += await requeue_orphans(worker_id)
+
+    return moved
+
+
+async def promote_due_jobs(now: Optional[float] = None) -> int:
+    """Move delayed jobs whose run time has passed onto the queue."""
+    client = redis_cache.redis_client
+    now = now if now is not None else time.time()
+    promoted = 0
+
+    for raw in await client.zrangebyscore(DELAYED_KEY, 0, now, start=0, num=100):
+        # Only the worker that wins the ZREM pushes the job
+        if await client.zrem(DELAYED_KEY, raw):
+            await client.lpush(QUEUE_KEY, raw)
+            promoted += 1
+
+    return promoted
+
+
+async def fetch_job(worker_id: str, timeout: float = 5) -> Optional[str]:
+    return await redis_cache.redis_client.blmove(
+        QUEUE_KEY,
+        processing_key(worker_id),
+        timeout,
+        "RIGHT",
+        "LEFT",
+    )
+
+
+async def run_job(worker_id: str, raw: str) -> bool:
+    """
+    Execute one fetched job and acknowledge it.
+
+    Returns True on success. Failures are rescheduled with backoff or
+    dead-lettered; the job is removed from the processing list either way.
+    """
+    client = redis_cache.redis_client
+    job = json.loads(raw)
+    handler = get_handler(job["name"])
+
+    # Release the coalesce key before running so writes that land while
+    # this job is in flight schedule a fresh run
+    if job.get("coalesce_key"):
+        await client.delete(f"{COALESCE_KEY_PREFIX}:{job['coalesce_key']}")
+
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job {job['name']!r}")
+
+        if handler.max_concurrency:
+            if handler.semaphore is None:
+                handler.semaphore = asyncio.Semaphore(handler.max_concurrency)
+
+            async with handler.semaphore:
+                await handler.func(**job["payload"])
+        else:
+            await handler.func(**job["payload"])
+
+        succeeded = True
+
+    except Exception as exc:
+        succeeded = False
+        job["attempts"] += 1
+        job["last_error"] = repr(exc)
+
+        if job["attempts"] >= job["max_attempts"]:
+            await client.lpush(DEAD_KEY, json.dumps(job))
+        else:
+            await client.zadd(
+                DELAYED_KEY,
+                {json.dumps(job): time.time() + retry_delay(job["attempts"])},
+            )
+
+    await client.lrem(processing_key(worker_id), 1, raw)
+
+    return succeeded
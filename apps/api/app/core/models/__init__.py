@@ -13,3 +13,8 @@ from .refresh_token import RefreshToken
 from .security_event import SecurityEvent
 from .email_verification_token import EmailVerificationToken
 from .source import Source
+from .archive_blob import ArchiveBlob, ArchiveVersion
+from .source_post import SourcePost
+from .claim_signature import ClaimSignature, ClaimLshBucket
+from .claim_cluster import ClaimCluster
+from .job_outbox import JobOutbox
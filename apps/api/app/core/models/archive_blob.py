@@ -0,0 +1,74 @@
+from uuid import UUID, uuid4
+from datetime import datetime
+
+from sqlalchemy import (
+    ForeignKey,
+    Text,
+    String,
+    Integer,
+    DateTime,
+    LargeBinary,
+    Index,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.models.base import Base
+
+
+class ArchiveBlob(Base):
+    """
+    Compressed archive snapshot, keyed by the sha256 of its own text.
+
+    A blob with base_hash set is a delta: it was compressed with the base
+    blob's text as dictionary and needs that text to decompress.
+    """
+    __tablename__ = "archive_blobs"
+
+    content_hash: Mapped[str] = mapped_column(String, primary_key=True)
+
+    # "zstd", or "zlib" when written without `zstandard` importable
+    codec: Mapped[str] = mapped_column(String, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    base_hash: Mapped[str | None] = mapped_column(
+        ForeignKey("archive_blobs.content_hash"),
+        nullable=True,
+    )
+    # Number of deltas to walk before reaching a full snapshot
+    chain_depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    raw_size: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class ArchiveVersion(Base):
+    """Ordered history of distinct snapshots seen for one source URL."""
+    __tablename__ = "archive_versions"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+
+    source_url: Mapped[str] = mapped_column(Text, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    content_hash: Mapped[str] = mapped_column(
+        ForeignKey("archive_blobs.content_hash"),
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("source_url", "version", name="uq_archive_versions_url_version"),
+        Index("ix_archive_versions_content_hash", "content_hash"),
+    )
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from sqlalchemy import String, Integer, Float, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.models.base import Base
+
+
+class ClaimCluster(Base):
+    """
+    Rolled-up aggregates for the posts sharing a Post.claim_cluster_id.
+
+    Maintained incrementally by app.services.claim_clustering as posts join
+    or leave and by app.services.truth_engine as their evidence changes.
+    """
+    __tablename__ = "claim_clusters"
+
+    __table_args__ = (
+        Index("ix_claim_clusters_last_activity_at", "last_activity_at"),
+    )
+
+    # Same value as Post.claim_cluster_id
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+
+    # Active posts only: the members get_cluster_members lists
+    member_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+    )
+
+    support_weight: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        server_default=text("0"),
+    )
+
+    contradict_weight: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        server_default=text("0"),
+    )
+
+    evidence_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    last_activity_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
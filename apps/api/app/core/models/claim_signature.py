@@ -0,0 +1,45 @@
+from uuid import UUID
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Integer, BigInteger, LargeBinary, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.models.base import Base
+
+
+class ClaimSignature(Base):
+    """MinHash signature of a claim's text (app.services.claim_clustering)."""
+    __tablename__ = "claim_signatures"
+
+    post_id: Mapped[UUID] = mapped_column(
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # NUM_PERM unsigned 64-bit minimums, packed
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class ClaimLshBucket(Base):
+    """LSH banding index: one row per (band, bucket) a claim hashes into."""
+    __tablename__ = "claim_lsh_buckets"
+
+    band: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    post_id: Mapped[UUID] = mapped_column(
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    __table_args__ = (
+        # Re-clustering a post replaces its buckets
+        Index("ix_claim_lsh_buckets_post_id", "post_id"),
+    )
@@ -1,5 +1,5 @@
 # models/evidence.py
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
 
 from sqlalchemy import (
@@ -9,12 +9,14 @@ from sqlalchemy import (
     Index,
     Enum,
     Integer,
-    String
+    String,
+    Float,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
 from app.core.models.base import Base
+from app.core.enums import ArchiveStatus
 
 
 # --- ENUMS (model-level) ---
@@ -37,7 +39,7 @@ class Evidence(Base):
     __tablename__ = "evidence"
 
     # --- Columns ---
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
 
     post_id: Mapped[UUID] = mapped_column(
         ForeignKey("posts.id", ondelete="CASCADE"),
@@ -70,13 +72,30 @@ class Evidence(Base):
         nullable=False,
     )
 
+    # Legacy inline snapshot; new snapshots live in archive_blobs (app.services.archive_store)
     archived_content: Mapped[str | None] = mapped_column(Text, nullable=True)
     content_hash: Mapped[str | None] = mapped_column(String, nullable=True)
     archived_at: Mapped[datetime | None] = mapped_column(DateTime, default=datetime.utcnow)
-    archive_version: Mapped[int] = mapped_column(Integer, default=1)
+    # Version of source_url in archive_versions this row was archived as;
+    # NULL until the first snapshot is recorded
+    archive_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     tampered: Mapped[bool] = mapped_column(default=False)
     last_verified_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     credibility_score: Mapped[float | None] = mapped_column(nullable=True)
+    weight: Mapped[float | None] = mapped_column(Float, nullable=True)
+    archive_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # HTTP validators from the last full fetch, sent back on re-verification
+    source_etag: Mapped[str | None] = mapped_column(Text, nullable=True)
+    source_last_modified: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Archiving runs on the job worker after the row is committed
+    archive_status: Mapped[ArchiveStatus] = mapped_column(
+        Enum(ArchiveStatus, name="archive_status"),
+        nullable=False,
+        default=ArchiveStatus.pending,
+        server_default=ArchiveStatus.pending.value,
+    )
 
     source_id: Mapped[UUID | None] = mapped_column(
         ForeignKey("sources.id"),
@@ -89,4 +108,5 @@ class Evidence(Base):
     __table_args__ = (
         Index("ix_evidence_post_id", "post_id"),
         Index("ix_evidence_direction", "direction"),
+        Index("ix_evidence_source_id", "source_id"),
     )
@@ -0,0 +1,36 @@
+from uuid import UUID, uuid4
+from datetime import datetime
+
+from sqlalchemy import Text, JSON, Float, Integer, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.models.base import Base
+
+
+class JobOutbox(Base):
+    """
+    A job written in the same transaction as the change that needs it
+    (app.core.job_outbox). Deleted once it is on the Redis queue.
+    """
+    __tablename__ = "job_outbox"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    idempotency_key: Mapped[str | None] = mapped_column(Text, nullable=True)
+    coalesce_key: Mapped[str | None] = mapped_column(Text, nullable=True)
+    max_attempts: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    delay_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index("ix_job_outbox_created_at", "created_at"),
+    )
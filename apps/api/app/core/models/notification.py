@@ -1,15 +1,23 @@
 from uuid import uuid4
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Text, JSON, DateTime
+from sqlalchemy import Text, JSON, DateTime, Integer, text
 from sqlalchemy.sql import func
 
 from app.core.models.base import Base
 from sqlalchemy import Index
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Notification(Base):
+    """
+    Range-partitioned by month on created_at (app.services.notification_partitions),
+    so created_at is part of the primary key and of every unique index.
+    """
     __tablename__ = "notifications"
 
     id: Mapped[UUID] = mapped_column(
@@ -21,13 +29,23 @@ class Notification(Base):
     user_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         nullable=False,
-        index=True,
     )
 
     type: Mapped[str] = mapped_column(Text, nullable=False)
 
     payload: Mapped[dict] = mapped_column(JSON, nullable=False)
 
+    # Coalesced notifications ("N people liked your post"): "<type>:<target>"
+    # and the number of actors folded in. NULL group_key = one event per row.
+    group_key: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    actor_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default=text("1"),
+    )
+
     read_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
@@ -35,11 +53,30 @@ class Notification(Base):
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
+        # Set client-side so the ORM knows the full primary key on insert
+        default=_utcnow,
         server_default=func.now(),
         nullable=False,
-        index=True,
     )
 
     __table_args__ = (
-        Index("ix_notifications_user_unread", "user_id", "read_at"),
+        # Unread rows only: stays small however large the inbox grows
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            postgresql_where=text("read_at IS NULL"),
+        ),
+        # Keyset pagination of a user's inbox
+        Index("ix_notifications_user_created", "user_id", "created_at", "id"),
+        # Upsert target for coalescing: one open (unread) row per group and window
+        Index(
+            "ux_notifications_open_group",
+            "user_id",
+            "group_key",
+            "created_at",
+            unique=True,
+            postgresql_where=text("read_at IS NULL AND group_key IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
\ No newline at end of file
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Index,
     CheckConstraint,
     Integer,
+    Float,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -24,6 +25,10 @@ class Post(Base):
         # Composite index for feed queries
         Index("idx_posts_status_created_at", "status", "created_at", "id"),
         Index("idx_posts_like_count", "like_count"),
+        # Keyset index for trending feed pages
+        Index("idx_posts_status_trending", "status", "trending_score", "id"),
+        # Claim cluster membership lookups and keyset member pages
+        Index("idx_posts_claim_cluster_created", "claim_cluster_id", "created_at", "id"),
 
         # ✅ DB-level protection
         CheckConstraint("like_count >= 0", name="posts_like_count_non_negative"),
@@ -66,6 +71,21 @@ class Post(Base):
         server_default=text("0"),
     )
 
+    # -----------------------------
+    # Trending (refreshed by background job + like/reply writes)
+    # -----------------------------
+
+    trending_score: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        server_default=text("0"),
+    )
+
+    trending_scored_at: Mapped[str | None] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+    )
+
     status: Mapped[ContentStatus] = mapped_column(
         SQLEnum(ContentStatus, name="contentstatus"),
         nullable=False,
@@ -85,6 +105,28 @@ class Post(Base):
         onupdate=func.now()
     )
 
+    # -----------------------------
+    # Truth aggregates (maintained by app.services.truth_engine on evidence writes)
+    # -----------------------------
+
+    support_weight: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        server_default=text("0"),
+    )
+
+    contradict_weight: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        server_default=text("0"),
+    )
+
+    evidence_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+    )
+
     truth_score: Mapped[float | None] = mapped_column(nullable=True)
     truth_confidence: Mapped[float | None] = mapped_column(nullable=True)
     narrative_cluster_id: Mapped[str | None] = mapped_column(nullable=True)
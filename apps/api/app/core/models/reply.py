@@ -22,6 +22,15 @@ class Reply(Base):
         # Critical for reply velocity + post counts
         Index("idx_replies_post_created", "post_id", "created_at"),
 
+        # Covering index for thread listings (top-level + child windows)
+        Index(
+            "idx_replies_post_parent_status_created",
+            "post_id",
+            "parent_reply_id",
+            "status",
+            "created_at",
+        ),
+
         # ✅ DB-level protection
         CheckConstraint("like_count >= 0", name="replies_like_count_non_negative"),
     )
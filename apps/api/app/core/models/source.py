@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import String, Float, Boolean, TIMESTAMP, ForeignKey
+from sqlalchemy import String, Float, Boolean, TIMESTAMP, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Mapped, mapped_column
@@ -57,6 +57,13 @@ class Source(Base):
 
     accuracy_score: Mapped[float | None] = mapped_column(nullable=True)
     contradiction_rate: Mapped[float | None] = mapped_column(nullable=True)
+    # Running aggregates, maintained by app.services.source_intelligence
+    credibility_sum: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+        server_default=text("0"),
+    )
     tamper_events: Mapped[int] = mapped_column(default=0)
     citation_count: Mapped[int] = mapped_column(default=0)
     last_evaluated_at: Mapped[datetime | None] = mapped_column(nullable=True)
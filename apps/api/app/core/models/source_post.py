@@ -0,0 +1,37 @@
+from uuid import UUID
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Integer, Index, text
+
+from app.core.models.base import Base
+
+
+class SourcePost(Base):
+    """
+    Inverted index of which posts cite which sources.
+
+    One row per (source, post) pair with the number of evidence rows behind
+    it; maintained by app.services.narrative_intelligence on evidence writes.
+    """
+    __tablename__ = "source_posts"
+
+    __table_args__ = (
+        # Primary key covers source -> posts; this covers post -> sources
+        Index("ix_source_posts_post_source", "post_id", "source_id"),
+    )
+
+    source_id: Mapped[UUID] = mapped_column(
+        ForeignKey("sources.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    post_id: Mapped[UUID] = mapped_column(
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    evidence_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("1"),
+    )
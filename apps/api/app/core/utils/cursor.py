@@ -0,0 +1,46 @@
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+
+CURSOR_SEPARATOR = "|"
+
+
+def encode_cursor(*parts) -> str:
+    raw = CURSOR_SEPARATOR.join(str(part) for part in parts)
+
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, expected_parts: int = 2) -> list[str]:
+    """
+    Decode an opaque pagination cursor.
+
+    Raises ValueError if the cursor is malformed so routes can map it to 400.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    parts = raw.split(CURSOR_SEPARATOR)
+
+    if len(parts) != expected_parts:
+        raise ValueError("Invalid cursor")
+
+    return parts
+
+
+# -------------------------
+# (created_at, id) keyset cursors
+# -------------------------
+
+def encode_created_at_cursor(created_at: datetime, id) -> str:
+    return encode_cursor(created_at.isoformat(), id)
+
+
+def decode_created_at_cursor(cursor: str) -> tuple[datetime, UUID]:
+    created_at_str, id_str = decode_cursor(cursor)
+
+    return datetime.fromisoformat(created_at_str), UUID(id_str)
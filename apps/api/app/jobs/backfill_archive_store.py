@@ -0,0 +1,71 @@
+"""
+Move legacy Evidence.archived_content into the archive blob store.
+
+Usage:
+    python -m app.jobs.backfill_archive_store
+    python -m app.jobs.backfill_archive_store --batch-size 200
+
+Rows are processed oldest first so each URL's versions keep their
+original order. archived_content is cleared as rows are moved, which is
+also what makes the run resumable. Run VACUUM (FULL) on evidence after
+to hand the space back.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from app.core.database import lifespan_session
+from app.core.models.evidence import Evidence
+from app.services.archive_service import generate_content_hash
+from app.services.archive_store import record_version
+
+
+async def main(args):
+    moved = 0
+
+    async with lifespan_session() as session:
+        while True:
+            result = await session.execute(
+                select(Evidence)
+                .where(
+                    Evidence.archived_content.is_not(None),
+                    Evidence.source_url.is_not(None),
+                )
+                .order_by(Evidence.created_at, Evidence.id)
+                .limit(args.batch_size)
+            )
+            batch = result.scalars().all()
+
+            if not batch:
+                break
+
+            for evidence in batch:
+                content_hash = evidence.content_hash or generate_content_hash(
+                    evidence.archived_content
+                )
+
+                version = await record_version(
+                    session,
+                    evidence.source_url,
+                    evidence.archived_content,
+                )
+
+                evidence.content_hash = content_hash
+                evidence.archive_version = version.version
+                evidence.archived_content = None
+
+            await session.commit()
+            session.expunge_all()
+
+            moved += len(batch)
+            print(f"[backfill_archive_store] moved {moved}")
+
+    print(f"[backfill_archive_store] done, {moved} rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=200)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""
+Index existing claims for MinHash/LSH clustering.
+
+Usage:
+    python -m app.jobs.backfill_claim_clusters
+    python -m app.jobs.backfill_claim_clusters --batch-size 500
+
+Posts are walked oldest first in one keyset pass over (created_at, id),
+so earlier claims seed the clusters later ones join; posts that already
+have a claim signature are skipped. Each batch commits its signatures, so
+the run is resumable: a restart skips what is already indexed.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select, or_, and_
+
+from app.core.database import lifespan_session
+from app.core.models.claim_signature import ClaimSignature
+from app.core.models.post import Post
+from app.services.claim_clustering import assign_claim_cluster, set_post_cluster
+
+
+async def main(args):
+    indexed = 0
+    cursor = None
+
+    async with lifespan_session() as session:
+        while True:
+            stmt = (
+                select(Post.id, Post.created_at, Post.title, Post.body)
+                .order_by(Post.created_at, Post.id)
+                .limit(args.batch_size)
+            )
+
+            if cursor:
+                cursor_created_at, cursor_id = cursor
+                # Continue after the last post seen, indexed or not, so no
+                # batch rescans the head of the table
+                stmt = stmt.where(
+                    or_(
+                        Post.created_at > cursor_created_at,
+                        and_(
+                            Post.created_at == cursor_created_at,
+                            Post.id > cursor_id,
+                        ),
+                    )
+                )
+
+            batch = (await session.execute(stmt)).all()
+
+            if not batch:
+                break
+
+            cursor = batch[-1].created_at, batch[-1].id
+
+            result = await session.execute(
+                select(ClaimSignature.post_id)
+                .where(ClaimSignature.post_id.in_([row.id for row in batch]))
+            )
+            signed = set(result.scalars().all())
+
+            batch = [row for row in batch if row.id not in signed]
+
+            if not batch:
+                continue
+
+            for post_id, _, title, body in batch:
+                cluster_id, score = await assign_claim_cluster(session, post_id, title or body or "")
+                await set_post_cluster(session, post_id, cluster_id, score)
+
+            await session.commit()
+
+            indexed += len(batch)
+            print(f"[backfill_claim_clusters] indexed {indexed}")
+
+    print(f"[backfill_claim_clusters] done, {indexed} posts")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=500)
+
+    asyncio.run(main(parser.parse_args()))
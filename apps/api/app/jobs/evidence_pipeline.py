@@ -0,0 +1,71 @@
+"""
+Evidence jobs: archiving plus post narrative recomputation.
+
+Post truth scores and source reputation are maintained inline by
+app.services.truth_engine and app.services.source_intelligence;
+python -m app.jobs.reconcile_truth rebuilds them if they drift.
+
+Recompute jobs are coalesced per post, so a burst of evidence on one
+claim triggers one recompute rather than one per row.
+"""
+import os
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import lifespan_session
+from app.core.job_queue import register_job
+from app.core.job_outbox import stage_job
+from app.core.models.job_outbox import JobOutbox
+from app.services.evidence_service import archive_evidence
+from app.services.source_intelligence import update_source_reputation
+from app.services.narrative_intelligence import analyze_post_narrative
+
+
+ARCHIVE_EVIDENCE_JOB = "archive_evidence"
+RECOMPUTE_POST_SCORES_JOB = "recompute_post_scores"
+RECOMPUTE_SOURCE_REPUTATION_JOB = "recompute_source_reputation"
+
+ARCHIVE_CONCURRENCY = int(os.getenv("ARCHIVE_EVIDENCE_CONCURRENCY", "8"))
+
+# Short delay so a burst of submissions folds into one recompute
+RECOMPUTE_COALESCE_SECONDS = float(os.getenv("RECOMPUTE_COALESCE_SECONDS", "2"))
+
+
+@register_job(ARCHIVE_EVIDENCE_JOB, max_concurrency=ARCHIVE_CONCURRENCY)
+async def archive_evidence_job(evidence_id: str):
+    async with lifespan_session() as session:
+        await archive_evidence(session, UUID(evidence_id))
+
+
+@register_job(RECOMPUTE_POST_SCORES_JOB)
+async def recompute_post_scores_job(post_id: str):
+    async with lifespan_session() as session:
+        await analyze_post_narrative(session, UUID(post_id))
+
+
+# No longer enqueued; kept so jobs queued before the switch still drain
+@register_job(RECOMPUTE_SOURCE_REPUTATION_JOB)
+async def recompute_source_reputation_job(source_id: str):
+    async with lifespan_session() as session:
+        await update_source_reputation(session, UUID(source_id))
+
+
+def stage_evidence_archive(session: AsyncSession, evidence_id: UUID) -> JobOutbox:
+    return stage_job(
+        session,
+        ARCHIVE_EVIDENCE_JOB,
+        {"evidence_id": str(evidence_id)},
+        idempotency_key=f"{ARCHIVE_EVIDENCE_JOB}:{evidence_id}",
+    )
+
+
+def stage_post_recompute(session: AsyncSession, post_id: UUID) -> JobOutbox:
+    """Coalesced per post: a burst of evidence triggers one recompute."""
+    return stage_job(
+        session,
+        RECOMPUTE_POST_SCORES_JOB,
+        {"post_id": str(post_id)},
+        coalesce_key=f"{RECOMPUTE_POST_SCORES_JOB}:{post_id}",
+        delay_seconds=RECOMPUTE_COALESCE_SECONDS,
+    )
@@ -0,0 +1,35 @@
+"""
+Recompute narrative clusters for every post in one set-based pass.
+
+Usage:
+    python -m app.jobs.narrative_refresh
+
+Also registered as the `refresh_narratives` job. Per-post updates still
+run from the evidence pipeline; this pass catches posts whose cluster
+changed because *other* posts started citing the same sources.
+"""
+import asyncio
+
+from app.core.database import lifespan_session
+from app.core.job_queue import register_job
+from app.services.narrative_intelligence import refresh_all_narratives
+
+
+REFRESH_NARRATIVES_JOB = "refresh_narratives"
+
+
+@register_job(REFRESH_NARRATIVES_JOB, max_concurrency=1)
+async def refresh_narratives_job():
+    async with lifespan_session() as session:
+        await refresh_all_narratives(session)
+
+
+async def main():
+    async with lifespan_session() as session:
+        updated = await refresh_all_narratives(session)
+
+    print(f"[narrative_refresh] refreshed {updated} posts")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
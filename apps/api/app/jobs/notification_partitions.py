@@ -0,0 +1,57 @@
+"""
+Notification partition maintenance: create upcoming monthly partitions and
+expire old ones under the retention policy (see
+app.services.notification_partitions for the settings). The API also
+creates partitions itself; this job is what expires them.
+
+Usage:
+    python -m app.jobs.notification_partitions           # loop forever
+    python -m app.jobs.notification_partitions --once    # single pass
+    python -m app.jobs.notification_partitions --once --mode archive
+"""
+import argparse
+import asyncio
+import os
+
+from app.core.database import lifespan_session
+from app.services.notification_partitions import (
+    NOTIFICATION_PARTITIONS_AHEAD,
+    NOTIFICATION_RETENTION_MODE,
+    check_partition_horizon,
+    ensure_partitions,
+    expire_partitions,
+)
+
+
+MAINTENANCE_INTERVAL_SECONDS = int(os.getenv("NOTIFICATION_PARTITION_INTERVAL_SECONDS", str(24 * 3600)))
+
+
+async def run_once(args):
+    async with lifespan_session() as session:
+        created = await ensure_partitions(session, months_ahead=args.months_ahead)
+        print(f"[notification_partitions] created {created or 'none'}")
+
+        await check_partition_horizon(session)
+
+        expired, kept = await expire_partitions(session, mode=args.mode)
+        print(f"[notification_partitions] {args.mode}: {expired or 'none'}")
+
+        if kept:
+            print(f"[notification_partitions] kept for unread rows: {kept}")
+
+
+async def run_forever(args):
+    while True:
+        await run_once(args)
+        await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--once", action="store_true")
+    parser.add_argument("--months-ahead", type=int, default=NOTIFICATION_PARTITIONS_AHEAD)
+    parser.add_argument("--mode", choices=["drop", "archive"], default=NOTIFICATION_RETENTION_MODE)
+
+    args = parser.parse_args()
+
+    asyncio.run(run_once(args) if args.once else run_forever(args))
@@ -0,0 +1,57 @@
+"""
+Post-creation analysis jobs (claim clustering + evidence discovery).
+"""
+import os
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import lifespan_session
+from app.core.job_queue import register_job
+from app.core.job_outbox import stage_job
+from app.core.models.job_outbox import JobOutbox
+from app.core.models.post import Post
+from app.services.claim_clustering import cluster_claim
+from app.services.evidence_agent import investigate_claim
+
+
+CLUSTER_CLAIM_JOB = "cluster_claim"
+INVESTIGATE_CLAIM_JOB = "investigate_claim"
+
+# investigate_claim does outbound HTTP; keep it from hogging the worker
+INVESTIGATE_CLAIM_CONCURRENCY = int(os.getenv("INVESTIGATE_CLAIM_CONCURRENCY", "4"))
+
+
+@register_job(CLUSTER_CLAIM_JOB)
+async def cluster_claim_job(post_id: str):
+    async with lifespan_session() as session:
+        post = await session.get(Post, UUID(post_id))
+
+        if post:
+            await cluster_claim(session, post)
+
+
+@register_job(INVESTIGATE_CLAIM_JOB, max_concurrency=INVESTIGATE_CLAIM_CONCURRENCY)
+async def investigate_claim_job(post_id: str):
+    async with lifespan_session() as session:
+        await investigate_claim(session, UUID(post_id))
+
+
+def stage_post_analysis(session: AsyncSession, post_id: UUID) -> list[JobOutbox]:
+    """Stage both analysis jobs in the caller's transaction (app.core.job_outbox)."""
+    payload = {"post_id": str(post_id)}
+
+    return [
+        stage_job(
+            session,
+            CLUSTER_CLAIM_JOB,
+            payload,
+            idempotency_key=f"{CLUSTER_CLAIM_JOB}:{post_id}",
+        ),
+        stage_job(
+            session,
+            INVESTIGATE_CLAIM_JOB,
+            payload,
+            idempotency_key=f"{INVESTIGATE_CLAIM_JOB}:{post_id}",
+        ),
+    ]
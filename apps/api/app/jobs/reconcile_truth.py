@@ -0,0 +1,47 @@
+"""
+Rebuild post truth and source reputation aggregates from the evidence table,
+then claim cluster aggregates from the posts.
+
+Usage:
+    python -m app.jobs.reconcile_truth                      # every post and source
+    python -m app.jobs.reconcile_truth --post-id <uuid>     # one post
+    python -m app.jobs.reconcile_truth --source-id <uuid>   # one source
+    python -m app.jobs.reconcile_truth --clusters           # claim clusters only
+
+Only rows whose running aggregates drifted from the evidence are rewritten.
+"""
+import argparse
+import asyncio
+from uuid import UUID
+
+from app.core.database import lifespan_session
+from app.services.truth_engine import reconcile_truth_aggregates
+from app.services.source_intelligence import reconcile_source_aggregates
+from app.services.claim_clustering import reconcile_cluster_aggregates
+
+
+async def main(args):
+    everything = not args.post_id and not args.source_id and not args.clusters
+
+    async with lifespan_session() as session:
+        if everything or args.post_id:
+            posts = await reconcile_truth_aggregates(session, args.post_id)
+            print(f"[reconcile_truth] corrected {posts} posts")
+
+        if everything or args.source_id:
+            sources = await reconcile_source_aggregates(session, args.source_id)
+            print(f"[reconcile_truth] corrected {sources} sources")
+
+        # Post aggregates first: clusters are rolled up from them
+        if everything or args.clusters:
+            clusters = await reconcile_cluster_aggregates(session)
+            print(f"[reconcile_truth] corrected {clusters} claim clusters")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--post-id", type=UUID, default=None)
+    parser.add_argument("--source-id", type=UUID, default=None)
+    parser.add_argument("--clusters", action="store_true")
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,35 @@
+"""
+Periodic refresh of the persisted trending score.
+
+Usage:
+    python -m app.jobs.trending_refresh          # loop forever
+    python -m app.jobs.trending_refresh --once   # single pass
+"""
+import asyncio
+import os
+import sys
+
+from app.core.database import lifespan_session
+from app.services.trending_service import refresh_trending_scores
+
+
+REFRESH_INTERVAL_SECONDS = int(os.getenv("TRENDING_REFRESH_INTERVAL_SECONDS", "300"))
+
+
+async def run_once() -> int:
+    async with lifespan_session() as session:
+        return await refresh_trending_scores(session)
+
+
+async def run_forever():
+    while True:
+        updated = await run_once()
+        print(f"[trending] refreshed {updated} posts")
+        await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    if "--once" in sys.argv:
+        asyncio.run(run_once())
+    else:
+        asyncio.run(run_forever())
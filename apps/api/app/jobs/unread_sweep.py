@@ -0,0 +1,35 @@
+"""
+Periodic drift correction for the Redis unread notification counters.
+
+Usage:
+    python -m app.jobs.unread_sweep          # loop forever
+    python -m app.jobs.unread_sweep --once   # single pass
+"""
+import asyncio
+import os
+import sys
+
+from app.core.database import lifespan_session
+from app.services.unread_counter import sweep_unread_counters
+
+
+SWEEP_INTERVAL_SECONDS = int(os.getenv("UNREAD_SWEEP_INTERVAL_SECONDS", "900"))
+
+
+async def run_once() -> int:
+    async with lifespan_session() as session:
+        return await sweep_unread_counters(session)
+
+
+async def run_forever():
+    while True:
+        corrected = await run_once()
+        print(f"[unread_sweep] corrected {corrected} counters")
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    if "--once" in sys.argv:
+        asyncio.run(run_once())
+    else:
+        asyncio.run(run_forever())
@@ -0,0 +1,67 @@
+"""
+Evidence integrity verification run.
+
+Usage:
+    python -m app.jobs.verify_integrity                 # resume from checkpoint
+    python -m app.jobs.verify_integrity --restart       # start from the first row
+    python -m app.jobs.verify_integrity --concurrency 32 --per-host 4
+
+Also registered as the `verify_integrity` job, which is what
+POST /evidence/verify-integrity enqueues.
+"""
+import argparse
+import asyncio
+
+from app.core.database import lifespan_session
+from app.core.http_client import close_http_client
+from app.core.job_queue import enqueue, register_job
+from app.services.integrity_verifier import (
+    VERIFY_BATCH_SIZE,
+    VERIFY_CONCURRENCY,
+    VERIFY_PER_HOST_CONCURRENCY,
+    verify_evidence_integrity,
+)
+
+
+VERIFY_INTEGRITY_JOB = "verify_integrity"
+
+
+@register_job(VERIFY_INTEGRITY_JOB, max_concurrency=1)
+async def verify_integrity_job():
+    async with lifespan_session() as session:
+        await verify_evidence_integrity(session)
+
+
+async def enqueue_integrity_verification():
+    # A queued run that hasn't started yet already covers this request
+    return await enqueue(
+        VERIFY_INTEGRITY_JOB,
+        {},
+        coalesce_key=VERIFY_INTEGRITY_JOB,
+        max_attempts=1,
+    )
+
+
+async def main(args):
+    async with lifespan_session() as session:
+        stats = await verify_evidence_integrity(
+            session,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            resume=not args.restart,
+        )
+
+    await close_http_client()
+
+    print(f"[verify_integrity] {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=VERIFY_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=VERIFY_CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=VERIFY_PER_HOST_CONCURRENCY)
+    parser.add_argument("--restart", action="store_true")
+
+    asyncio.run(main(parser.parse_args()))
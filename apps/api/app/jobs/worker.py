@@ -0,0 +1,111 @@
+"""
+Background job worker.
+
+Usage:
+    python -m app.jobs.worker
+
+Env:
+    WORKER_ID            processing-list name; unique per process by default
+    WORKER_CONCURRENCY   max jobs running at once in this process
+"""
+import asyncio
+import os
+import time
+
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.database import lifespan_session
+from app.core.http_client import close_http_client
+from app.core.job_outbox import relay_pending_jobs
+from app.core.job_queue import (
+    WORKER_HEARTBEAT_TTL_SECONDS,
+    default_worker_id,
+    fetch_job,
+    heartbeat,
+    promote_due_jobs,
+    reap_stale_workers,
+    requeue_orphans,
+    run_job,
+)
+
+# Importing task modules registers their handlers
+import app.jobs.post_analysis  # noqa: F401
+import app.jobs.evidence_pipeline  # noqa: F401
+import app.jobs.verify_integrity  # noqa: F401
+import app.jobs.narrative_refresh  # noqa: F401
+
+
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "8"))
+PROMOTE_INTERVAL_SECONDS = float(os.getenv("WORKER_PROMOTE_INTERVAL_SECONDS", "1"))
+# Reaping dead workers and sweeping the job outbox
+MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("WORKER_MAINTENANCE_INTERVAL_SECONDS", "15"))
+
+
+async def promote_loop(worker_id: str):
+    last_heartbeat = last_maintenance = 0.0
+
+    while True:
+        now = time.monotonic()
+
+        try:
+            if now - last_heartbeat >= WORKER_HEARTBEAT_TTL_SECONDS / 3:
+                await heartbeat(worker_id)
+                last_heartbeat = now
+
+            await promote_due_jobs()
+
+            if now - last_maintenance >= MAINTENANCE_INTERVAL_SECONDS:
+                last_maintenance = now
+
+                reaped = await reap_stale_workers()
+                if reaped:
+                    print(f"[worker {worker_id}] requeued {reaped} jobs from dead workers")
+
+                async with lifespan_session() as session:
+                    relayed = await relay_pending_jobs(session)
+                if relayed:
+                    print(f"[worker {worker_id}] relayed {relayed} outbox jobs")
+        except (RedisError, SQLAlchemyError) as exc:
+            print(f"[worker {worker_id}] maintenance failed: {exc!r}")
+
+        await asyncio.sleep(PROMOTE_INTERVAL_SECONDS)
+
+
+async def run_worker(worker_id: str, concurrency: int = WORKER_CONCURRENCY):
+    # Heartbeat first so no other worker reaps our processing list
+    await heartbeat(worker_id)
+
+    requeued = await requeue_orphans(worker_id)
+    print(f"[worker {worker_id}] started, requeued {requeued} orphaned jobs")
+
+    slots = asyncio.Semaphore(concurrency)
+    promoter = asyncio.create_task(promote_loop(worker_id))
+    running = set()
+
+    async def execute(raw: str):
+        try:
+            await run_job(worker_id, raw)
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+
+            raw = await fetch_job(worker_id)
+
+            if raw is None:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(execute(raw))
+            running.add(task)
+            task.add_done_callback(running.discard)
+    finally:
+        promoter.cancel()
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker(default_worker_id()))
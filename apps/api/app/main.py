@@ -1,4 +1,6 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,6 +8,9 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from app.core.rate_limit import limiter
+from app.core.http_client import close_http_client
+from app.services.notification_stream import close_notification_hub
+from app.services.notification_partitions import ensure_partitions_ahead, keep_partitions_ahead
 from app.api.routes import (
     posts,
     admin_moderation,
@@ -13,10 +18,29 @@ from app.api.routes import (
     replies,
     likes,
     auth,
-    admin_security
+    admin_security,
+    admin_metrics,
+    evidence,
+    claim_clusters,
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Notification partitions for the coming months (no default partition)
+    await ensure_partitions_ahead()
+    partitions = asyncio.create_task(keep_partitions_ahead())
+
+    yield
+
+    partitions.cancel()
+    # Shared outbound HTTP pool (app.core.http_client)
+    await close_http_client()
+    # Shared notification pub/sub connection (app.services.notification_stream)
+    await close_notification_hub()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Lens API",
     version="0.1.0",
     description="Public discourse, evidence, and moderation API",
@@ -46,11 +70,14 @@ if not DISABLE_RATE_LIMITS:
 # ---- Routers ----
 app.include_router(posts.router)
 app.include_router(replies.router)
+app.include_router(evidence.router)
+app.include_router(claim_clusters.router)
 app.include_router(admin_moderation.router)
 app.include_router(notifications.router)
 app.include_router(likes.router)
 app.include_router(auth.router)
 app.include_router(admin_security.router)
+app.include_router(admin_metrics.router)
 
 # ---- Health check ----
 @app.get("/health", tags=["system"])
@@ -1,12 +1,141 @@
-import httpx
+import codecs
 import hashlib
+import os
+import re
+from dataclasses import dataclass
 
+from app.core.http_client import http_stream
+
+
+ARCHIVE_FETCH_TIMEOUT_SECONDS = float(os.getenv("ARCHIVE_FETCH_TIMEOUT_SECONDS", "10"))
+ARCHIVE_MAX_BYTES = int(os.getenv("ARCHIVE_MAX_BYTES", str(10 * 1024 * 1024)))
+ARCHIVE_EXCERPT_CHARS = int(os.getenv("ARCHIVE_EXCERPT_CHARS", "20000"))
+ARCHIVE_CHUNK_BYTES = 64 * 1024
+
+ARCHIVE_ALLOWED_CONTENT_TYPES = {
+    content_type.strip()
+    for content_type in os.getenv(
+        "ARCHIVE_ALLOWED_CONTENT_TYPES",
+        "text/html,text/plain,application/xhtml+xml,application/pdf,application/json",
+    ).split(",")
+    if content_type.strip()
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class FetchRejected(Exception):
+    """The response is too large or not a content type we archive."""
+
+
+@dataclass
+class FetchedPage:
+    content_hash: str | None
+    excerpt: str
+    size: int
+    content_type: str | None
+    etag: str | None = None
+    last_modified: str | None = None
+    # 304 to a conditional request: nothing was downloaded or hashed
+    not_modified: bool = False
+
+
+def normalize_excerpt(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _check_content_type(content_type: str | None):
+    if not content_type:
+        return
+
+    media_type = content_type.split(";", 1)[0].strip().lower()
+
+    if media_type not in ARCHIVE_ALLOWED_CONTENT_TYPES:
+        raise FetchRejected(f"Unsupported content type {media_type!r}")
+
+
+async def fetch_page(
+    url: str,
+    *,
+    timeout: float | None = None,
+    max_bytes: int = ARCHIVE_MAX_BYTES,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> FetchedPage:
+    """
+    Stream a page, hashing it chunk by chunk.
+
+    Memory stays flat regardless of body size: only the hash state and an
+    excerpt of at most ARCHIVE_EXCERPT_CHARS are kept. The hash matches
+    generate_content_hash(response.text) so existing fingerprints stay valid.
+    Raises FetchRejected for disallowed content types or bodies over max_bytes.
+
+    Passing the validators from a previous fetch makes the request
+    conditional; a 304 comes back as FetchedPage(not_modified=True).
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    async with http_stream(
+        url,
+        timeout=timeout if timeout is not None else ARCHIVE_FETCH_TIMEOUT_SECONDS,
+        headers=headers or None,
+    ) as response:
+        if response.status_code == 304:
+            return FetchedPage(
+                content_hash=None,
+                excerpt="",
+                size=0,
+                content_type=None,
+                etag=response.headers.get("etag", etag),
+                last_modified=response.headers.get("last-modified", last_modified),
+                not_modified=True,
+            )
 
-async def fetch_page_content(url: str) -> str:
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.get(url)
         response.raise_for_status()
-        return response.text
+
+        content_type = response.headers.get("content-type")
+        _check_content_type(content_type)
+
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise FetchRejected(f"Body of {declared} bytes exceeds {max_bytes}")
+
+        # Same decoding as response.text, applied incrementally
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        hasher = hashlib.sha256()
+        excerpt = []
+        excerpt_len = 0
+        size = 0
+
+        async for chunk in response.aiter_bytes(ARCHIVE_CHUNK_BYTES):
+            size += len(chunk)
+            if size > max_bytes:
+                raise FetchRejected(f"Body exceeds {max_bytes} bytes")
+
+            text = decoder.decode(chunk)
+            hasher.update(text.encode("utf-8"))
+
+            if excerpt_len < ARCHIVE_EXCERPT_CHARS:
+                excerpt.append(text[: ARCHIVE_EXCERPT_CHARS - excerpt_len])
+                excerpt_len += len(excerpt[-1])
+
+        tail = decoder.decode(b"", final=True)
+        hasher.update(tail.encode("utf-8"))
+        if excerpt_len < ARCHIVE_EXCERPT_CHARS:
+            excerpt.append(tail[: ARCHIVE_EXCERPT_CHARS - excerpt_len])
+
+    return FetchedPage(
+        content_hash=hasher.hexdigest(),
+        excerpt=normalize_excerpt("".join(excerpt)),
+        size=size,
+        content_type=content_type,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+    )
 
 
 def generate_content_hash(content: str) -> str:
@@ -0,0 +1,228 @@
+"""
+Content-addressed archive store.
+
+Snapshots live in archive_blobs keyed by the sha256 of the stored text
+(the page excerpt, not Evidence.content_hash, which fingerprints the full
+body), so a snapshot cited by many evidence rows is stored once. Each new
+version of a URL is compressed with the previous version as dictionary,
+which makes it a cheap delta; chains are cut at ARCHIVE_MAX_DELTA_CHAIN so
+reads stay bounded.
+
+Blobs are written with zstd; `zstandard` is in requirements.txt. If the
+import fails anyway, new blobs fall back to zlib and existing zstd blobs
+cannot be read. The codec is recorded per blob, so both can coexist.
+"""
+import difflib
+import os
+import re
+import zlib
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.archive_blob import ArchiveBlob, ArchiveVersion
+from app.services.archive_service import generate_content_hash
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+ARCHIVE_ZSTD_LEVEL = int(os.getenv("ARCHIVE_ZSTD_LEVEL", "10"))
+ARCHIVE_ZLIB_LEVEL = int(os.getenv("ARCHIVE_ZLIB_LEVEL", "9"))
+ARCHIVE_MAX_DELTA_CHAIN = int(os.getenv("ARCHIVE_MAX_DELTA_CHAIN", "8"))
+
+_SEGMENT_BREAK = re.compile(r"(?<=[.!?>])\s+")
+
+
+# -------------------------
+# Codecs
+# -------------------------
+
+def compress_blob(data: bytes, base: bytes | None = None) -> tuple[str, bytes]:
+    """Returns (codec, payload). With base, the payload is a delta against it."""
+    if zstandard is not None:
+        dict_data = (
+            zstandard.ZstdCompressionDict(base, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            if base else None
+        )
+        compressor = zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL, dict_data=dict_data)
+        return "zstd", compressor.compress(data)
+
+    compressor = (
+        zlib.compressobj(ARCHIVE_ZLIB_LEVEL, zdict=base)
+        if base else zlib.compressobj(ARCHIVE_ZLIB_LEVEL)
+    )
+    return "zlib", compressor.compress(data) + compressor.flush()
+
+
+def decompress_blob(codec: str, payload: bytes, base: bytes | None = None) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd archive blob found but `zstandard` is not installed")
+
+        dict_data = (
+            zstandard.ZstdCompressionDict(base, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            if base else None
+        )
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(payload)
+
+    if codec == "zlib":
+        decompressor = zlib.decompressobj(zdict=base) if base else zlib.decompressobj()
+        return decompressor.decompress(payload) + decompressor.flush()
+
+    raise ValueError(f"Unknown archive codec {codec!r}")
+
+
+# -------------------------
+# Blobs
+# -------------------------
+
+async def read_blob(session: AsyncSession, content_hash: str) -> str | None:
+    blob = await session.get(ArchiveBlob, content_hash)
+
+    if not blob:
+        return None
+
+    base = None
+    if blob.base_hash:
+        base = (await read_blob(session, blob.base_hash)).encode("utf-8")
+
+    return decompress_blob(blob.codec, blob.data, base).decode("utf-8")
+
+
+async def put_blob(
+    session: AsyncSession,
+    text: str,
+    base_hash: str | None = None,
+) -> ArchiveBlob:
+    """Store text under its own hash unless it is already there."""
+    content_hash = generate_content_hash(text)
+
+    existing = await session.get(ArchiveBlob, content_hash)
+    if existing:
+        return existing
+
+    base_blob = await session.get(ArchiveBlob, base_hash) if base_hash else None
+
+    # Start a fresh full snapshot once the delta chain gets long
+    if base_blob and base_blob.chain_depth >= ARCHIVE_MAX_DELTA_CHAIN:
+        base_blob = None
+
+    base = None
+    if base_blob:
+        base = (await read_blob(session, base_blob.content_hash)).encode("utf-8")
+
+    data = text.encode("utf-8")
+    codec, payload = compress_blob(data, base)
+
+    blob = ArchiveBlob(
+        content_hash=content_hash,
+        codec=codec,
+        data=payload,
+        base_hash=base_blob.content_hash if base_blob else None,
+        chain_depth=base_blob.chain_depth + 1 if base_blob else 0,
+        raw_size=len(data),
+    )
+
+    try:
+        # Savepoint so a concurrent insert of the same blob doesn't
+        # roll back the caller's transaction
+        async with session.begin_nested():
+            session.add(blob)
+    except IntegrityError:
+        return await session.get(ArchiveBlob, content_hash)
+
+    return blob
+
+
+# -------------------------
+# Versions
+# -------------------------
+
+async def get_latest_version(session: AsyncSession, source_url: str) -> ArchiveVersion | None:
+    result = await session.execute(
+        select(ArchiveVersion)
+        .where(ArchiveVersion.source_url == source_url)
+        .order_by(ArchiveVersion.version.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def record_version(
+    session: AsyncSession,
+    source_url: str,
+    text: str,
+) -> ArchiveVersion:
+    """
+    Append a snapshot to the URL's history, delta-encoded against the
+    previous version. Returns the existing latest version if the text is
+    unchanged. Runs in the caller's transaction.
+    """
+    content_hash = generate_content_hash(text)
+
+    for _ in range(3):
+        latest = await get_latest_version(session, source_url)
+
+        if latest and latest.content_hash == content_hash:
+            return latest
+
+        await put_blob(
+            session,
+            text,
+            base_hash=latest.content_hash if latest else None,
+        )
+
+        version = ArchiveVersion(
+            source_url=source_url,
+            version=latest.version + 1 if latest else 1,
+            content_hash=content_hash,
+        )
+
+        try:
+            async with session.begin_nested():
+                session.add(version)
+        except IntegrityError:
+            # Another writer took this version number; re-read and retry
+            continue
+
+        return version
+
+    raise RuntimeError(f"Could not record archive version for {source_url}")
+
+
+async def diff_versions(
+    session: AsyncSession,
+    source_url: str,
+    from_version: int,
+    to_version: int,
+) -> list[str] | None:
+    """Unified diff between two stored versions, or None if either is missing."""
+    result = await session.execute(
+        select(ArchiveVersion.version, ArchiveVersion.content_hash)
+        .where(
+            ArchiveVersion.source_url == source_url,
+            ArchiveVersion.version.in_([from_version, to_version]),
+        )
+    )
+    hashes = dict(result.all())
+
+    if from_version not in hashes or to_version not in hashes:
+        return None
+
+    before = await read_blob(session, hashes[from_version])
+    after = await read_blob(session, hashes[to_version])
+
+    # Excerpts are whitespace-normalized, so diff by sentence/tag segments
+    return list(
+        difflib.unified_diff(
+            _SEGMENT_BREAK.split(before),
+            _SEGMENT_BREAK.split(after),
+            fromfile=f"v{from_version}",
+            tofile=f"v{to_version}",
+            lineterm="",
+        )
+    )
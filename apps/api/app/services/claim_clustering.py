@@ -1,8 +1,53 @@
+"""
+Near-duplicate claim clustering.
+
+Each claim gets a MinHash signature over word shingles of its normalized
+text. Signatures are split into LSH bands stored in claim_lsh_buckets, so
+candidate near-duplicates come from an indexed lookup on (band, bucket)
+instead of a table scan. Candidates are then ranked by estimated Jaccard
+similarity and the best one above CLAIM_SIMILARITY_THRESHOLD donates its
+cluster id.
+"""
 import hashlib
-from sqlalchemy import select
+import os
+import random
+import re
+from array import array
+from uuid import UUID
+
+from sqlalchemy import select, update, delete, insert, exists, func, tuple_, or_, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.enums import ContentStatus
 from app.core.models.post import Post
+from app.core.models.claim_cluster import ClaimCluster
+from app.core.models.claim_signature import ClaimSignature, ClaimLshBucket
+from app.core.utils.cursor import encode_created_at_cursor, decode_created_at_cursor
+
+
+CLAIM_SHINGLE_SIZE = int(os.getenv("CLAIM_SHINGLE_SIZE", "3"))
+CLAIM_SIMILARITY_THRESHOLD = float(os.getenv("CLAIM_SIMILARITY_THRESHOLD", "0.5"))
+CLAIM_LSH_MAX_CANDIDATES = int(os.getenv("CLAIM_LSH_MAX_CANDIDATES", "200"))
+
+# 32 bands x 4 rows: pairs at 0.5 Jaccard share a bucket ~87% of the
+# time, pairs at 0.2 only ~5%
+LSH_BANDS = 32
+LSH_ROWS = 4
+NUM_PERM = LSH_BANDS * LSH_ROWS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+
+# Fixed seed: signatures must be comparable across processes and deploys
+_rng = random.Random(0x1E45)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
 
 
 def normalize_text(text: str):
@@ -17,24 +62,412 @@ def generate_claim_fingerprint(text: str):
     return hashlib.sha256(normalized.encode()).hexdigest()[:16]
 
 
-async def cluster_claim(session: AsyncSession, post: Post):
+# -------------------------
+# MinHash / LSH
+# -------------------------
+
+def shingles(text: str) -> set[str]:
+    # Punctuation and spacing differences shouldn't split a cluster
+    words = _WHITESPACE.sub(" ", _NON_WORD.sub(" ", normalize_text(text))).split()
+
+    if len(words) <= CLAIM_SHINGLE_SIZE:
+        return {" ".join(words)}
+
+    return {
+        " ".join(words[i:i + CLAIM_SHINGLE_SIZE])
+        for i in range(len(words) - CLAIM_SHINGLE_SIZE + 1)
+    }
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def minhash_signature(text: str) -> list[int]:
+    hashes = [_hash64(shingle) for shingle in shingles(text)]
+
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) for h in hashes) if hashes else _MAX_HASH
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(left: list[int], right: list[int]) -> float:
+    """Estimated Jaccard similarity of the underlying shingle sets."""
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+def lsh_buckets(signature: list[int]) -> list[tuple[int, int]]:
+    """(band, bucket) pairs; bucket is a signed 64-bit hash of the band's rows."""
+    buckets = []
+
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(array("Q", rows).tobytes(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "big", signed=True)))
+
+    return buckets
+
+
+def pack_signature(signature: list[int]) -> bytes:
+    return array("Q", signature).tobytes()
+
+
+def unpack_signature(raw: bytes) -> list[int]:
+    return array("Q", raw).tolist()
+
+
+# -------------------------
+# Clustering
+# -------------------------
+
+async def _find_best_match(
+    session: AsyncSession,
+    post_id: UUID,
+    signature: list[int],
+    buckets: list[tuple[int, int]],
+) -> tuple[str | None, float]:
+    candidates = (
+        select(ClaimLshBucket.post_id)
+        .where(
+            tuple_(ClaimLshBucket.band, ClaimLshBucket.bucket).in_(buckets),
+            ClaimLshBucket.post_id != post_id,
+        )
+        .distinct()
+        .limit(CLAIM_LSH_MAX_CANDIDATES)
+        .subquery()
+    )
+
+    result = await session.execute(
+        select(ClaimSignature.signature, Post.claim_cluster_id)
+        .join(Post, Post.id == ClaimSignature.post_id)
+        .where(
+            ClaimSignature.post_id.in_(select(candidates.c.post_id)),
+            Post.claim_cluster_id.is_not(None),
+        )
+    )
+
+    best_cluster, best_score = None, 0.0
+
+    for raw, cluster_id in result:
+        score = estimate_similarity(signature, unpack_signature(raw))
+
+        if score > best_score:
+            best_cluster, best_score = cluster_id, score
+
+    if best_score < CLAIM_SIMILARITY_THRESHOLD:
+        return None, best_score
+
+    return best_cluster, best_score
+
+
+async def assign_claim_cluster(session: AsyncSession, post_id: UUID, text: str) -> tuple[str, float]:
+    """
+    Index the claim and pick its cluster. Returns (cluster_id, similarity).
+
+    Runs inside the caller's transaction and does not touch the posts row.
+    """
+    signature = minhash_signature(text)
+    buckets = lsh_buckets(signature)
+
+    cluster_id, score = await _find_best_match(session, post_id, signature, buckets)
+
+    if cluster_id is None:
+        cluster_id, score = generate_claim_fingerprint(text), 0.5
+
+    # Replace any previous index entries (job retries, re-clustering)
+    await session.execute(delete(ClaimLshBucket).where(ClaimLshBucket.post_id == post_id))
+    await session.execute(delete(ClaimSignature).where(ClaimSignature.post_id == post_id))
+
+    await session.execute(
+        insert(ClaimSignature).values(post_id=post_id, signature=pack_signature(signature))
+    )
+    await session.execute(
+        insert(ClaimLshBucket),
+        [{"band": band, "bucket": bucket, "post_id": post_id} for band, bucket in buckets],
+    )
+
+    return cluster_id, score
+
+
+# -------------------------
+# claim_clusters aggregates (write path)
+# -------------------------
+
+async def _join_cluster(
+    session: AsyncSession,
+    cluster_id: str,
+    support: float,
+    contradict: float,
+    count: int,
+    members: int,
+):
+    stmt = pg_insert(ClaimCluster).values(
+        id=cluster_id,
+        member_count=members,
+        support_weight=support,
+        contradict_weight=contradict,
+        evidence_count=count,
+    )
+
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ClaimCluster.id],
+            set_={
+                "member_count": ClaimCluster.member_count + members,
+                "support_weight": ClaimCluster.support_weight + support,
+                "contradict_weight": ClaimCluster.contradict_weight + contradict,
+                "evidence_count": ClaimCluster.evidence_count + count,
+                "last_activity_at": func.now(),
+            },
+        )
+    )
+
+
+async def _leave_cluster(
+    session: AsyncSession,
+    cluster_id: str,
+    support: float,
+    contradict: float,
+    count: int,
+    members: int,
+):
+    """Runs after the post was moved out, so an emptied cluster is dropped."""
+    await session.execute(
+        update(ClaimCluster)
+        .where(ClaimCluster.id == cluster_id)
+        .values(
+            member_count=ClaimCluster.member_count - members,
+            support_weight=ClaimCluster.support_weight - support,
+            contradict_weight=ClaimCluster.contradict_weight - contradict,
+            evidence_count=ClaimCluster.evidence_count - count,
+            last_activity_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # member_count only counts visible posts, so emptiness is decided by
+    # the posts still pointing here (idx_posts_claim_cluster_created)
+    await session.execute(
+        delete(ClaimCluster).where(
+            ClaimCluster.id == cluster_id,
+            ~exists().where(Post.claim_cluster_id == cluster_id),
+        )
+    )
+
+
+def _member_weight(status) -> int:
+    """A post counts towards member_count only while it is listed."""
+    return 1 if status == ContentStatus.active else 0
+
+
+async def record_cluster_evidence(
+    session: AsyncSession,
+    cluster_id: str,
+    *,
+    support: float = 0.0,
+    contradict: float = 0.0,
+    count: int = 0,
+):
+    """Shift a cluster's evidence aggregates. Runs inside the caller's transaction."""
+    await session.execute(
+        update(ClaimCluster)
+        .where(ClaimCluster.id == cluster_id)
+        .values(
+            support_weight=ClaimCluster.support_weight + support,
+            contradict_weight=ClaimCluster.contradict_weight + contradict,
+            evidence_count=ClaimCluster.evidence_count + count,
+            last_activity_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
 
-    fingerprint = generate_claim_fingerprint(post.title or post.content)
+async def set_post_cluster(session: AsyncSession, post_id: UUID, cluster_id: str, score: float):
+    """
+    Move a post into cluster_id, carrying its truth aggregates along.
+    member_count follows the post only while it is active, matching
+    get_cluster_members.
 
+    The post row is locked first, the same order evidence writes take
+    (posts, then claim_clusters), so a concurrent evidence delta lands
+    either before the move or in the new cluster. Runs inside the
+    caller's transaction.
+    """
     result = await session.execute(
-        select(Post).where(Post.claim_cluster_id == fingerprint)
+        select(
+            Post.claim_cluster_id,
+            Post.support_weight,
+            Post.contradict_weight,
+            Post.evidence_count,
+            Post.status,
+        )
+        .where(Post.id == post_id)
+        .with_for_update()
+    )
+    row = result.one_or_none()
+
+    if row is None:
+        return
+
+    previous, support, contradict, count, status = row
+    members = _member_weight(status)
+
+    await session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(claim_cluster_id=cluster_id, claim_similarity_score=score)
+        .execution_options(synchronize_session=False)
+    )
+
+    if previous != cluster_id:
+        if previous is not None:
+            await _leave_cluster(session, previous, support, contradict, count, members)
+
+        await _join_cluster(session, cluster_id, support, contradict, count, members)
+
+
+async def record_cluster_visibility(session: AsyncSession, post: Post, previous_status):
+    """
+    Keep member_count in step with a post's status change (moderation).
+    Runs inside the caller's transaction.
+    """
+    delta = _member_weight(post.status) - _member_weight(previous_status)
+
+    if not post.claim_cluster_id or not delta:
+        return
+
+    await session.execute(
+        update(ClaimCluster)
+        .where(ClaimCluster.id == post.claim_cluster_id)
+        .values(
+            member_count=ClaimCluster.member_count + delta,
+            last_activity_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def cluster_claim(session: AsyncSession, post: Post):
+
+    cluster_id, score = await assign_claim_cluster(
+        session,
+        post.id,
+        post.title or post.body or "",
     )
 
-    existing = result.scalars().first()
+    await set_post_cluster(session, post.id, cluster_id, score)
 
-    if existing:
+    await session.commit()
 
-        post.claim_cluster_id = existing.claim_cluster_id
-        post.claim_similarity_score = 1.0
 
-    else:
+# -------------------------
+# Reconciliation (rebuild from posts)
+# -------------------------
+
+async def reconcile_cluster_aggregates(session: AsyncSession) -> int:
+    """
+    Rebuild claim_clusters from the posts table.
+
+    Missing clusters are created, drifted ones rewritten and empty ones
+    dropped. member_count counts active posts only, like the member
+    listing. Returns the number of clusters written. Commits.
+    """
+    totals = (
+        select(
+            Post.claim_cluster_id,
+            func.count().filter(Post.status == ContentStatus.active),
+            func.sum(Post.support_weight),
+            func.sum(Post.contradict_weight),
+            func.sum(Post.evidence_count),
+        )
+        .where(Post.claim_cluster_id.is_not(None))
+        .group_by(Post.claim_cluster_id)
+    )
 
-        post.claim_cluster_id = fingerprint
-        post.claim_similarity_score = 0.5
+    stmt = pg_insert(ClaimCluster).from_select(
+        ["id", "member_count", "support_weight", "contradict_weight", "evidence_count"],
+        totals,
+    )
+    excluded = stmt.excluded
+
+    result = await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ClaimCluster.id],
+            set_={
+                "member_count": excluded.member_count,
+                "support_weight": excluded.support_weight,
+                "contradict_weight": excluded.contradict_weight,
+                "evidence_count": excluded.evidence_count,
+            },
+            where=(
+                (ClaimCluster.member_count != excluded.member_count)
+                | (ClaimCluster.evidence_count != excluded.evidence_count)
+                | (func.abs(ClaimCluster.support_weight - excluded.support_weight) > 1e-9)
+                | (func.abs(ClaimCluster.contradict_weight - excluded.contradict_weight) > 1e-9)
+            ),
+        )
+    )
+
+    await session.execute(
+        delete(ClaimCluster).where(
+            ~exists().where(Post.claim_cluster_id == ClaimCluster.id)
+        )
+    )
 
     await session.commit()
+
+    return result.rowcount
+
+
+# -------------------------
+# Reads
+# -------------------------
+
+async def get_claim_cluster(session: AsyncSession, cluster_id: str) -> ClaimCluster | None:
+    return await session.get(ClaimCluster, cluster_id)
+
+
+async def get_cluster_members(
+    session: AsyncSession,
+    cluster_id: str,
+    *,
+    limit: int = 20,
+    cursor: str | None = None,
+):
+    """
+    Newest-first page of a cluster's visible posts, keyset-paginated on
+    (created_at, id) and served from idx_posts_claim_cluster_created.
+    """
+    stmt = (
+        select(Post)
+        .where(
+            Post.claim_cluster_id == cluster_id,
+            Post.status == ContentStatus.active,
+        )
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(limit)
+    )
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_created_at_cursor(cursor)
+
+        stmt = stmt.where(
+            or_(
+                Post.created_at < cursor_created_at,
+                and_(
+                    Post.created_at == cursor_created_at,
+                    Post.id < cursor_id,
+                ),
+            )
+        )
+
+    result = await session.execute(stmt)
+    posts = result.scalars().all()
+
+    next_cursor = None
+
+    if len(posts) == limit:
+        last = posts[-1]
+        next_cursor = encode_created_at_cursor(last.created_at, last.id)
+
+    return posts, next_cursor
@@ -1,9 +1,13 @@
 
+import os
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.models.post import Post
-from app.services.archive_service import fetch_page_content
-from app.services.archive_service import generate_content_hash
+from app.services.fetch_cache import get_or_fetch
+
+
+AGENT_FETCH_TIMEOUT_SECONDS = float(os.getenv("AGENT_FETCH_TIMEOUT_SECONDS", "5"))
 
 
 async def search_sources(query: str):
@@ -31,9 +35,9 @@ async def investigate_claim(session: AsyncSession, post_id):
 
         try:
 
-            content = await fetch_page_content(url)
+            page = await get_or_fetch(url, timeout=AGENT_FETCH_TIMEOUT_SECONDS)
 
-            hash_value = generate_content_hash(content)
+            hash_value = page.content_hash
 
             findings.append(
                 {
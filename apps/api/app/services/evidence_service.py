@@ -0,0 +1,59 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import ArchiveStatus
+from app.core.models.evidence import Evidence
+from app.services.archive_service import FetchRejected
+from app.services.fetch_cache import get_or_fetch
+from app.services.archive_store import record_version
+
+
+async def archive_evidence(session: AsyncSession, evidence_id: UUID):
+    """
+    Fetch, hash and record the archive snapshot for one evidence row.
+
+    Fetch errors mark the row failed and re-raise so the job queue retries.
+    Oversized or non-archivable responses are marked skipped instead.
+    """
+    evidence = await session.get(Evidence, evidence_id)
+
+    if not evidence or not evidence.source_url:
+        return
+
+    if evidence.archive_status == ArchiveStatus.archived:
+        return
+
+    try:
+        # Shared across evidence rows citing the same URL
+        page = await get_or_fetch(evidence.source_url)
+
+    except FetchRejected:
+        evidence.archive_status = ArchiveStatus.skipped
+        await session.commit()
+        return
+
+    except Exception:
+        evidence.archive_status = ArchiveStatus.failed
+        await session.commit()
+        raise
+
+    evidence.content_hash = page.content_hash
+
+    # Snapshot goes to the deduplicated archive store, not the evidence row
+    version = await record_version(
+        session,
+        evidence.source_url,
+        page.excerpt,
+    )
+    evidence.archive_version = version.version
+    evidence.source_etag = page.etag
+    evidence.source_last_modified = page.last_modified
+
+    # archive.org snapshot link
+    evidence.archive_url = f"https://web.archive.org/save/{evidence.source_url}"
+    evidence.archived_at = datetime.utcnow()
+    evidence.archive_status = ArchiveStatus.archived
+
+    await session.commit()
@@ -0,0 +1,232 @@
+import json
+import os
+from uuid import UUID
+from typing import Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.schemas.feed import PostCard, UserPublic
+from app.core.cache import redis as redis_cache
+from app.core.enums import FeedMode
+from app.services.post_service import get_feed
+from app.services.liked_posts_cache import get_liked_post_ids
+from app.services.graph_intelligence import (
+    analyze_posts_network,
+    detect_confirmation_cluster,
+    detect_single_source_narrative,
+)
+
+
+FEED_CACHE_TTL_SECONDS = int(os.getenv("FEED_CACHE_TTL_SECONDS", "30"))
+
+PAGE_KEY_PREFIX = "feed:page"
+TAG_KEY_PREFIX = "feed:tag"
+
+# Tag sets hold the page keys they cover
+TAG_ALL = f"{TAG_KEY_PREFIX}:all"
+
+
+def _post_tag(post_id) -> str:
+    return f"{TAG_KEY_PREFIX}:post:{post_id}"
+
+
+def _head_tag(mode: FeedMode) -> str:
+    return f"{TAG_KEY_PREFIX}:head:{mode.value}"
+
+
+def _page_key(mode: FeedMode, cursor: Optional[str], limit: int) -> str:
+    return f"{PAGE_KEY_PREFIX}:{mode.value}:{limit}:{cursor or '-'}"
+
+
+# -------------------------
+# Hit / miss counters (per process)
+# -------------------------
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "errors": 0,
+}
+
+
+def get_feed_cache_stats() -> dict:
+    lookups = _stats["hits"] + _stats["misses"]
+
+    return {
+        **_stats,
+        "hit_ratio": (_stats["hits"] / lookups) if lookups else 0.0,
+    }
+
+
+# -------------------------
+# Serialization
+# -------------------------
+
+def post_to_card(post, metrics: Optional[dict] = None) -> PostCard:
+    return PostCard(
+        id=post.id,
+        post_type=post.post_type,
+        title=post.title,
+        created_at=post.created_at,
+        status=post.status,
+        evidence_count=post.reply_count,
+        confidence_state="no_review",
+        trending_score=post.trending_score,
+        like_count=post.like_count,
+        reply_count=post.reply_count,
+        has_liked=post.liked_by_current_user,
+        single_source_risk=bool(metrics) and detect_single_source_narrative(metrics),
+        confirmation_cluster=bool(metrics) and detect_confirmation_cluster(metrics),
+        author=UserPublic(
+            id=post.author.id,
+            username=post.author.username,
+            display_name=post.author.display_name,
+            bio=post.author.bio,
+        ),
+    )
+
+
+# -------------------------
+# Read path
+# -------------------------
+
+async def get_feed_page(
+    db: AsyncSession,
+    *,
+    current_user_id: Optional[UUID] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    mode: FeedMode = FeedMode.latest,
+) -> dict:
+    """
+    Cached front for get_feed.
+
+    Pages are cached anonymously per (mode, cursor, limit) and tagged with
+    the post ids they contain; logged-in users share the same entries and
+    get has_liked overlaid from their liked-post set. Any Redis failure
+    falls through to Postgres.
+    """
+    page = await _get_shared_page(db, limit=limit, cursor=cursor, mode=mode)
+
+    if current_user_id:
+        await _overlay_has_liked(db, page, current_user_id)
+
+    return page
+
+
+async def _get_shared_page(
+    db: AsyncSession,
+    *,
+    limit: int,
+    cursor: Optional[str],
+    mode: FeedMode,
+) -> dict:
+    key = _page_key(mode, cursor, limit)
+
+    try:
+        cached = await redis_cache.redis_client.get(key)
+    except RedisError:
+        _stats["errors"] += 1
+        cached = None
+        key = None
+
+    if cached is not None:
+        _stats["hits"] += 1
+        return json.loads(cached)
+
+    page = await _load_page(db, limit=limit, cursor=cursor, mode=mode)
+
+    if key is not None:
+        _stats["misses"] += 1
+        await _store_page(key, page, mode=mode, is_head=cursor is None)
+
+    return page
+
+
+async def _overlay_has_liked(db: AsyncSession, page: dict, user_id: UUID):
+    liked = await get_liked_post_ids(
+        db,
+        user_id,
+        (item["id"] for item in page["items"]),
+    )
+
+    for item in page["items"]:
+        item["has_liked"] = item["id"] in liked
+
+
+async def _load_page(
+    db: AsyncSession,
+    *,
+    limit: int,
+    cursor: Optional[str],
+    mode: FeedMode,
+) -> dict:
+    posts, next_cursor = await get_feed(
+        db,
+        mode=mode,
+        limit=limit,
+        cursor=cursor,
+    )
+
+    # One grouped query (or cache hits) for the whole page, not one per card
+    metrics = await analyze_posts_network(db, [post.id for post in posts])
+
+    return {
+        "items": [
+            post_to_card(post, metrics.get(str(post.id))).model_dump(mode="json")
+            for post in posts
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
+async def _store_page(key: str, page: dict, *, mode: FeedMode, is_head: bool):
+    tags = [TAG_ALL] + [_post_tag(item["id"]) for item in page["items"]]
+
+    if is_head:
+        tags.append(_head_tag(mode))
+
+    try:
+        pipe = redis_cache.redis_client.pipeline()
+        pipe.set(key, json.dumps(page), ex=FEED_CACHE_TTL_SECONDS)
+
+        for tag in tags:
+            pipe.sadd(tag, key)
+            pipe.expire(tag, FEED_CACHE_TTL_SECONDS * 2)
+
+        await pipe.execute()
+    except RedisError:
+        _stats["errors"] += 1
+
+
+# -------------------------
+# Invalidation
+# -------------------------
+
+async def _invalidate_tags(*tags: str):
+    try:
+        keys = set()
+
+        for tag in tags:
+            keys.update(await redis_cache.redis_client.smembers(tag))
+
+        await redis_cache.redis_client.delete(*keys, *tags)
+    except RedisError:
+        # Entries expire on their own after FEED_CACHE_TTL_SECONDS
+        _stats["errors"] += 1
+
+
+async def invalidate_post(post_id):
+    """Drop every cached page containing the post (likes, replies)."""
+    await _invalidate_tags(_post_tag(post_id))
+
+
+async def invalidate_feed_head():
+    """Drop first pages of every mode (a new post was published)."""
+    await _invalidate_tags(*(_head_tag(mode) for mode in FeedMode))
+
+
+async def invalidate_all():
+    """Drop every cached page (post visibility changed)."""
+    await _invalidate_tags(TAG_ALL)
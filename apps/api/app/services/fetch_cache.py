@@ -0,0 +1,288 @@
+"""
+URL-level fetch cache shared by archiving, integrity checks and the agent.
+
+Results are keyed by normalized URL and kept in an in-process LRU in front
+of Redis. Concurrent misses for one URL are coalesced: within a process
+callers await the same task, across processes a Redis lock lets one
+worker fetch while the others wait for its result. A viral link attached
+by many users at once therefore costs one outbound request.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from redis.exceptions import RedisError
+
+from app.core.cache import redis as redis_cache
+from app.services.archive_service import FetchedPage, FetchRejected, fetch_page
+
+
+FETCH_CACHE_TTL_SECONDS = int(os.getenv("FETCH_CACHE_TTL_SECONDS", "300"))
+FETCH_CACHE_REJECTED_TTL_SECONDS = int(os.getenv("FETCH_CACHE_REJECTED_TTL_SECONDS", "3600"))
+FETCH_CACHE_LRU_SIZE = int(os.getenv("FETCH_CACHE_LRU_SIZE", "512"))
+FETCH_LOCK_SECONDS = int(os.getenv("FETCH_LOCK_SECONDS", "30"))
+FETCH_LOCK_POLL_SECONDS = 0.1
+
+ENTRY_KEY_PREFIX = "fetch:url"
+LOCK_KEY_PREFIX = "fetch:lock"
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+# DEL only if we still hold the lock: past FETCH_LOCK_SECONDS it may have
+# expired and been taken by another worker
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+# -------------------------
+# Keys
+# -------------------------
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme/host, drop default ports, fragments and tracking params."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    port = parts.port
+    if port and not (scheme == "http" and port == 80) and not (scheme == "https" and port == 443):
+        host = f"{host}:{port}"
+
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    ))
+
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def _cache_key(normalized: str) -> str:
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+    return f"{ENTRY_KEY_PREFIX}:{digest}"
+
+
+# -------------------------
+# Counters (per process)
+# -------------------------
+
+_stats = {
+    "local_hits": 0,
+    "redis_hits": 0,
+    "misses": 0,
+    "coalesced": 0,
+    "errors": 0,
+}
+
+
+def get_fetch_cache_stats() -> dict:
+    return {**_stats, "local_entries": len(_lru)}
+
+
+# -------------------------
+# In-process LRU
+# -------------------------
+
+# key -> (expires_at monotonic, entry)
+_lru: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+_inflight: dict[str, asyncio.Task] = {}
+
+
+def _lru_get(key: str) -> Optional[dict]:
+    item = _lru.get(key)
+
+    if item is None:
+        return None
+
+    expires_at, entry = item
+    if expires_at < time.monotonic():
+        del _lru[key]
+        return None
+
+    _lru.move_to_end(key)
+    return entry
+
+
+def _lru_put(key: str, entry: dict, ttl: int):
+    _lru[key] = (time.monotonic() + ttl, entry)
+    _lru.move_to_end(key)
+
+    while len(_lru) > FETCH_CACHE_LRU_SIZE:
+        _lru.popitem(last=False)
+
+
+def clear_local_cache():
+    _lru.clear()
+
+
+# -------------------------
+# Entries
+# -------------------------
+
+def _entry_to_page(entry: dict) -> FetchedPage:
+    if entry["status"] == "rejected":
+        raise FetchRejected(entry["reason"])
+
+    return FetchedPage(**entry["page"])
+
+
+async def _read_shared(key: str) -> Optional[dict]:
+    try:
+        raw = await redis_cache.redis_client.get(key)
+    except RedisError:
+        _stats["errors"] += 1
+        return None
+
+    return json.loads(raw) if raw else None
+
+
+async def _write_shared(key: str, entry: dict, ttl: int):
+    try:
+        await redis_cache.redis_client.set(key, json.dumps(entry), ex=ttl)
+    except RedisError:
+        _stats["errors"] += 1
+
+
+# -------------------------
+# Read path
+# -------------------------
+
+async def get_or_fetch(url: str, *, timeout: Optional[float] = None) -> FetchedPage:
+    """
+    Cached, single-flight front for fetch_page.
+
+    Successful fetches are cached for FETCH_CACHE_TTL_SECONDS and rejected
+    ones (too large, wrong content type) for FETCH_CACHE_REJECTED_TTL_SECONDS;
+    network errors are never cached.
+    """
+    key = _cache_key(normalize_url(url))
+
+    entry = _lru_get(key)
+    if entry is not None:
+        _stats["local_hits"] += 1
+        return _entry_to_page(entry)
+
+    task = _inflight.get(key)
+    if task is not None:
+        _stats["coalesced"] += 1
+    else:
+        task = asyncio.ensure_future(_fill(key, url, timeout))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield so one caller being cancelled doesn't cancel the shared fetch
+    entry = await asyncio.shield(task)
+
+    return _entry_to_page(entry)
+
+
+async def _fill(key: str, url: str, timeout: Optional[float]) -> dict:
+    entry = await _read_shared(key)
+    if entry is not None:
+        _stats["redis_hits"] += 1
+        _lru_put(key, entry, FETCH_CACHE_TTL_SECONDS)
+        return entry
+
+    lock_key = f"{LOCK_KEY_PREFIX}:{key}"
+    lock_token = secrets.token_hex(16)
+    client = redis_cache.redis_client
+
+    try:
+        locked = await client.set(lock_key, lock_token, nx=True, ex=FETCH_LOCK_SECONDS)
+    except RedisError:
+        _stats["errors"] += 1
+        locked = True
+
+    if not locked:
+        entry = await _wait_for_holder(key, lock_key)
+        if entry is not None:
+            _stats["coalesced"] += 1
+            _lru_put(key, entry, FETCH_CACHE_TTL_SECONDS)
+            return entry
+
+    _stats["misses"] += 1
+
+    try:
+        try:
+            page = await fetch_page(url, timeout=timeout)
+            entry = {"status": "ok", "fetched_at": time.time(), "page": asdict(page)}
+            ttl = FETCH_CACHE_TTL_SECONDS
+
+        except FetchRejected as exc:
+            entry = {"status": "rejected", "fetched_at": time.time(), "reason": str(exc)}
+            ttl = FETCH_CACHE_REJECTED_TTL_SECONDS
+
+        _lru_put(key, entry, ttl)
+        # Written before the lock is released so waiters find it
+        await _write_shared(key, entry, ttl)
+
+    finally:
+        if locked:
+            try:
+                await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, lock_token)
+            except RedisError:
+                _stats["errors"] += 1
+
+    return entry
+
+
+async def _wait_for_holder(key: str, lock_key: str) -> Optional[dict]:
+    """Poll for another process's result until its lock goes away."""
+    deadline = time.monotonic() + FETCH_LOCK_SECONDS
+
+    try:
+        while time.monotonic() < deadline:
+            await asyncio.sleep(FETCH_LOCK_POLL_SECONDS)
+
+            entry = await _read_shared(key)
+            if entry is not None:
+                return entry
+
+            # Holder failed without caching anything; fetch ourselves
+            if not await redis_cache.redis_client.exists(lock_key):
+                return None
+    except RedisError:
+        _stats["errors"] += 1
+
+    return None
+
+
+# -------------------------
+# Peek / store (conditional fetches)
+# -------------------------
+
+async def peek(url: str) -> Optional[FetchedPage]:
+    """Cached page for url if one is fresh, without fetching."""
+    key = _cache_key(normalize_url(url))
+
+    entry = _lru_get(key)
+    if entry is not None:
+        _stats["local_hits"] += 1
+    else:
+        entry = await _read_shared(key)
+        if entry is None:
+            return None
+        _stats["redis_hits"] += 1
+        _lru_put(key, entry, FETCH_CACHE_TTL_SECONDS)
+
+    return _entry_to_page(entry)
+
+
+async def store(url: str, page: FetchedPage):
+    """Cache a page fetched outside get_or_fetch (e.g. a conditional fetch)."""
+    key = _cache_key(normalize_url(url))
+    entry = {"status": "ok", "fetched_at": time.time(), "page": asdict(page)}
+
+    _lru_put(key, entry, FETCH_CACHE_TTL_SECONDS)
+    await _write_shared(key, entry, FETCH_CACHE_TTL_SECONDS)
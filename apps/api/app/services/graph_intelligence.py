@@ -1,38 +1,120 @@
-from sqlalchemy import select
+import json
+import os
+
+from redis.exceptions import RedisError
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import redis as redis_cache
 from app.core.models.evidence import Evidence
-from app.core.models.post import Post
 
 
-async def analyze_post_network(session: AsyncSession, post_id):
+GRAPH_METRICS_TTL_SECONDS = int(os.getenv("GRAPH_METRICS_TTL_SECONDS", "600"))
+
+METRICS_KEY_PREFIX = "graph:metrics"
+
+
+def _metrics_key(post_id) -> str:
+    return f"{METRICS_KEY_PREFIX}:{post_id}"
+
+
+def _empty_metrics() -> dict:
+    return {
+        "unique_sources": 0,
+        "supporting_evidence": 0,
+        "contradicting_evidence": 0,
+        "evidence_count": 0,
+    }
+
+
+# -------------------------
+# Metrics (one aggregate query per batch)
+# -------------------------
+
+async def _load_network_metrics(session: AsyncSession, post_ids: list) -> dict:
+    is_support = Evidence.direction == "supports"
 
     result = await session.execute(
-        select(Evidence).where(Evidence.post_id == post_id)
+        select(
+            Evidence.post_id,
+            func.count(Evidence.source_id.distinct()),
+            func.count().filter(is_support),
+            func.count().filter(~is_support),
+            func.count(),
+        )
+        .where(Evidence.post_id.in_(post_ids))
+        .group_by(Evidence.post_id)
     )
 
-    evidence_list = result.scalars().all()
+    metrics = {str(post_id): _empty_metrics() for post_id in post_ids}
 
-    sources = set()
-    supporting = 0
-    contradicting = 0
+    for post_id, unique_sources, supporting, contradicting, total in result:
+        metrics[str(post_id)] = {
+            "unique_sources": unique_sources,
+            "supporting_evidence": supporting,
+            "contradicting_evidence": contradicting,
+            "evidence_count": total,
+        }
 
-    for e in evidence_list:
+    return metrics
 
-        if e.source_id:
-            sources.add(e.source_id)
 
-        if e.direction == "supports":
-            supporting += 1
-        else:
-            contradicting += 1
+async def analyze_posts_network(session: AsyncSession, post_ids) -> dict:
+    """
+    Network metrics for many posts, keyed by str(post_id).
 
-    return {
-        "unique_sources": len(sources),
-        "supporting_evidence": supporting,
-        "contradicting_evidence": contradicting,
-        "evidence_count": len(evidence_list),
-    }
+    Cached per post in Redis; all misses are computed with a single
+    grouped aggregate. Redis failures fall through to Postgres.
+    """
+    by_key = {str(post_id): post_id for post_id in post_ids}
+    post_ids = list(by_key)
+
+    if not post_ids:
+        return {}
+
+    client = redis_cache.redis_client
+    metrics = {}
+
+    try:
+        cached = await client.mget([_metrics_key(post_id) for post_id in post_ids])
+    except RedisError:
+        cached = [None] * len(post_ids)
+
+    for post_id, raw in zip(post_ids, cached):
+        if raw is not None:
+            metrics[post_id] = json.loads(raw)
+
+    missing = [post_id for post_id in post_ids if post_id not in metrics]
+
+    if missing:
+        loaded = await _load_network_metrics(session, [by_key[post_id] for post_id in missing])
+        metrics.update(loaded)
+
+        try:
+            pipe = client.pipeline()
+            for post_id, value in loaded.items():
+                pipe.set(_metrics_key(post_id), json.dumps(value), ex=GRAPH_METRICS_TTL_SECONDS)
+            await pipe.execute()
+        except RedisError:
+            pass
+
+    return metrics
+
+
+async def analyze_post_network(session: AsyncSession, post_id):
+
+    metrics = await analyze_posts_network(session, [post_id])
+
+    return metrics[str(post_id)]
+
+
+async def invalidate_post_network(post_id):
+    """Drop cached metrics after an evidence write on the post."""
+    try:
+        await redis_cache.redis_client.delete(_metrics_key(post_id))
+    except RedisError:
+        # Entry expires on its own after GRAPH_METRICS_TTL_SECONDS
+        pass
 
 
 def detect_single_source_narrative(metrics):
@@ -1,47 +1,310 @@
+import asyncio
+import json
+import os
+from collections import defaultdict, deque
+from datetime import datetime
+from urllib.parse import urlsplit
+from uuid import UUID
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
+from sqlalchemy.orm import load_only
 
+from app.core.cache import redis as redis_cache
 from app.core.models.evidence import Evidence
-from app.services.archive_service import fetch_page_content, generate_content_hash
+from app.services.archive_service import FetchedPage, fetch_page
+from app.services.archive_store import record_version
+from app.services import fetch_cache
 from app.services.credibility_engine import calculate_credibility_score
+from app.services.truth_engine import record_evidence_rescored
+from app.services.source_intelligence import record_citation_rescored
+
+
+VERIFY_BATCH_SIZE = int(os.getenv("VERIFY_BATCH_SIZE", "200"))
+VERIFY_CONCURRENCY = int(os.getenv("VERIFY_CONCURRENCY", "16"))
+VERIFY_PER_HOST_CONCURRENCY = int(os.getenv("VERIFY_PER_HOST_CONCURRENCY", "4"))
+VERIFY_FETCH_TIMEOUT_SECONDS = float(os.getenv("VERIFY_FETCH_TIMEOUT_SECONDS", "20"))
+
+CHECKPOINT_KEY = "integrity:checkpoint"
+
+
+# -------------------------
+# Checkpoint (Redis)
+# -------------------------
+
+async def load_checkpoint() -> UUID | None:
+    raw = await redis_cache.redis_client.get(CHECKPOINT_KEY)
+
+    if not raw:
+        return None
+
+    return UUID(json.loads(raw)["last_id"])
+
+
+async def save_checkpoint(last_id: UUID):
+    await redis_cache.redis_client.set(
+        CHECKPOINT_KEY,
+        json.dumps({
+            "last_id": str(last_id),
+            "saved_at": datetime.utcnow().isoformat(),
+        }),
+    )
+
+
+async def clear_checkpoint():
+    await redis_cache.redis_client.delete(CHECKPOINT_KEY)
+
+
+# -------------------------
+# Fetching
+# -------------------------
+
+class HostLimiter:
+    """Global cap on in-flight fetches plus a smaller cap per host."""
+
+    def __init__(self, concurrency: int, per_host: int):
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts = defaultdict(lambda: asyncio.Semaphore(per_host))
+
+    async def fetch(self, url: str, **validators) -> FetchedPage:
+        # A fresh fetch by the archiver or another verifier is good enough
+        cached = await fetch_cache.peek(url)
+        if cached is not None:
+            return cached
+
+        host = urlsplit(url).hostname or ""
+
+        # Host slot first: waiting on a busy host must not hold a global
+        # slot that fetches to other hosts could use
+        async with self._hosts[host], self._global:
+            page = await fetch_page(url, timeout=VERIFY_FETCH_TIMEOUT_SECONDS, **validators)
+
+        if not page.not_modified:
+            await fetch_cache.store(url, page)
+
+        return page
+
+
+async def _fetch_one(
+    evidence: Evidence,
+    limiter: HostLimiter,
+) -> tuple[str, FetchedPage | None]:
+    """Returns ("verified" | "unchanged" (304) | "failed", fetched page)."""
+    try:
+        # Conditional fetch using the validators from the last full fetch
+        page = await limiter.fetch(
+            str(evidence.source_url),
+            etag=evidence.source_etag,
+            last_modified=evidence.source_last_modified,
+        )
+    except Exception:
+        # Network failures, dead links and oversized bodies should not crash verification
+        return "failed", None
+
+    if page.not_modified:
+        return "unchanged", page
+
+    return "verified", page
+
 
+def _apply_outcome(evidence: Evidence, outcome: str, page: FetchedPage | None):
+    """Writes a fetch result onto the row; kept apart from the fetch so that
+    only the writer touches rows the session could flush."""
+    if outcome == "failed":
+        return
 
-async def verify_evidence_integrity(session: AsyncSession):
+    # Update verification timestamp
+    evidence.last_verified_at = datetime.utcnow()
 
-    result = await session.execute(
-        select(Evidence).where(Evidence.source_url.is_not(None))
+    if outcome == "unchanged":
+        # Server vouches the body is unchanged since content_hash was taken
+        return
+
+    evidence.source_etag = page.etag
+    evidence.source_last_modified = page.last_modified
+
+    # Streamed fingerprint
+    new_hash = page.content_hash
+
+    # Detect tampering
+    evidence.tampered = bool(evidence.content_hash and evidence.content_hash != new_hash)
+
+    # Recalculate credibility score
+    evidence.credibility_score = calculate_credibility_score(
+        evidence.weight,
+        None,  # source reputation can be added later
+        evidence.tampered,
     )
 
-    evidence_list = result.scalars().all()
 
-    for evidence in evidence_list:
+# -------------------------
+# Verifier
+# -------------------------
+
+async def verify_evidence_integrity(
+    session: AsyncSession,
+    *,
+    batch_size: int = VERIFY_BATCH_SIZE,
+    concurrency: int = VERIFY_CONCURRENCY,
+    per_host: int = VERIFY_PER_HOST_CONCURRENCY,
+    resume: bool = True,
+) -> dict:
+    """
+    Re-fetch every archived source and flag tampering.
+
+    A producer streams rows in keyset order by id (archived_content is
+    never loaded) into a bounded queue; `concurrency` workers fetch them
+    under global and per-host limits, so one slow host holds up only its
+    own rows. Fetches are conditional on the stored ETag/Last-Modified, so
+    unchanged pages cost a 304 and no hashing. Changed pages are appended
+    to the URL's archive history as deltas.
+
+    Results are written by this coroutine alone and committed every
+    batch_size rows. The checkpoint saved in Redis is the highest id below
+    which every row is committed, so an interrupted run resumes without
+    skipping rows still in flight.
+    """
+    limiter = HostLimiter(concurrency, per_host)
+
+    last_id = await load_checkpoint() if resume else None
+    stats = {
+        "checked": 0,
+        "verified": 0,
+        "unchanged": 0,
+        "failed": 0,
+        "resumed_from": str(last_id) if last_id else None,
+    }
+
+    pending: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+    results: asyncio.Queue = asyncio.Queue()
+    # The session is not safe for concurrent use: the producer's reads and
+    # the writes below take turns
+    session_lock = asyncio.Lock()
+
+    # Ids in scan order, and which of them have a result
+    scanned: deque = deque()
+    done: dict[UUID, Evidence] = {}
+
+    async def produce():
+        cursor = last_id
 
         try:
-            # Fetch current source content
-            content = await fetch_page_content(str(evidence.source_url))
+            while True:
+                stmt = (
+                    select(Evidence)
+                    .options(
+                        load_only(
+                            Evidence.id,
+                            Evidence.post_id,
+                            Evidence.direction,
+                            Evidence.source_id,
+                            Evidence.source_url,
+                            Evidence.content_hash,
+                            Evidence.weight,
+                            Evidence.tampered,
+                            Evidence.credibility_score,
+                            Evidence.last_verified_at,
+                            Evidence.source_etag,
+                            Evidence.source_last_modified,
+                        )
+                    )
+                    .where(Evidence.source_url.is_not(None))
+                    .order_by(Evidence.id)
+                    .limit(batch_size)
+                )
+
+                if cursor:
+                    stmt = stmt.where(Evidence.id > cursor)
+
+                async with session_lock:
+                    batch = (await session.execute(stmt)).scalars().all()
+
+                if not batch:
+                    break
+
+                for evidence in batch:
+                    scanned.append(evidence.id)
+                    await pending.put(evidence)
+
+                cursor = batch[-1].id
+        finally:
+            # Also on failure, so the workers and the writer wind down
+            for _ in range(concurrency):
+                await pending.put(None)
+
+    async def work():
+        while (evidence := await pending.get()) is not None:
+            # Workers only read the row: a flush triggered by the producer
+            # or the writer must not persist a half-recorded result
+            outcome, page = await _fetch_one(evidence, limiter)
+            await results.put((evidence, outcome, page))
+
+        await results.put(None)
+
+    async def commit_and_checkpoint():
+        await session.commit()
+
+        checkpoint = None
+        while scanned and scanned[0] in done:
+            checkpoint = scanned.popleft()
+            # Keep the identity map from growing across the whole table
+            session.expunge(done.pop(checkpoint))
+
+        if checkpoint:
+            await save_checkpoint(checkpoint)
+
+    tasks = [asyncio.create_task(produce())]
+    tasks += [asyncio.create_task(work()) for _ in range(concurrency)]
+
+    try:
+        finished_workers = 0
+        uncommitted = 0
+
+        while finished_workers < concurrency:
+            item = await results.get()
+
+            if item is None:
+                finished_workers += 1
+                continue
+
+            evidence, outcome, page = item
+
+            async with session_lock:
+                previous_score, was_tampered = evidence.credibility_score, evidence.tampered
+                _apply_outcome(evidence, outcome, page)
+
+                if outcome == "verified":
+                    # Every change goes into the history, including a page
+                    # changing back; an unchanged snapshot is a no-op
+                    await record_version(
+                        session,
+                        evidence.source_url,
+                        page.excerpt,
+                    )
+
+                    await record_evidence_rescored(session, evidence, previous_score)
+                    await record_citation_rescored(session, evidence, previous_score, was_tampered)
+
+                done[evidence.id] = evidence
+                uncommitted += 1
 
-            # Generate new fingerprint
-            new_hash = generate_content_hash(content)
+                if uncommitted >= batch_size:
+                    await commit_and_checkpoint()
+                    uncommitted = 0
 
-            # Detect tampering
-            if evidence.content_hash and evidence.content_hash != new_hash:
-                evidence.tampered = True
-            else:
-                evidence.tampered = False
+            stats["checked"] += 1
+            stats[outcome] += 1
 
-            # Update verification timestamp
-            evidence.last_verified_at = datetime.utcnow()
+        async with session_lock:
+            await commit_and_checkpoint()
 
-            # Recalculate credibility score
-            evidence.credibility_score = calculate_credibility_score(
-                evidence.weight,
-                None,  # source reputation can be added later
-                evidence.tampered,
-            )
+        # Surface a failed producer instead of reporting a partial pass
+        await tasks[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-        except Exception:
-            # Network failures or dead links should not crash verification
-            continue
+    await clear_checkpoint()
 
-    await session.commit()
+    return stats
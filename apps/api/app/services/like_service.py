@@ -7,7 +7,10 @@ from app.core.models.post_likes import PostLike
 from app.core.models.reply_like import ReplyLike
 from app.core.models.post import Post
 from app.core.models.reply import Reply
-from app.services.notification_service import create_notification
+from app.services.notification_service import create_grouped_notification
+from app.services.trending_service import refresh_post_trending_score
+from app.services.feed_cache import invalidate_post
+from app.services.liked_posts_cache import add_liked_post, remove_liked_post
 from app.core.constants.notification import NotificationType
 
 
@@ -32,6 +35,7 @@ async def like_post(db: AsyncSession, *, post_id: UUID, user_id: UUID):
             .where(Post.id == post_id)
             .values(like_count=Post.like_count + 1)
         )
+        await refresh_post_trending_score(db, post_id)
 
         await db.commit()
         created = True
@@ -40,12 +44,18 @@ async def like_post(db: AsyncSession, *, post_id: UUID, user_id: UUID):
         await db.rollback()
         created = False  # already liked
 
+    if created:
+        await add_liked_post(user_id, post_id)
+        await invalidate_post(post_id)
+
     # 🔔 Notify only if newly created
     if created and post.author_id != user_id:
-        await create_notification(
+        await create_grouped_notification(
             db,
             user_id=post.author_id,
             type=NotificationType.POST_LIKE,
+            target_id=post_id,
+            actor_id=user_id,
             payload={
                 "post_id": str(post_id),
                 "author_id": str(user_id),
@@ -78,8 +88,11 @@ async def unlike_post(db: AsyncSession, *, post_id: UUID, user_id: UUID):
             .where(Post.id == post_id, Post.like_count > 0)
             .values(like_count=Post.like_count - 1)
         )
+        await refresh_post_trending_score(db, post_id)
 
         await db.commit()
+        await remove_liked_post(user_id, post_id)
+        await invalidate_post(post_id)
         return True
 
     await db.commit()
@@ -115,10 +128,12 @@ async def like_reply(db: AsyncSession, *, reply_id: UUID, user_id: UUID):
         created = False
 
     if created and reply.author_id != user_id:
-        await create_notification(
+        await create_grouped_notification(
             db,
             user_id=reply.author_id,
             type=NotificationType.REPLY_LIKE,
+            target_id=reply_id,
+            actor_id=user_id,
             payload={
                 "reply_id": str(reply_id),
                 "author_id": str(user_id),
@@ -0,0 +1,150 @@
+import os
+from uuid import UUID
+from typing import Iterable, Set
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import redis as redis_cache
+from app.core.models.post_likes import PostLike
+
+
+LIKED_SET_TTL_SECONDS = int(os.getenv("LIKED_SET_TTL_SECONDS", str(24 * 3600)))
+
+# Marks a set as fully loaded from Postgres (Redis drops empty sets,
+# and like_post may SADD into a set that was never loaded).
+LOADED_MARKER = "-"
+
+# Fill the set only if no unlike landed since the rebuild read its version;
+# otherwise the rebuild's snapshot could re-add a post that was just unliked.
+# SADD is chunked to stay under Lua's unpack limit.
+_REBUILD_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+for i = 3, #ARGV, 5000 do
+    redis.call('SADD', KEYS[1], unpack(ARGV, i, math.min(i + 4999, #ARGV)))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+def _liked_key(user_id) -> str:
+    return f"likes:user:{user_id}"
+
+
+def _version_key(user_id) -> str:
+    return f"likes:user:{user_id}:version"
+
+
+async def _invalidate(user_id):
+    # A write we couldn't apply leaves the set stale; dropping it forces a rebuild
+    try:
+        await redis_cache.redis_client.delete(_liked_key(user_id))
+    except RedisError:
+        pass
+
+
+# -------------------------
+# Write path (like_service)
+# -------------------------
+
+async def add_liked_post(user_id: UUID, post_id: UUID):
+    try:
+        await redis_cache.redis_client.sadd(_liked_key(user_id), str(post_id))
+    except RedisError:
+        await _invalidate(user_id)
+
+
+async def remove_liked_post(user_id: UUID, post_id: UUID):
+    try:
+        pipe = redis_cache.redis_client.pipeline()
+        pipe.srem(_liked_key(user_id), str(post_id))
+        pipe.incr(_version_key(user_id))
+        pipe.expire(_version_key(user_id), LIKED_SET_TTL_SECONDS)
+        await pipe.execute()
+    except RedisError:
+        await _invalidate(user_id)
+
+
+# -------------------------
+# Read path (feed overlay)
+# -------------------------
+
+async def get_liked_post_ids(
+    db: AsyncSession,
+    user_id: UUID,
+    post_ids: Iterable[str],
+) -> Set[str]:
+    """
+    Return the subset of post_ids the user has liked.
+
+    One SMISMEMBER probe when the set is warm; otherwise one batched
+    post_likes query, after which the set is rebuilt for later requests.
+    """
+    post_ids = [str(post_id) for post_id in post_ids]
+
+    if not post_ids:
+        return set()
+
+    key = _liked_key(user_id)
+
+    try:
+        flags = await redis_cache.redis_client.smismember(
+            key, [LOADED_MARKER, *post_ids]
+        )
+    except RedisError:
+        return await _load_liked_subset(db, user_id, post_ids)
+
+    if flags[0]:
+        return {post_id for post_id, liked in zip(post_ids, flags[1:]) if liked}
+
+    liked = await _rebuild_liked_set(db, user_id)
+
+    return {post_id for post_id in post_ids if post_id in liked}
+
+
+async def _load_liked_subset(db: AsyncSession, user_id: UUID, post_ids: list) -> Set[str]:
+    result = await db.execute(
+        select(PostLike.post_id).where(
+            PostLike.user_id == user_id,
+            PostLike.post_id.in_([UUID(post_id) for post_id in post_ids]),
+        )
+    )
+
+    return {str(row[0]) for row in result.all()}
+
+
+async def _rebuild_liked_set(db: AsyncSession, user_id: UUID) -> Set[str]:
+    try:
+        version = await redis_cache.redis_client.get(_version_key(user_id)) or "0"
+    except RedisError:
+        version = None
+
+    result = await db.execute(
+        select(PostLike.post_id).where(PostLike.user_id == user_id)
+    )
+
+    liked = {str(row[0]) for row in result.all()}
+
+    if version is None:
+        return liked
+
+    try:
+        # Skipped when an unlike raced the query; the next read rebuilds
+        await redis_cache.redis_client.eval(
+            _REBUILD_SCRIPT,
+            2,
+            _liked_key(user_id),
+            _version_key(user_id),
+            version,
+            LIKED_SET_TTL_SECONDS,
+            LOADED_MARKER,
+            *liked,
+        )
+    except RedisError:
+        await _invalidate(user_id)
+
+    return liked
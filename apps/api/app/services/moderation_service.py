@@ -14,6 +14,8 @@ from app.api.schemas.moderation import (
     ModerationTargetType,
 )
 from app.services.notification_service import create_notification
+from app.services.feed_cache import invalidate_all
+from app.services.claim_clustering import record_cluster_visibility
 
 
 async def moderate_content(
@@ -42,6 +44,9 @@ async def moderate_content(
 
     target.status = new_status
 
+    if target_type == "post":
+        await record_cluster_visibility(db, target, previous_status)
+
     action = ModerationAction(
         moderator_id=moderator_id,
         target_type=target_type,
@@ -55,6 +60,10 @@ async def moderate_content(
     await db.commit()
     await db.refresh(target)
 
+    # Post visibility changed — cached feed pages may gain or lose it
+    if target_type == "post":
+        await invalidate_all()
+
     # -----------------------------
     # 🔔 Notify content author
     # -----------------------------
@@ -1,9 +1,16 @@
 import hashlib
-from sqlalchemy import select
+
+from sqlalchemy import select, update, delete, func, cast, literal, or_, Float, String
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.models.evidence import Evidence
 from app.core.models.post import Post
+from app.core.models.source_post import SourcePost
+
+
+# Cluster size at which narrative risk saturates
+FULL_RISK_CLUSTER_SIZE = 10
 
 
 def generate_cluster_id(source_ids):
@@ -15,41 +22,185 @@ def generate_cluster_id(source_ids):
     return hashlib.sha256(raw.encode()).hexdigest()[:16]
 
 
-async def analyze_post_narrative(session: AsyncSession, post_id):
+def cluster_id_aggregate(source_id_column):
+    """
+    generate_cluster_id as a SQL aggregate over source_id_column: sha256
+    over the sorted, "|"-joined source ids, first 16 hex chars.
+    """
+    source_text = cast(source_id_column, String)
+
+    return func.left(
+        func.encode(
+            func.sha256(
+                func.convert_to(
+                    func.string_agg(
+                        source_text,
+                        # Byte order, to match Python's sorted() regardless of locale
+                        aggregate_order_by(literal("|"), source_text.collate("C")),
+                    ),
+                    "UTF8",
+                )
+            ),
+            "hex",
+        ),
+        16,
+    )
 
-    result = await session.execute(
-        select(Evidence).where(Evidence.post_id == post_id)
+
+# -------------------------
+# source_posts maintenance (write path)
+# -------------------------
+
+async def link_source_post(session: AsyncSession, evidence: Evidence):
+    """Count one more citation of evidence.source_id by evidence.post_id."""
+    if not evidence.source_id:
+        return
+
+    stmt = insert(SourcePost).values(
+        source_id=evidence.source_id,
+        post_id=evidence.post_id,
+        evidence_count=1,
+    )
+
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[SourcePost.source_id, SourcePost.post_id],
+            set_={"evidence_count": SourcePost.evidence_count + 1},
+        )
     )
 
-    evidence_list = result.scalars().all()
 
-    source_ids = set()
+async def unlink_source_post(session: AsyncSession, evidence: Evidence):
+    if not evidence.source_id:
+        return
+
+    key = (
+        (SourcePost.source_id == evidence.source_id)
+        & (SourcePost.post_id == evidence.post_id)
+    )
+
+    await session.execute(
+        update(SourcePost)
+        .where(key)
+        .values(evidence_count=SourcePost.evidence_count - 1)
+    )
+    await session.execute(
+        delete(SourcePost).where(key, SourcePost.evidence_count <= 0)
+    )
 
-    for e in evidence_list:
-        if e.source_id:
-            source_ids.add(e.source_id)
+
+# -------------------------
+# Single post (evidence pipeline)
+# -------------------------
+
+async def analyze_post_narrative(session: AsyncSession, post_id):
+    """
+    Cluster a post by the sources it cites.
+
+    Cluster size is the largest number of posts citing any one of those
+    sources, the same measure refresh_all_narratives uses. Both lookups
+    are index scans on source_posts.
+    """
+    result = await session.execute(
+        select(SourcePost.source_id).where(SourcePost.post_id == post_id)
+    )
+
+    source_ids = set(result.scalars().all())
 
     if not source_ids:
         return
 
     cluster_id = generate_cluster_id(source_ids)
 
-    # Count posts sharing these sources
-    result = await session.execute(
-        select(Evidence.post_id).where(Evidence.source_id.in_(source_ids))
+    # (source_id, post_id) is unique, so count() is the distinct posts per source
+    source_counts = (
+        select(func.count().label("post_count"))
+        .where(SourcePost.source_id.in_(source_ids))
+        .group_by(SourcePost.source_id)
+        .subquery()
     )
 
-    related_posts = {row[0] for row in result}
+    result = await session.execute(select(func.max(source_counts.c.post_count)))
 
-    cluster_size = len(related_posts)
+    cluster_size = result.scalar_one()
 
-    risk_score = min(cluster_size / 10, 1.0)
+    risk_score = min(cluster_size / FULL_RISK_CLUSTER_SIZE, 1.0)
 
-    post = await session.get(Post, post_id)
+    await session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            narrative_cluster_id=cluster_id,
+            narrative_risk_score=risk_score,
+            # Derived data, not an edit: keep onupdate from bumping updated_at
+            updated_at=Post.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
 
-    if post:
+    await session.commit()
+
+
+# -------------------------
+# All posts (batch job)
+# -------------------------
+
+async def refresh_all_narratives(session: AsyncSession) -> int:
+    """
+    Recompute narrative_cluster_id and narrative_risk_score for every post
+    citing at least one source, in one set-based UPDATE. Only posts whose
+    values changed are written.
+
+    The cluster id is computed in SQL by cluster_id_aggregate. Cluster
+    size is the largest per-source post count among the post's sources:
+    each source is counted once, so there is no pairwise join of posts
+    sharing a source. It is a lower bound on the distinct posts sharing any
+    source, which is enough for a risk score that saturates at
+    FULL_RISK_CLUSTER_SIZE.
+    """
+    # (source_id, post_id) is unique, so count() is the distinct posts per source
+    source_counts = (
+        select(
+            SourcePost.source_id,
+            func.count().label("post_count"),
+        )
+        .group_by(SourcePost.source_id)
+        .subquery()
+    )
+
+    clusters = (
+        select(
+            SourcePost.post_id,
+            cluster_id_aggregate(SourcePost.source_id).label("cluster_id"),
+            func.max(source_counts.c.post_count).label("cluster_size"),
+        )
+        .join(source_counts, source_counts.c.source_id == SourcePost.source_id)
+        .group_by(SourcePost.post_id)
+        .subquery()
+    )
+
+    risk_score = func.least(
+        cast(clusters.c.cluster_size, Float) / float(FULL_RISK_CLUSTER_SIZE),
+        1.0,
+    )
+
+    result = await session.execute(
+        update(Post)
+        .where(
+            Post.id == clusters.c.post_id,
+            or_(
+                Post.narrative_cluster_id.is_distinct_from(clusters.c.cluster_id),
+                Post.narrative_risk_score.is_distinct_from(risk_score),
+            ),
+        )
+        .values(
+            narrative_cluster_id=clusters.c.cluster_id,
+            narrative_risk_score=risk_score,
+            updated_at=Post.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
 
-        post.narrative_cluster_id = cluster_id
-        post.narrative_risk_score = risk_score
+    await session.commit()
 
-        await session.commit()
+    return result.rowcount
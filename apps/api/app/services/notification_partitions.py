@@ -0,0 +1,266 @@
+"""
+Monthly range partitions of the notifications table.
+
+Partitions are named notifications_pYYYYMM and cover [month start, next
+month start) in UTC. There is no default partition: one would rule out an
+ordered Append for the inbox. Instead the API creates
+NOTIFICATION_PARTITIONS_AHEAD months in advance at startup and daily
+while it runs, and warns once fewer than NOTIFICATION_PARTITION_ALERT_DAYS
+are covered. Notification writes never fail the write they belong to (see
+app.services.notification_service).
+
+Read notifications older than NOTIFICATION_RETENTION_DAYS expire: reads
+skip them (visible_notifications()), and a partition whose whole month is
+past retention is dropped or moved to the NOTIFICATION_ARCHIVE_SCHEMA
+schema once nothing in it is unread. Unread rows never expire. Nothing
+here DELETEs rows.
+"""
+import asyncio
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.core.models.notification import Notification
+
+
+NOTIFICATION_PARTITIONS_AHEAD = int(os.getenv("NOTIFICATION_PARTITIONS_AHEAD", "3"))
+
+# Warn when the last partition ends sooner than this
+NOTIFICATION_PARTITION_ALERT_DAYS = int(os.getenv("NOTIFICATION_PARTITION_ALERT_DAYS", "45"))
+
+# How often the API re-runs ensure_partitions while it is up
+NOTIFICATION_PARTITION_CHECK_SECONDS = int(os.getenv("NOTIFICATION_PARTITION_CHECK_SECONDS", str(24 * 3600)))
+
+# Read notifications older than this are hidden from reads; a partition
+# expires once all of it is older than this and none of it is unread
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+
+# "drop" or "archive"
+NOTIFICATION_RETENTION_MODE = os.getenv("NOTIFICATION_RETENTION_MODE", "drop")
+NOTIFICATION_ARCHIVE_SCHEMA = os.getenv("NOTIFICATION_ARCHIVE_SCHEMA", "notifications_archive")
+
+PARENT_TABLE = "notifications"
+
+_PARTITION_NAME = re.compile(r"^notifications_p(\d{4})(\d{2})$")
+
+
+# -------------------------
+# Naming and bounds
+# -------------------------
+
+def month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"notifications_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> datetime | None:
+    match = _PARTITION_NAME.match(name)
+
+    if not match:
+        return None
+
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+def retention_cutoff(now: datetime | None = None) -> datetime:
+    """Oldest created_at of a read notification still visible."""
+    now = now or datetime.now(timezone.utc)
+    return now - timedelta(days=NOTIFICATION_RETENTION_DAYS)
+
+
+def visible_notifications(now: datetime | None = None):
+    """
+    Filter for reads: unread rows, and read rows inside retention. Expired
+    partitions only survive while they hold unread rows, so the read side
+    of this stays within the window.
+    """
+    return or_(
+        Notification.read_at.is_(None),
+        Notification.created_at >= retention_cutoff(now),
+    )
+
+
+def expiry_candidates(names, now: datetime, retention_days: int) -> list[str]:
+    """Monthly partitions whose whole range is older than retention_days."""
+    cutoff = now.timestamp() - retention_days * 86400
+    expired = []
+
+    for name in names:
+        month = partition_month(name)
+
+        if month is not None and add_months(month, 1).timestamp() <= cutoff:
+            expired.append(name)
+
+    return sorted(expired)
+
+
+def partition_horizon(names) -> datetime | None:
+    """End of the last monthly partition: inserts from then on have nowhere to go."""
+    months = [month for month in map(partition_month, names) if month is not None]
+
+    if not months:
+        return None
+
+    return add_months(max(months), 1)
+
+
+# -------------------------
+# Maintenance
+# -------------------------
+
+async def list_partitions(session: AsyncSession) -> list[str]:
+    result = await session.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:parent AS regclass)
+            """
+        ),
+        {"parent": PARENT_TABLE},
+    )
+
+    return [row[0] for row in result.all()]
+
+
+async def ensure_partitions(
+    session: AsyncSession,
+    *,
+    now: datetime | None = None,
+    months_ahead: int = NOTIFICATION_PARTITIONS_AHEAD,
+) -> list[str]:
+    """
+    Create the current month's partition and months_ahead more. Commits;
+    returns the partitions created.
+    """
+    now = now or datetime.now(timezone.utc)
+    existing = set(await list_partitions(session))
+    created = []
+
+    for offset in range(months_ahead + 1):
+        month = add_months(month_start(now), offset)
+        name = partition_name(month)
+
+        if name in existing:
+            continue
+
+        # IF NOT EXISTS: every API replica runs this at startup
+        await session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        await session.commit()
+        created.append(name)
+
+    return created
+
+
+async def check_partition_horizon(
+    session: AsyncSession,
+    *,
+    now: datetime | None = None,
+    alert_days: int = NOTIFICATION_PARTITION_ALERT_DAYS,
+) -> datetime | None:
+    """Return the partition horizon, warning when it is within alert_days."""
+    now = now or datetime.now(timezone.utc)
+    horizon = partition_horizon(await list_partitions(session))
+
+    if horizon is None or horizon - now < timedelta(days=alert_days):
+        print(
+            f"[notification_partitions] WARNING: notification partitions end at {horizon}; "
+            "inserts after that fail until ensure_partitions runs"
+        )
+
+    return horizon
+
+
+async def ensure_partitions_ahead():
+    """
+    One ensure_partitions pass plus the horizon check on a session of its
+    own. Failures are reported, not raised: the API starts anyway, and the
+    horizon warning keeps firing until a pass succeeds.
+    """
+    try:
+        async with async_session() as session:
+            created = await ensure_partitions(session)
+            await check_partition_horizon(session)
+    except SQLAlchemyError as exc:
+        print(f"[notification_partitions] WARNING: partition maintenance failed: {exc}")
+        return
+
+    if created:
+        print(f"[notification_partitions] created {created}")
+
+
+async def keep_partitions_ahead():
+    """Background task for the API process: ensure_partitions_ahead daily."""
+    while True:
+        await asyncio.sleep(NOTIFICATION_PARTITION_CHECK_SECONDS)
+        await ensure_partitions_ahead()
+
+
+async def _has_unread(session: AsyncSession, name: str) -> bool:
+    result = await session.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {name} WHERE read_at IS NULL)")
+    )
+    return result.scalar_one()
+
+
+async def expire_partitions(
+    session: AsyncSession,
+    *,
+    now: datetime | None = None,
+    retention_days: int = NOTIFICATION_RETENTION_DAYS,
+    mode: str = NOTIFICATION_RETENTION_MODE,
+) -> tuple[list[str], list[str]]:
+    """
+    Drop or archive partitions past retention. Only read notifications
+    expire, so a partition still holding unread rows is kept (its read rows
+    are already hidden from reads) and retried on the next run.
+
+    Commits after each partition. Returns (expired partition names,
+    partitions past retention kept for their unread rows).
+    """
+    if mode not in ("drop", "archive"):
+        raise ValueError(f"Unknown retention mode: {mode}")
+
+    now = now or datetime.now(timezone.utc)
+    partitions = await list_partitions(session)
+
+    expired = []
+    kept = []
+
+    for name in expiry_candidates(partitions, now, retention_days):
+        if await _has_unread(session, name):
+            kept.append(name)
+            continue
+
+        if mode == "archive":
+            await session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {NOTIFICATION_ARCHIVE_SCHEMA}"))
+            await session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            await session.execute(text(f"ALTER TABLE {name} SET SCHEMA {NOTIFICATION_ARCHIVE_SCHEMA}"))
+        else:
+            await session.execute(text(f"DROP TABLE {name}"))
+
+        await session.commit()
+
+        expired.append(name)
+
+    return expired, kept
@@ -1,10 +1,24 @@
-from uuid import UUID
+import os
+from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from datetime import datetime, timezone
+from sqlalchemy import select, update, insert, or_, and_, case, cast, literal, literal_column, JSON, Text
+from sqlalchemy.dialects.postgresql import insert as pg_insert, JSONB
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from sqlalchemy import func
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.cache import redis as redis_cache
 from app.core.models.notification import Notification
 from fastapi import HTTPException
+from app.core.utils.cursor import encode_created_at_cursor, decode_created_at_cursor
+from app.services.unread_counter import (
+    get_cached_unread_count,
+    increment_unread_counts,
+    decrement_unread_count,
+)
+from app.services.notification_stream import publish_notification, publish_notifications
+from app.services.notification_partitions import visible_notifications
 
 
 # -------------------------
@@ -17,24 +31,260 @@ async def create_notification(
     type: str,
     payload: dict,
     commit: bool = True,
-) -> Notification:
+) -> Notification | None:
+    """
+    With commit=False the caller commits and then calls
+    increment_unread_counts([user_id]) and publish_notification.
+
+    The row is written under a savepoint; if that fails the notification
+    is dropped and None returned, without touching the caller's
+    transaction.
+    """
     notification = Notification(
         user_id=user_id,
         type=type,
         payload=payload,
     )
-    db.add(notification)
+
+    try:
+        async with db.begin_nested():
+            db.add(notification)
+    except SQLAlchemyError as exc:
+        print(f"[notification_service] dropped {type} notification: {exc}")
+        return None
 
     if commit:
         await db.commit()
         await db.refresh(notification)
+        await increment_unread_counts([user_id])
+        await publish_notification(notification)
 
     return notification
 
 
-    
+# -------------------------
+# Coalesced notifications
+# -------------------------
+
+# Events of one type on one target within this window fold into one row
+NOTIFICATION_COALESCE_WINDOW_SECONDS = int(os.getenv("NOTIFICATION_COALESCE_WINDOW_SECONDS", "3600"))
+
+# Most recent distinct actors kept in payload["actor_ids"]
+NOTIFICATION_ACTOR_SAMPLE_SIZE = int(os.getenv("NOTIFICATION_ACTOR_SAMPLE_SIZE", "3"))
+
+
+def _group_key(type: str, target_id) -> str:
+    return f"{type}:{target_id}"
+
+
+def _group_window_key(user_id, group_key: str) -> str:
+    return f"notifications:group:{user_id}:{group_key}"
+
+
+async def _close_group_windows(user_id: UUID, group_keys):
+    """
+    Forget the windows of groups whose row was just read, so the next event
+    opens a fresh row at now() instead of one stamped with the old window
+    start (which would sort below newer items and behind SSE resume cursors).
+    """
+    keys = {_group_window_key(user_id, group_key) for group_key in group_keys if group_key}
+
+    if not keys:
+        return
+
+    try:
+        await redis_cache.redis_client.delete(*keys)
+    except RedisError:
+        # The window still expires after NOTIFICATION_COALESCE_WINDOW_SECONDS
+        pass
+
+
+async def _group_window_start(user_id: UUID, group_key: str) -> datetime:
+    """
+    created_at of the group's current window, shared by concurrent writers.
+
+    The first event opens the window (SET NX in Redis) and later events in
+    it reuse that timestamp, which makes it part of the upsert target.
+    Without Redis, fixed clock buckets keep writers agreeing.
+    """
+    now = datetime.now(timezone.utc)
+    key = _group_window_key(user_id, group_key)
+
+    try:
+        pipe = redis_cache.redis_client.pipeline()
+        pipe.set(key, now.isoformat(), nx=True, ex=NOTIFICATION_COALESCE_WINDOW_SECONDS)
+        pipe.get(key)
+        _, opened_at = await pipe.execute()
+
+        if opened_at:
+            return datetime.fromisoformat(opened_at)
+    except RedisError:
+        pass
+
+    bucket = int(now.timestamp()) // NOTIFICATION_COALESCE_WINDOW_SECONDS
+    return datetime.fromtimestamp(bucket * NOTIFICATION_COALESCE_WINDOW_SECONDS, timezone.utc)
+
+
+async def create_grouped_notification(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    type: str,
+    target_id: UUID,
+    actor_id: UUID,
+    payload: dict,
+) -> dict | None:
+    """
+    Record one event in the recipient's open notification for
+    (type, target), starting a new one if there is none. Commits.
+    Runs after the event's own commit, so a failed write is logged and
+    None returned rather than failing the request.
+
+    One INSERT .. ON CONFLICT DO UPDATE against ux_notifications_open_group:
+    actor_count grows (actors already in the sample are not recounted) and
+    payload takes the newest event's fields plus the merged actor sample.
+    Once read, a group's row is no longer a conflict target, so the next
+    event starts a fresh unread row.
+    """
+    group_key = _group_key(type, target_id)
+    created_at = await _group_window_start(user_id, group_key)
+    actor = cast(literal(str(actor_id)), Text)
+
+    stmt = pg_insert(Notification).values(
+        id=uuid4(),
+        user_id=user_id,
+        type=type,
+        group_key=group_key,
+        payload={**payload, "actor_ids": [str(actor_id)]},
+        actor_count=1,
+        created_at=created_at,
+    )
+
+    current_actors = func.coalesce(
+        cast(Notification.payload, JSONB)["actor_ids"],
+        cast(literal("[]"), JSONB),
+    )
+
+    # Newest first, de-duplicated, capped at the sample size
+    actors = func.jsonb_path_query_array(
+        func.jsonb_build_array(actor, type_=JSONB).op("||")(current_actors.op("-")(actor)),
+        literal_column(f"'$[0 to {NOTIFICATION_ACTOR_SAMPLE_SIZE - 1}]'"),
+    )
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Notification.user_id, Notification.group_key, Notification.created_at],
+        index_where=and_(Notification.read_at.is_(None), Notification.group_key.is_not(None)),
+        set_={
+            "actor_count": Notification.actor_count + case(
+                (current_actors.has_key(actor), 0),
+                else_=1,
+            ),
+            "payload": cast(
+                func.jsonb_set(
+                    cast(stmt.excluded.payload, JSONB),
+                    literal_column("ARRAY['actor_ids']"),
+                    actors,
+                ),
+                JSON,
+            ),
+        },
+    ).returning(
+        Notification.id,
+        Notification.user_id,
+        Notification.type,
+        Notification.payload,
+        Notification.actor_count,
+        Notification.created_at,
+        # xmax is 0 only for a freshly inserted row
+        literal_column("xmax = 0").label("inserted"),
+    )
+
+    try:
+        result = await db.execute(stmt)
+        row = dict(result.one()._mapping)
+
+        await db.commit()
+    except SQLAlchemyError as exc:
+        await db.rollback()
+        print(f"[notification_service] dropped {type} notification: {exc}")
+        return None
+
+    if row["inserted"]:
+        await increment_unread_counts([user_id])
+
+    await publish_notifications([row])
+
+    return row
+
+
+# -------------------------
+# Batched writes
+# -------------------------
+
+# Rows per multi-row INSERT; keeps bind parameters well under the driver limit
+NOTIFICATION_INSERT_BATCH_SIZE = int(os.getenv("NOTIFICATION_INSERT_BATCH_SIZE", "500"))
+
+
+class NotificationBatch:
+    """
+    Collects the notifications produced by one unit of work and writes them
+    with multi-row INSERTs on flush().
+
+    created_at is stamped at add() time and kept strictly increasing, so
+    rows written in one statement still page in the order they were added
+    (the inbox orders by created_at, id).
+    """
+
+    def __init__(self):
+        self._rows: list[dict] = []
+        self._last_created_at: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, *, user_id: UUID, type: str, payload: dict):
+        created_at = datetime.now(timezone.utc)
+
+        if self._last_created_at and created_at <= self._last_created_at:
+            created_at = self._last_created_at + timedelta(microseconds=1)
+
+        self._last_created_at = created_at
+
+        self._rows.append({
+            "id": uuid4(),
+            "user_id": user_id,
+            "type": type,
+            "payload": payload,
+            "created_at": created_at,
+        })
+
+    async def flush(self, db: AsyncSession) -> list[dict]:
+        """
+        Write everything collected so far and return the written rows.
+
+        Runs inside the caller's transaction, under a savepoint: if the
+        INSERTs fail (e.g. no partition for created_at) the notifications
+        are dropped and [] returned, and the caller's write still commits.
+        The caller commits and then calls increment_unread_counts on the
+        rows' user_ids and publish_notifications on the rows.
+        """
+        rows, self._rows = self._rows, []
+
+        if not rows:
+            return rows
+
+        try:
+            async with db.begin_nested():
+                for start in range(0, len(rows), NOTIFICATION_INSERT_BATCH_SIZE):
+                    await db.execute(
+                        insert(Notification).values(rows[start:start + NOTIFICATION_INSERT_BATCH_SIZE])
+                    )
+        except SQLAlchemyError as exc:
+            print(f"[notification_service] dropped {len(rows)} notifications: {exc}")
+            return []
+
+        return rows
 
-    
 
 
 # -------------------------
@@ -45,18 +295,42 @@ async def get_user_notifications(
     user_id: UUID,
     *,
     limit: int = 20,
-    offset: int = 0,
+    cursor: Optional[str] = None,
 ):
     stmt = (
         select(Notification)
-        .where(Notification.user_id == user_id)
-        .order_by(Notification.created_at.desc())
+        .where(
+            Notification.user_id == user_id,
+            # Expired read notifications (see notification_partitions)
+            visible_notifications(),
+        )
+        .order_by(Notification.created_at.desc(), Notification.id.desc())
         .limit(limit)
-        .offset(offset)
     )
 
+    if cursor:
+        cursor_created_at, cursor_id = decode_created_at_cursor(cursor)
+
+        stmt = stmt.where(
+            or_(
+                Notification.created_at < cursor_created_at,
+                and_(
+                    Notification.created_at == cursor_created_at,
+                    Notification.id < cursor_id,
+                ),
+            )
+        )
+
     result = await db.execute(stmt)
-    return result.scalars().all()
+    notifications = result.scalars().all()
+
+    next_cursor = None
+
+    if notifications:
+        last = notifications[-1]
+        next_cursor = encode_created_at_cursor(last.created_at, last.id)
+
+    return notifications, next_cursor
 
 
 # -------------------------
@@ -66,12 +340,8 @@ async def get_unread_count(
     db: AsyncSession,
     user_id: UUID,
 ) -> int:
-    stmt = select(func.count()).select_from(Notification).where(
-        Notification.user_id == user_id,
-        Notification.read_at.is_(None),
-    )
-    result = await db.execute(stmt)
-    return result.scalar_one()
+    # Served from the Redis counter; db is only used to rebuild it
+    return await get_cached_unread_count(db, user_id)
 
 
 # -------------------------
@@ -91,14 +361,44 @@ async def mark_notification_read(
             Notification.read_at.is_(None),
         )
         .values(read_at=datetime.now(timezone.utc))
-        .returning(Notification.id)
+        .returning(Notification.id, Notification.group_key)
     )
 
     result = await db.execute(stmt)
-    updated = result.scalar_one_or_none()
+    updated = result.one_or_none()
 
     if not updated:
         raise HTTPException(status_code=404, detail="Notification not found")
 
     await db.commit()
 
+    await decrement_unread_count(user_id)
+    await _close_group_windows(user_id, [updated.group_key])
+
+
+async def mark_all_notifications_read(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+) -> int:
+    stmt = (
+        update(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None),
+        )
+        .values(read_at=datetime.now(timezone.utc))
+        .returning(Notification.group_key)
+    )
+
+    result = await db.execute(stmt)
+    group_keys = result.scalars().all()
+    await db.commit()
+
+    # Decrement rather than reset: notifications committed after the
+    # UPDATE's snapshot are still unread
+    await decrement_unread_count(user_id, len(group_keys))
+    await _close_group_windows(user_id, group_keys)
+
+    return len(group_keys)
+
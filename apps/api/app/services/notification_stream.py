@@ -0,0 +1,391 @@
+"""
+Real-time notification delivery over Server-Sent Events.
+
+Writers publish each committed notification to the recipient's Redis
+channel, so any API replica can deliver it. Each process holds ONE pub/sub
+connection (NotificationHub) and subscribes to a user's channel only while
+that user has a local stream open; events are fanned out to per-stream
+bounded queues.
+
+Event ids are the inbox keyset cursor (created_at, id). A reconnecting
+client sends it back as Last-Event-ID and the gap is replayed from
+Postgres once; a stream that falls behind is closed rather than buffered,
+and the same resume path recovers what it dropped.
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import select, func, or_, and_
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.cache import redis as redis_cache
+from app.core.database import async_session
+from app.core.models.notification import Notification
+from app.core.models.user import User
+from app.core.utils.cursor import encode_created_at_cursor, decode_created_at_cursor
+from app.services.notification_partitions import visible_notifications
+
+
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))
+
+# Events replayed per reconnect; the client resumes again from the last one
+SSE_RESUME_MAX_EVENTS = int(os.getenv("SSE_RESUME_MAX_EVENTS", "200"))
+
+# Bounds Postgres load when every client reconnects at once (e.g. deploys)
+SSE_RESUME_CONCURRENCY = int(os.getenv("SSE_RESUME_CONCURRENCY", "20"))
+
+CHANNEL_PREFIX = "notifications:events"
+
+
+def _channel(user_id) -> str:
+    return f"{CHANNEL_PREFIX}:{user_id}"
+
+
+def _event(notification_id, type: str, payload: dict, created_at: datetime, actor_count: int = 1) -> dict:
+    return {
+        "id": str(notification_id),
+        "type": type,
+        "payload": payload,
+        "actor_count": actor_count,
+        "created_at": created_at.isoformat(),
+    }
+
+
+# -------------------------
+# Publishing (after commit)
+# -------------------------
+
+async def publish_notifications(rows: Iterable[dict]):
+    """
+    Publish committed notifications. rows carry id, user_id, type, payload
+    and created_at (NotificationBatch.flush output or a Notification's
+    columns). Best effort: a missed event is replayed on reconnect.
+    """
+    rows = list(rows)
+
+    if not rows:
+        return
+
+    try:
+        pipe = redis_cache.redis_client.pipeline(transaction=False)
+        for row in rows:
+            event = _event(
+                row["id"],
+                row["type"],
+                row["payload"],
+                row["created_at"],
+                row.get("actor_count", 1),
+            )
+            pipe.publish(_channel(row["user_id"]), json.dumps(event))
+        await pipe.execute()
+    except RedisError:
+        pass
+
+
+async def publish_notification(notification: Notification):
+    await publish_notifications([{
+        "id": notification.id,
+        "user_id": notification.user_id,
+        "type": notification.type,
+        "payload": notification.payload,
+        "actor_count": notification.actor_count,
+        "created_at": notification.created_at,
+    }])
+
+
+# -------------------------
+# Per-process hub
+# -------------------------
+
+class NotificationListener:
+    def __init__(self, user_id: UUID):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        # Set on overflow or hub failure; the stream ends and the client resumes
+        self.closed = False
+
+    def deliver(self, event: dict):
+        if self.closed:
+            return
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: drop it rather than buffer without bound
+            self.queue.get_nowait()
+            self.close()
+
+    def close(self):
+        self.closed = True
+
+        try:
+            # Wake the stream so it notices
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class NotificationHub:
+    """One Redis pub/sub connection shared by every stream in the process."""
+
+    def __init__(self):
+        self._listeners: dict[str, set[NotificationListener]] = {}
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, user_id: UUID) -> NotificationListener:
+        listener = NotificationListener(user_id)
+        channel = _channel(user_id)
+
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = redis_cache.redis_client.pubsub()
+
+            if channel not in self._listeners:
+                # Registered only once Redis has the subscription; on
+                # RedisError the caller sees the error and nothing is left
+                # behind
+                await self._pubsub.subscribe(channel)
+                self._listeners[channel] = set()
+
+            self._listeners[channel].add(listener)
+
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+
+        return listener
+
+    async def unsubscribe(self, listener: NotificationListener):
+        channel = _channel(listener.user_id)
+
+        async with self._lock:
+            listeners = self._listeners.get(channel)
+
+            if not listeners:
+                return
+
+            listeners.discard(listener)
+
+            if not listeners:
+                del self._listeners[channel]
+                try:
+                    await self._pubsub.unsubscribe(channel)
+                except RedisError:
+                    pass
+
+    async def _read(self):
+        while self._listeners:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0,
+                )
+            except RedisError:
+                print("[notification_stream] pub/sub read failed, closing local streams")
+                await self._reset()
+                return
+
+            if message is None or message["type"] != "message":
+                continue
+
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+
+            for listener in list(self._listeners.get(message["channel"], ())):
+                listener.deliver(event)
+
+    async def _reset(self):
+        # Streams close and their clients resume from Last-Event-ID on a
+        # fresh connection
+        async with self._lock:
+            for listeners in self._listeners.values():
+                for listener in listeners:
+                    listener.close()
+
+            self._listeners.clear()
+
+            if self._pubsub is not None:
+                try:
+                    await self._pubsub.aclose()
+                except RedisError:
+                    pass
+                self._pubsub = None
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._listeners),
+            "streams": sum(len(listeners) for listeners in self._listeners.values()),
+        }
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, RedisError):
+                pass
+            self._reader = None
+
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except RedisError:
+                pass
+            self._pubsub = None
+
+        self._listeners.clear()
+
+
+hub = NotificationHub()
+
+_resume_semaphore = asyncio.Semaphore(SSE_RESUME_CONCURRENCY)
+
+
+async def close_notification_hub():
+    await hub.close()
+
+
+def get_notification_stream_stats() -> dict:
+    return hub.stats()
+
+
+# -------------------------
+# SSE stream
+# -------------------------
+
+def _format_sse(event: dict) -> str:
+    cursor = encode_created_at_cursor(datetime.fromisoformat(event["created_at"]), event["id"])
+
+    return f"id: {cursor}\nevent: notification\ndata: {json.dumps(event)}\n\n"
+
+
+def _version(event: dict) -> tuple:
+    # Coalesced notifications are re-published under the same id as they grow
+    return event["id"], event.get("actor_count", 1)
+
+
+async def _load_missed(user_id: UUID, last_event_id: str) -> list[dict]:
+    cursor_created_at, cursor_id = decode_created_at_cursor(last_event_id)
+
+    # Own short-lived session: the stream must not pin a connection
+    async with _resume_semaphore, async_session() as session:
+        result = await session.execute(
+            select(Notification)
+            .where(
+                Notification.user_id == user_id,
+                visible_notifications(),
+                or_(
+                    Notification.created_at > cursor_created_at,
+                    and_(
+                        Notification.created_at == cursor_created_at,
+                        Notification.id > cursor_id,
+                    ),
+                ),
+            )
+            .order_by(Notification.created_at, Notification.id)
+            .limit(SSE_RESUME_MAX_EVENTS)
+        )
+
+        return [
+            _event(n.id, n.type, n.payload, n.created_at, n.actor_count)
+            for n in result.scalars().all()
+        ]
+
+
+async def _session_active(user_id: UUID, session_id: str, expires_at: Optional[float]) -> bool:
+    if expires_at is not None and time.time() >= expires_at:
+        return False
+
+    try:
+        if await redis_cache.redis_client.get(f"revoked:{session_id}"):
+            return False
+    except RedisError:
+        # Can't confirm the session; the client re-authenticates on reconnect
+        return False
+
+    # Lockout lives on the user row: one primary-key read on a short-lived
+    # session, so the stream still pins no connection between checks
+    try:
+        async with async_session() as session:
+            result = await session.execute(
+                select(User.id).where(
+                    User.id == user_id,
+                    or_(User.locked_until.is_(None), User.locked_until <= func.now()),
+                )
+            )
+            return result.scalar_one_or_none() is not None
+    except SQLAlchemyError:
+        return False
+
+
+async def stream_notifications(
+    user_id: UUID,
+    last_event_id: Optional[str] = None,
+    *,
+    session_id: Optional[str] = None,
+    expires_at: Optional[float] = None,
+):
+    """
+    Async generator of SSE frames for one client.
+
+    Subscribes before replaying the gap from Postgres, so nothing published
+    in between is lost; live events already replayed in the same version
+    are skipped. The caller validates last_event_id (decode_created_at_cursor).
+
+    With session_id, the token's session is re-checked (revocation, the
+    expires_at timestamp and account lockout) every SSE_HEARTBEAT_SECONDS
+    and the stream ends once it is no longer valid.
+    """
+    listener = await hub.subscribe(user_id)
+    next_session_check = time.monotonic() + SSE_HEARTBEAT_SECONDS
+
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+
+        replayed = set()
+
+        if last_event_id:
+            missed = await _load_missed(user_id, last_event_id)
+
+            for event in missed:
+                yield _format_sse(event)
+                replayed.add(_version(event))
+
+            if len(missed) >= SSE_RESUME_MAX_EVENTS:
+                # More to replay; the client reconnects from the last id sent
+                return
+
+        while True:
+            # Timed rather than per heartbeat: a busy stream may never idle
+            if session_id and time.monotonic() >= next_session_check:
+                if not await _session_active(user_id, session_id, expires_at):
+                    return
+                next_session_check = time.monotonic() + SSE_HEARTBEAT_SECONDS
+
+            try:
+                event = await asyncio.wait_for(listener.queue.get(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment frame: keeps proxies from idling the connection out
+                yield ": keepalive\n\n"
+                continue
+
+            if event is None or listener.closed:
+                return
+
+            if _version(event) in replayed:
+                continue
+
+            yield _format_sse(event)
+    finally:
+        await hub.unsubscribe(listener)
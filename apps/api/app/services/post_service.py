@@ -7,7 +7,14 @@ from app.core.models.post_likes import PostLike
 from app.core.models.reply import Reply
 from app.core.enums import FeedMode, ContentStatus
 
-from sqlalchemy import select, func, extract, or_, and_
+from app.core.utils.cursor import (
+    encode_cursor,
+    decode_cursor,
+    encode_created_at_cursor,
+    decode_created_at_cursor,
+)
+
+from sqlalchemy import select, func, or_, and_
 from typing import Optional
 from datetime import datetime
 
@@ -28,27 +35,6 @@ async def get_feed(
         .where(Post.status == ContentStatus.active)
     )
 
-    # -------------------------
-    # Trending calculation
-    # -------------------------
-
-    engagement_score = func.log(
-        (Post.like_count * 2)
-        + (Post.reply_count * 3)
-        + 1
-    )
-
-    hours_since_posted = (
-        extract("epoch", func.now() - Post.created_at) / 3600
-    )
-
-    trending_score = (
-        engagement_score /
-        func.pow(hours_since_posted + 2, 1.1)
-    ).label("trending_score")
-
-    stmt = stmt.add_columns(trending_score)
-
     # -------------------------
     # liked_by_current_user
     # -------------------------
@@ -66,7 +52,7 @@ async def get_feed(
         stmt = stmt.add_columns(liked_exists)
 
     # -------------------------
-    # Cursor filtering (LATEST ONLY)
+    # Cursor filtering (keyset)
     # -------------------------
 
     if mode == FeedMode.latest:
@@ -76,10 +62,7 @@ async def get_feed(
         )
 
         if cursor:
-            cursor_created_at_str, cursor_id = cursor.split("|")
-            cursor_created_at = datetime.fromisoformat(
-                cursor_created_at_str
-            )
+            cursor_created_at, cursor_id = decode_created_at_cursor(cursor)
 
             stmt = stmt.where(
                 or_(
@@ -92,9 +75,27 @@ async def get_feed(
             )
 
     elif mode == FeedMode.trending:
-        stmt = stmt.order_by(trending_score.desc())
+        # Stored score, refreshed by app.jobs.trending_refresh and
+        # like/reply writes — served from idx_posts_status_trending.
+        stmt = stmt.order_by(
+            Post.trending_score.desc(),
+            Post.id.desc(),
+        )
 
-        # Optional: you can later build cursor pagination for trending too
+        if cursor:
+            cursor_score_str, cursor_id = decode_cursor(cursor)
+            cursor_score = float(cursor_score_str)
+            cursor_id = UUID(cursor_id)
+
+            stmt = stmt.where(
+                or_(
+                    Post.trending_score < cursor_score,
+                    and_(
+                        Post.trending_score == cursor_score,
+                        Post.id < cursor_id,
+                    ),
+                )
+            )
 
     stmt = stmt.limit(limit)
 
@@ -105,14 +106,13 @@ async def get_feed(
 
     for row in rows:
         if current_user_id:
-            post, user, trending_score_val, liked_val = row
+            post, user, liked_val = row
             post.liked_by_current_user = liked_val or False
         else:
-            post, user, trending_score_val = row
+            post, user = row
             post.liked_by_current_user = False
 
         post.author = user
-        post.trending_score = trending_score_val or 0
 
         posts.append(post)
 
@@ -122,11 +122,19 @@ async def get_feed(
 
     next_cursor = None
 
-    if posts and mode == FeedMode.latest:
+    if posts:
         last_post = posts[-1]
-        next_cursor = (
-            f"{last_post.created_at.isoformat()}|{last_post.id}"
-        )
+
+        if mode == FeedMode.latest:
+            next_cursor = encode_created_at_cursor(
+                last_post.created_at,
+                last_post.id,
+            )
+        elif mode == FeedMode.trending:
+            next_cursor = encode_cursor(
+                last_post.trending_score,
+                last_post.id,
+            )
 
     return posts, next_cursor
 
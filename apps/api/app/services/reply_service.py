@@ -1,16 +1,22 @@
+import os
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
 from app.core.models.post import Post
 from app.core.models.reply import Reply
 from app.core.enums import ContentStatus
-from app.services.notification_service import create_notification
+from app.services.notification_service import NotificationBatch
+from app.services.unread_counter import increment_unread_counts
+from app.services.notification_stream import publish_notifications
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.core.constants.notification import NotificationType
 from app.services.mention_service import extract_mentioned_user_ids
-from sqlalchemy import func, update
-from app.core.models.reply_like import ReplyLike
+from sqlalchemy import func, update, literal_column, true, or_, and_
+from app.services.trending_service import refresh_post_trending_score
+from app.services.feed_cache import invalidate_post
+from app.api.deps.reply_tree import build_reply_tree
+from app.core.utils.cursor import encode_created_at_cursor, decode_created_at_cursor
 
 
 async def create_reply(
@@ -62,19 +68,20 @@ async def create_reply(
         .where(Post.id == post_id)
         .values(reply_count=Post.reply_count + 1)
     )
+    await refresh_post_trending_score(db, post_id)
 
-    await db.commit()
-    await db.refresh(reply)
+    # reply.id is needed for notification payloads
+    await db.flush()
 
     # -----------------------------
-    # 🔔 Notifications
+    # 🔔 Notifications (one INSERT, same commit as the reply)
     # -----------------------------
+    notifications = NotificationBatch()
 
     # Reply → Post author
     if parent_reply_id is None:
         if post.author_id != author_id:
-            await create_notification(
-                db,
+            notifications.add(
                 user_id=post.author_id,
                 type=NotificationType.POST_REPLY,
                 payload={
@@ -86,8 +93,7 @@ async def create_reply(
 
     # Reply → Reply author
     if parent_reply and parent_reply.author_id != author_id:
-        await create_notification(
-            db,
+        notifications.add(
             user_id=parent_reply.author_id,
             type=NotificationType.REPLY_REPLY,
             payload={
@@ -105,8 +111,7 @@ async def create_reply(
         if mentioned_user_id == author_id:
             continue
 
-        await create_notification(
-            db,
+        notifications.add(
             user_id=mentioned_user_id,
             type=NotificationType.MENTION,
             payload={
@@ -116,98 +121,181 @@ async def create_reply(
             },
         )
 
+    written = await notifications.flush(db)
+
+    await db.commit()
+    await db.refresh(reply)
+
+    await invalidate_post(post_id)
+    await increment_unread_counts(row["user_id"] for row in written)
+    await publish_notifications(written)
+
     return reply
 
+REPLY_TREE_MAX_DEPTH = int(os.getenv("REPLY_TREE_MAX_DEPTH", "10"))
+REPLY_TREE_MAX_FANOUT = int(os.getenv("REPLY_TREE_MAX_FANOUT", "20"))
+
+
 async def get_replies_for_post(
     db: AsyncSession,
     post_id: UUID,
     *,
     status: Optional[ContentStatus] = ContentStatus.active,
     limit: int = 20,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     load_children: bool = False,
-) -> List[Reply]:
-    stmt = (
-        select(
-            Reply,
-            func.count(ReplyLike.id).label("like_count")
+) -> Tuple[List[Reply], Optional[str]]:
+    if load_children:
+        return await get_reply_tree(
+            db,
+            post_id,
+            status=status,
+            limit=limit,
+            cursor=cursor,
         )
-        .outerjoin(ReplyLike, ReplyLike.reply_id == Reply.id)
+
+    # like_count is the denormalized counter kept by like_reply/unlike_reply
+    stmt = (
+        select(Reply)
         .where(
             Reply.post_id == post_id,
             Reply.parent_reply_id == None
         )
-        .group_by(Reply.id)
-        .order_by(Reply.created_at)
+        .order_by(Reply.created_at, Reply.id)
         .limit(limit)
-        .offset(offset)
     )
 
     if status:
         stmt = stmt.where(Reply.status == status)
 
+    if cursor:
+        stmt = stmt.where(_after_cursor(cursor))
+
     result = await db.execute(stmt)
-    rows = result.all()
+    replies = result.scalars().all()
 
-    replies = []
-    for reply, like_count in rows:
-        reply.like_count = like_count
-        replies.append(reply)
+    for reply in replies:
+        reply.children = None
+
+    return replies, _next_cursor(replies)
+
+
+def _after_cursor(cursor: str):
+    """Keyset predicate for replies ordered by (created_at, id) ascending."""
+    cursor_created_at, cursor_id = decode_created_at_cursor(cursor)
+
+    return or_(
+        Reply.created_at > cursor_created_at,
+        and_(
+            Reply.created_at == cursor_created_at,
+            Reply.id > cursor_id,
+        ),
+    )
 
-    if load_children:
-        for reply in replies:
-            reply.children = await _load_children(db, reply.id, status)
-    else:
-        for reply in replies:
-            reply.children = None
 
-    return replies
+def _next_cursor(replies: List[Reply]) -> Optional[str]:
+    if not replies:
+        return None
 
-async def _load_children(
+    last_reply = replies[-1]
+
+    return encode_created_at_cursor(last_reply.created_at, last_reply.id)
+
+
+async def get_reply_tree(
     db: AsyncSession,
-    parent_id: UUID,
+    post_id: UUID,
+    *,
     status: Optional[ContentStatus] = ContentStatus.active,
     limit: int = 20,
-    offset: int = 0,
-) -> List[Reply]:
+    cursor: Optional[str] = None,
+    max_depth: int = REPLY_TREE_MAX_DEPTH,
+    max_fanout: int = REPLY_TREE_MAX_FANOUT,
+) -> Tuple[List[Reply], Optional[str]]:
+    """
+    Load a window of top-level replies plus their descendants in one
+    WITH RECURSIVE query, capped at max_depth levels and max_fanout
+    children per reply, then assemble the tree in memory.
+    """
 
-    stmt = (
-        select(
-            Reply,
-            func.count(ReplyLike.id).label("like_count")
+    # Anchor: the requested window of top-level replies
+    top_level = (
+        select(Reply.id)
+        .where(
+            Reply.post_id == post_id,
+            Reply.parent_reply_id.is_(None),
         )
-        .outerjoin(ReplyLike, ReplyLike.reply_id == Reply.id)
-        .where(Reply.parent_reply_id == parent_id)
-        .group_by(Reply.id)
-        .order_by(Reply.created_at)
+        .order_by(Reply.created_at, Reply.id)
         .limit(limit)
-        .offset(offset)
     )
 
     if status:
-        stmt = stmt.where(Reply.status == status)
+        top_level = top_level.where(Reply.status == status)
+
+    if cursor:
+        top_level = top_level.where(_after_cursor(cursor))
+
+    top_level = top_level.subquery("top_level")
+
+    tree = (
+        select(
+            top_level.c.id,
+            literal_column("1").label("depth"),
+        )
+        .cte("reply_tree", recursive=True)
+    )
+
+    # Recursive step: first max_fanout children of each node
+    children = (
+        select(Reply.id)
+        .where(
+            Reply.post_id == post_id,
+            Reply.parent_reply_id == tree.c.id,
+        )
+        .order_by(Reply.created_at, Reply.id)
+        .limit(max_fanout)
+    )
+
+    if status:
+        children = children.where(Reply.status == status)
+
+    children = children.lateral("children")
+
+    tree = tree.union_all(
+        select(
+            children.c.id,
+            (tree.c.depth + 1).label("depth"),
+        )
+        .select_from(tree.join(children, true()))
+        .where(tree.c.depth < max_depth)
+    )
+
+    stmt = (
+        select(Reply, tree.c.depth)
+        .join(tree, tree.c.id == Reply.id)
+        .order_by(tree.c.depth, Reply.created_at, Reply.id)
+    )
 
     result = await db.execute(stmt)
-    rows = result.all()
 
-    children = []
-    for child, like_count in rows:
-        child.like_count = like_count
-        children.append(child)
+    replies = []
+    for reply, depth in result.all():
+        reply.depth = depth
+        replies.append(reply)
 
-    for child in children:
-        child.children = await _load_children(db, child.id, status, limit, offset)
+    roots = await build_reply_tree(replies, max_depth=max_depth)
+
+    return roots, _next_cursor(roots)
 
-    return children
 
 async def get_reply_children(
     db: AsyncSession,
     parent_reply_id: UUID,
     *,
     limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     status: ContentStatus = ContentStatus.active,
-) -> List[Reply]:
+) -> Tuple[List[Reply], Optional[str]]:
     """
     Fetch direct children of a given reply with pagination.
     """
@@ -216,7 +304,7 @@ async def get_reply_children(
         db,
         post_id=None,  # post_id not needed, filtering by parent_reply_id
         limit=limit,
-        offset=offset,
+        cursor=cursor,
         status=status,
         load_children=False,  # only fetch one level
     )
@@ -226,33 +314,27 @@ async def get_children_for_reply(
     parent_reply_id: UUID,
     *,
     limit: int = 20,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     status: Optional[ContentStatus] = ContentStatus.active,
-) -> List[Reply]:
+) -> Tuple[List[Reply], Optional[str]]:
 
     stmt = (
-        select(
-            Reply,
-            func.count(ReplyLike.id).label("like_count")
-        )
-        .outerjoin(ReplyLike, ReplyLike.reply_id == Reply.id)
+        select(Reply)
         .where(Reply.parent_reply_id == parent_reply_id)
-        .group_by(Reply.id)
-        .order_by(Reply.created_at)
+        .order_by(Reply.created_at, Reply.id)
         .limit(limit)
-        .offset(offset)
     )
 
     if status:
         stmt = stmt.where(Reply.status == status)
 
+    if cursor:
+        stmt = stmt.where(_after_cursor(cursor))
+
     result = await db.execute(stmt)
-    rows = result.all()
+    children = result.scalars().all()
 
-    children = []
-    for child, like_count in rows:
-        child.like_count = like_count
+    for child in children:
         child.children = None
-        children.append(child)
 
-    return children
+    return children, _next_cursor(children)
@@ -1,43 +1,166 @@
-from sqlalchemy import select
+from uuid import UUID
+
+from sqlalchemy import select, update, func, case, cast, Float
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
 
 from app.core.models.source import Source
 from app.core.models.evidence import Evidence
+from app.services.truth_engine import evidence_score, evidence_score_expression
+
+
+# -------------------------
+# Incremental updates (write path)
+# -------------------------
+
+async def apply_source_delta(
+    session: AsyncSession,
+    source_id: UUID,
+    *,
+    credibility: float = 0.0,
+    citations: int = 0,
+    tampered: int = 0,
+):
+    """
+    Shift a source's running sums and re-derive its reputation in one UPDATE.
+
+    reputation_score is the mean credibility of its citations; a source
+    with no citations left keeps its last score. Runs inside the caller's
+    transaction.
+    """
+    new_sum = Source.credibility_sum + credibility
+    new_count = Source.citation_count + citations
+
+    await session.execute(
+        update(Source)
+        .where(Source.id == source_id)
+        .values(
+            credibility_sum=new_sum,
+            citation_count=new_count,
+            tamper_events=Source.tamper_events + tampered,
+            reputation_score=case(
+                (new_count > 0, new_sum / cast(new_count, Float)),
+                else_=Source.reputation_score,
+            ),
+            last_evaluated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
 
 
-async def update_source_reputation(session: AsyncSession, source_id):
+async def record_citation_added(session: AsyncSession, evidence: Evidence):
+    if not evidence.source_id:
+        return
 
-    result = await session.execute(
-        select(Evidence).where(Evidence.source_id == source_id)
+    await apply_source_delta(
+        session,
+        evidence.source_id,
+        credibility=evidence_score(evidence.credibility_score),
+        citations=1,
+        tampered=1 if evidence.tampered else 0,
     )
 
-    evidence_list = result.scalars().all()
 
-    if not evidence_list:
+async def record_citation_removed(session: AsyncSession, evidence: Evidence):
+    if not evidence.source_id:
         return
 
-    total = len(evidence_list)
+    await apply_source_delta(
+        session,
+        evidence.source_id,
+        credibility=-evidence_score(evidence.credibility_score),
+        citations=-1,
+        tampered=-1 if evidence.tampered else 0,
+    )
+
 
-    credibility_sum = 0
-    tamper_count = 0
+async def record_citation_rescored(
+    session: AsyncSession,
+    evidence: Evidence,
+    previous_score: float | None,
+    was_tampered: bool,
+):
+    if not evidence.source_id:
+        return
 
-    for e in evidence_list:
+    credibility = evidence_score(evidence.credibility_score) - evidence_score(previous_score)
+    tampered = int(bool(evidence.tampered)) - int(bool(was_tampered))
+
+    if credibility or tampered:
+        await apply_source_delta(
+            session,
+            evidence.source_id,
+            credibility=credibility,
+            tampered=tampered,
+        )
+
+
+# -------------------------
+# Reconciliation (rebuild from evidence)
+# -------------------------
+
+async def reconcile_source_aggregates(session: AsyncSession, source_id: UUID | None = None) -> int:
+    """
+    Rebuild citation counts, tamper counts and reputation from evidence.
+
+    Only sources whose stored aggregates drifted are written. Returns the
+    number of sources corrected. Commits.
+    """
+    totals = (
+        select(
+            Evidence.source_id.label("source_id"),
+            # Same falsy default as the write path (evidence_score)
+            func.sum(evidence_score_expression(Evidence.credibility_score)).label("credibility"),
+            func.sum(case((Evidence.tampered.is_(True), 1), else_=0)).label("tampered"),
+            func.count().label("n"),
+        )
+        .where(Evidence.source_id.is_not(None))
+        .group_by(Evidence.source_id)
+        .subquery()
+    )
 
-        credibility_sum += e.credibility_score or 0.3
+    credibility = func.coalesce(totals.c.credibility, 0.0)
+    tampered = func.coalesce(totals.c.tampered, 0)
+    count = func.coalesce(totals.c.n, 0)
+
+    rebuilt = (
+        select(
+            Source.id.label("source_id"),
+            credibility.label("credibility"),
+            tampered.label("tampered"),
+            count.label("n"),
+            case((count > 0, credibility / cast(count, Float)), else_=Source.reputation_score).label("reputation"),
+        )
+        .outerjoin(totals, totals.c.source_id == Source.id)
+        .where(
+            (Source.citation_count != count)
+            | (Source.tamper_events != tampered)
+            | (func.abs(Source.credibility_sum - credibility) > 1e-9)
+        )
+    )
 
-        if getattr(e, "tampered", False):
-            tamper_count += 1
+    if source_id is not None:
+        rebuilt = rebuilt.where(Source.id == source_id)
 
-    reputation = credibility_sum / total
+    rebuilt = rebuilt.subquery()
 
-    source = await session.get(Source, source_id)
+    result = await session.execute(
+        update(Source)
+        .where(Source.id == rebuilt.c.source_id)
+        .values(
+            credibility_sum=rebuilt.c.credibility,
+            tamper_events=rebuilt.c.tampered,
+            citation_count=rebuilt.c.n,
+            reputation_score=rebuilt.c.reputation,
+            last_evaluated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    await session.commit()
 
-    if source:
+    return result.rowcount
 
-        source.reputation_score = reputation
-        source.tamper_events = tamper_count
-        source.citation_count = total
-        source.last_evaluated_at = datetime.utcnow()
 
-        await session.commit()
+async def update_source_reputation(session: AsyncSession, source_id):
+    """Rebuild one source's reputation aggregates from its citations."""
+    await reconcile_source_aggregates(session, source_id)
@@ -0,0 +1,91 @@
+import os
+from datetime import timedelta
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update, func, extract, or_
+
+from app.core.models.post import Post
+from app.core.enums import ContentStatus
+
+
+# Posts older than this are no longer rescored by the bulk job (their score
+# is near zero and barely moves); each gets one last pass after aging out
+TRENDING_REFRESH_WINDOW_HOURS = int(os.getenv("TRENDING_REFRESH_WINDOW_HOURS", "168"))
+
+
+def trending_score_expression():
+    """
+    SQL expression for the trending score of a post row.
+
+    log(likes*2 + replies*3 + 1) / (hours_since_posted + 2) ^ 1.1
+    """
+    engagement_score = func.log(
+        (Post.like_count * 2)
+        + (Post.reply_count * 3)
+        + 1
+    )
+
+    hours_since_posted = (
+        extract("epoch", func.now() - Post.created_at) / 3600
+    )
+
+    return engagement_score / func.pow(hours_since_posted + 2, 1.1)
+
+
+# -------------------------
+# Single post refresh (write path)
+# -------------------------
+async def refresh_post_trending_score(db: AsyncSession, post_id: UUID):
+    """
+    Recompute the stored score for one post.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            trending_score=trending_score_expression(),
+            trending_scored_at=func.now(),
+            # Not a content edit: keep onupdate from bumping updated_at
+            updated_at=Post.updated_at,
+        )
+    )
+
+
+# -------------------------
+# Bulk refresh (background job)
+# -------------------------
+async def refresh_trending_scores(db: AsyncSession) -> int:
+    """
+    Recompute stored scores for active posts in one set-based UPDATE.
+
+    Only posts inside TRENDING_REFRESH_WINDOW_HOURS, plus those last scored
+    before they aged out of it, are touched, and only rows whose score
+    actually changed are written.
+    """
+    window = timedelta(hours=TRENDING_REFRESH_WINDOW_HOURS)
+    new_score = trending_score_expression()
+
+    result = await db.execute(
+        update(Post)
+        .where(
+            Post.status == ContentStatus.active,
+            or_(
+                Post.created_at >= func.now() - window,
+                Post.trending_scored_at.is_(None),
+                Post.trending_scored_at < Post.created_at + window,
+            ),
+            Post.trending_score.is_distinct_from(new_score),
+        )
+        .values(
+            trending_score=new_score,
+            trending_scored_at=func.now(),
+            updated_at=Post.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    await db.commit()
+
+    return result.rowcount
@@ -1,43 +1,216 @@
-from sqlalchemy import select
+from uuid import UUID
+
+from sqlalchemy import select, update, func, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.models.evidence import Evidence
 from app.core.models.post import Post
+from app.services.claim_clustering import record_cluster_evidence
 
 
-async def update_post_truth(session: AsyncSession, post_id):
+# Score used for evidence that is unrated or rated 0 (e.g. tampered)
+DEFAULT_EVIDENCE_SCORE = 0.3
+
+# Evidence count at which confidence saturates
+FULL_CONFIDENCE_COUNT = 5
+
+
+def evidence_score(credibility_score: float | None) -> float:
+    # Falsy, not just None: a 0.0 credibility still weighs the default
+    return credibility_score or DEFAULT_EVIDENCE_SCORE
+
+
+def evidence_score_expression(credibility_score):
+    """SQL twin of evidence_score: NULL and 0 both fall back to the default."""
+    return func.coalesce(func.nullif(credibility_score, 0), DEFAULT_EVIDENCE_SCORE)
+
+
+def derive_truth(support: float, contradict: float, count: int) -> tuple[float | None, float | None]:
+    """(truth_score, truth_confidence) from the running aggregates."""
+    if count <= 0:
+        return None, None
+
+    normalized = max(0.0, min((support - contradict + 1) / 2, 1))
+    confidence = min(count / FULL_CONFIDENCE_COUNT, 1)
+
+    return normalized, confidence
+
+
+def _truth_expressions(support, contradict, count):
+    """SQL twin of derive_truth, over arbitrary column expressions."""
+    truth_score = case(
+        (count <= 0, None),
+        else_=func.greatest(0.0, func.least((support - contradict + 1) / 2.0, 1.0)),
+    )
+    truth_confidence = case(
+        (count <= 0, None),
+        else_=func.least(count / float(FULL_CONFIDENCE_COUNT), 1.0),
+    )
+
+    return truth_score, truth_confidence
+
+
+# -------------------------
+# Incremental updates (write path)
+# -------------------------
+
+async def apply_truth_delta(
+    session: AsyncSession,
+    post_id: UUID,
+    *,
+    support: float = 0.0,
+    contradict: float = 0.0,
+    count: int = 0,
+):
+    """
+    Shift a post's aggregates and re-derive its truth score in one UPDATE.
+
+    SET expressions read the pre-update row, so the derived scores are
+    computed from old + delta. The same delta is rolled up into the post's
+    claim cluster, if it has one. Runs inside the caller's transaction.
+    """
+    new_support = Post.support_weight + support
+    new_contradict = Post.contradict_weight + contradict
+    new_count = Post.evidence_count + count
+
+    truth_score, truth_confidence = _truth_expressions(new_support, new_contradict, new_count)
 
     result = await session.execute(
-        select(Evidence).where(Evidence.post_id == post_id)
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            support_weight=new_support,
+            contradict_weight=new_contradict,
+            evidence_count=new_count,
+            truth_score=truth_score,
+            truth_confidence=truth_confidence,
+            # Derived data, not an edit: keep onupdate from bumping updated_at
+            updated_at=Post.updated_at,
+        )
+        .returning(Post.claim_cluster_id)
+        .execution_options(synchronize_session=False)
     )
 
-    evidence_list = result.scalars().all()
+    cluster_id = result.scalar_one_or_none()
 
-    if not evidence_list:
-        return
+    if cluster_id is not None:
+        await record_cluster_evidence(
+            session,
+            cluster_id,
+            support=support,
+            contradict=contradict,
+            count=count,
+        )
 
-    support = 0
-    contradict = 0
 
-    for e in evidence_list:
+def _split(direction: str, score: float) -> dict:
+    if direction == "supports":
+        return {"support": score, "contradict": 0.0}
+    return {"support": 0.0, "contradict": score}
 
-        score = e.credibility_score or 0.3
 
-        if e.direction == "supports":
-            support += score
-        else:
-            contradict += score
+async def record_evidence_added(session: AsyncSession, evidence: Evidence):
+    await apply_truth_delta(
+        session,
+        evidence.post_id,
+        count=1,
+        **_split(evidence.direction, evidence_score(evidence.credibility_score)),
+    )
 
-    raw_score = support - contradict
 
-    normalized = max(0.0, min((raw_score + 1) / 2, 1))
+async def record_evidence_removed(session: AsyncSession, evidence: Evidence):
+    await apply_truth_delta(
+        session,
+        evidence.post_id,
+        count=-1,
+        **_split(evidence.direction, -evidence_score(evidence.credibility_score)),
+    )
+
 
-    confidence = min(len(evidence_list) / 5, 1)
+async def record_evidence_rescored(
+    session: AsyncSession,
+    evidence: Evidence,
+    previous_score: float | None,
+):
+    delta = evidence_score(evidence.credibility_score) - evidence_score(previous_score)
+
+    if delta:
+        await apply_truth_delta(session, evidence.post_id, **_split(evidence.direction, delta))
+
+
+# -------------------------
+# Reconciliation (rebuild from evidence)
+# -------------------------
+
+async def reconcile_truth_aggregates(session: AsyncSession, post_id: UUID | None = None) -> int:
+    """
+    Rebuild aggregates and truth scores from the evidence table.
+
+    Only rows whose stored aggregates drifted are written. Returns the
+    number of posts corrected. Commits.
+    """
+    score = evidence_score_expression(Evidence.credibility_score)
+    is_support = Evidence.direction == "supports"
+
+    totals = (
+        select(
+            Evidence.post_id.label("post_id"),
+            func.sum(case((is_support, score), else_=0.0)).label("support"),
+            func.sum(case((is_support, 0.0), else_=score)).label("contradict"),
+            func.count().label("n"),
+        )
+        .group_by(Evidence.post_id)
+        .subquery()
+    )
 
-    post = await session.get(Post, post_id)
+    support = func.coalesce(totals.c.support, 0.0)
+    contradict = func.coalesce(totals.c.contradict, 0.0)
+    count = func.coalesce(totals.c.n, 0)
+
+    truth_score, truth_confidence = _truth_expressions(support, contradict, count)
+
+    # Posts with no evidence left join to NULL totals and reset to zero
+    rebuilt = (
+        select(
+            Post.id.label("post_id"),
+            support.label("support"),
+            contradict.label("contradict"),
+            count.label("n"),
+            truth_score.label("truth_score"),
+            truth_confidence.label("truth_confidence"),
+        )
+        .outerjoin(totals, totals.c.post_id == Post.id)
+        .where(
+            (Post.evidence_count != count)
+            | (func.abs(Post.support_weight - support) > 1e-9)
+            | (func.abs(Post.contradict_weight - contradict) > 1e-9)
+        )
+    )
 
-    if post:
-        post.truth_score = normalized
-        post.truth_confidence = confidence
+    if post_id is not None:
+        rebuilt = rebuilt.where(Post.id == post_id)
 
-        await session.commit()
+    rebuilt = rebuilt.subquery()
+
+    result = await session.execute(
+        update(Post)
+        .where(Post.id == rebuilt.c.post_id)
+        .values(
+            support_weight=rebuilt.c.support,
+            contradict_weight=rebuilt.c.contradict,
+            evidence_count=rebuilt.c.n,
+            truth_score=rebuilt.c.truth_score,
+            truth_confidence=rebuilt.c.truth_confidence,
+            updated_at=Post.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    await session.commit()
+
+    return result.rowcount
+
+
+async def update_post_truth(session: AsyncSession, post_id):
+    """Rebuild one post's truth aggregates from its evidence."""
+    await reconcile_truth_aggregates(session, post_id)
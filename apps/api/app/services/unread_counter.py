@@ -0,0 +1,197 @@
+"""
+Per-user unread notification counters in Redis.
+
+Writers adjust a counter only after their transaction commits, and only if
+the key already exists; a missing key is rebuilt from Postgres on the next
+read. Keys expire after UNREAD_COUNTER_TTL_SECONDS and sweep_unread_counters
+corrects drift in between, so a lost adjustment never outlives either.
+"""
+import os
+from collections import Counter
+from typing import Iterable
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import redis as redis_cache
+from app.core.models.notification import Notification
+
+
+UNREAD_COUNTER_TTL_SECONDS = int(os.getenv("UNREAD_COUNTER_TTL_SECONDS", str(24 * 3600)))
+
+UNREAD_KEY_PREFIX = "notifications:unread"
+
+# INCRBY only if the counter exists (never create one from a delta), floored at 0
+_ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    value = 0
+end
+return value
+"""
+
+# SET only if the counter still holds the value the sweep read
+_COMPARE_AND_SET_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'KEEPTTL')
+    return 1
+end
+return 0
+"""
+
+
+def _unread_key(user_id) -> str:
+    return f"{UNREAD_KEY_PREFIX}:{user_id}"
+
+
+# -------------------------
+# Write path (after commit)
+# -------------------------
+
+async def adjust_unread_counts(deltas: dict):
+    """Apply {user_id: delta} to existing counters in one round trip."""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+
+    if not deltas:
+        return
+
+    try:
+        pipe = redis_cache.redis_client.pipeline(transaction=False)
+        for user_id, delta in deltas.items():
+            pipe.eval(_ADJUST_SCRIPT, 1, _unread_key(user_id), delta)
+        await pipe.execute()
+    except RedisError:
+        # The key may now be stale; dropping it forces a rebuild
+        await invalidate_unread_counts(deltas)
+
+
+async def increment_unread_counts(user_ids: Iterable[UUID]):
+    await adjust_unread_counts(Counter(user_ids))
+
+
+async def decrement_unread_count(user_id: UUID, by: int = 1):
+    await adjust_unread_counts({user_id: -by})
+
+
+async def invalidate_unread_counts(user_ids: Iterable[UUID]):
+    try:
+        await redis_cache.redis_client.delete(*[_unread_key(user_id) for user_id in user_ids])
+    except RedisError:
+        pass
+
+
+# -------------------------
+# Read path
+# -------------------------
+
+async def count_unread(db: AsyncSession, user_id: UUID) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(Notification).where(
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None),
+        )
+    )
+    return result.scalar_one()
+
+
+async def get_cached_unread_count(db: AsyncSession, user_id: UUID) -> int:
+    """
+    One Redis GET when the counter is warm; otherwise count in Postgres
+    and seed the counter for later polls.
+    """
+    key = _unread_key(user_id)
+
+    try:
+        cached = await redis_cache.redis_client.get(key)
+    except RedisError:
+        return await count_unread(db, user_id)
+
+    if cached is not None:
+        return int(cached)
+
+    count = await count_unread(db, user_id)
+
+    try:
+        # NX: a concurrent rebuild may already have seeded it
+        await redis_cache.redis_client.set(key, count, nx=True, ex=UNREAD_COUNTER_TTL_SECONDS)
+    except RedisError:
+        pass
+
+    return count
+
+
+# -------------------------
+# Drift correction
+# -------------------------
+
+async def sweep_unread_counters(db: AsyncSession, batch_size: int = 500) -> int:
+    """
+    Compare every live counter with Postgres and correct the ones that
+    drifted. Returns the number of counters corrected.
+
+    Counters are read before Postgres is counted and written with a
+    compare-and-set, so one bumped by a writer mid-sweep is left for the
+    next pass instead of being overwritten.
+    """
+    client = redis_cache.redis_client
+    corrected = 0
+    keys = []
+
+    async for key in client.scan_iter(match=f"{UNREAD_KEY_PREFIX}:*", count=batch_size):
+        keys.append(key)
+
+        if len(keys) >= batch_size:
+            corrected += await _sweep_batch(db, keys)
+            keys = []
+
+    if keys:
+        corrected += await _sweep_batch(db, keys)
+
+    return corrected
+
+
+async def _sweep_batch(db: AsyncSession, keys: list[str]) -> int:
+    client = redis_cache.redis_client
+
+    cached = await client.mget(keys)
+
+    by_user = {}
+    for key, value in zip(keys, cached):
+        if value is None:
+            continue
+        try:
+            by_user[UUID(key.rsplit(":", 1)[1])] = (key, value)
+        except ValueError:
+            continue
+
+    if not by_user:
+        return 0
+
+    result = await db.execute(
+        select(Notification.user_id, func.count())
+        .where(
+            Notification.user_id.in_(list(by_user)),
+            Notification.read_at.is_(None),
+        )
+        .group_by(Notification.user_id)
+    )
+    actual = dict(result.all())
+
+    # Don't hold a connection while talking to Redis
+    await db.rollback()
+
+    corrected = 0
+
+    for user_id, (key, value) in by_user.items():
+        count = actual.get(user_id, 0)
+
+        if int(value) != count:
+            corrected += await client.eval(_COMPARE_AND_SET_SCRIPT, 1, key, value, count)
+
+    return corrected
@@ -0,0 +1,129 @@
+"""
+Reply listing: ReplyLike aggregation vs denormalized Reply.like_count.
+
+Seeds one heavily-liked thread inside a transaction, times both query
+shapes against it, then rolls everything back.
+
+Usage (against a Postgres DATABASE_URL):
+    python -m benchmarks.reply_like_count --replies 500 --likers 200 --runs 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import select, func, text
+
+from app.core.database import lifespan_session
+from app.core.models.post import Post
+from app.core.models.reply import Reply
+from app.core.models.reply_like import ReplyLike
+from app.core.models.user import User
+from app.core.enums import PostType
+
+
+def aggregated_stmt(post_id, limit):
+    """Listing query as it was before the switch to Reply.like_count."""
+    return (
+        select(Reply, func.count(ReplyLike.id).label("like_count"))
+        .outerjoin(ReplyLike, ReplyLike.reply_id == Reply.id)
+        .where(Reply.post_id == post_id, Reply.parent_reply_id.is_(None))
+        .group_by(Reply.id)
+        .order_by(Reply.created_at)
+        .limit(limit)
+    )
+
+
+def counter_stmt(post_id, limit):
+    return (
+        select(Reply)
+        .where(Reply.post_id == post_id, Reply.parent_reply_id.is_(None))
+        .order_by(Reply.created_at)
+        .limit(limit)
+    )
+
+
+async def seed(session, replies: int, likers: int):
+    tag = uuid.uuid4().hex[:8]
+
+    users = [
+        User(
+            email=f"bench-{tag}-{i}@example.com",
+            username=f"bench_{tag}_{i}",
+            password_hash="x",
+        )
+        for i in range(likers)
+    ]
+    session.add_all(users)
+    await session.flush()
+
+    post = Post(
+        author_id=users[0].id,
+        title="Benchmark thread",
+        body="Benchmark thread",
+        post_type=PostType.claim,
+    )
+    session.add(post)
+    await session.flush()
+
+    session.add_all(
+        Reply(post_id=post.id, author_id=users[i % likers].id, body=f"reply {i}", like_count=likers)
+        for i in range(replies)
+    )
+    await session.flush()
+
+    await session.execute(
+        text(
+            """
+            INSERT INTO reply_likes (id, reply_id, user_id)
+            SELECT gen_random_uuid(), r.id, u.id
+            FROM replies r CROSS JOIN users u
+            WHERE r.post_id = :post_id AND u.email LIKE :pattern
+            """
+        ),
+        {"post_id": post.id, "pattern": f"bench-{tag}-%"},
+    )
+    await session.execute(text("ANALYZE replies"))
+    await session.execute(text("ANALYZE reply_likes"))
+
+    return post.id
+
+
+async def time_stmt(session, build, post_id, limit, runs):
+    timings = []
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = await session.execute(build(post_id, limit))
+        result.all()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(timings), max(timings)
+
+
+async def main(replies: int, likers: int, runs: int, limit: int):
+    async with lifespan_session() as session:
+        post_id = await seed(session, replies, likers)
+
+        print(f"thread: {replies} replies x {likers} likes each, page size {limit}")
+
+        for name, build in (
+            ("aggregate (ReplyLike GROUP BY)", aggregated_stmt),
+            ("counter (Reply.like_count)", counter_stmt),
+        ):
+            median, worst = await time_stmt(session, build, post_id, limit, runs)
+            print(f"{name:34} median {median:8.2f} ms   max {worst:8.2f} ms")
+
+        await session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--replies", type=int, default=500)
+    parser.add_argument("--likers", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.replies, args.likers, args.runs, args.limit))
@@ -0,0 +1,86 @@
+import httpx
+import pytest
+
+from app.core import http_client
+from app.services import archive_service
+from app.services.archive_service import FetchRejected, fetch_page, generate_content_hash
+
+
+def use_transport(monkeypatch, handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client, "_client", client)
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_hash_matches_full_text_hash(monkeypatch):
+    body = "<p>café   claim</p>\n" * 5000
+
+    use_transport(
+        monkeypatch,
+        lambda request: httpx.Response(
+            200,
+            content=body.encode("utf-8"),
+            headers={"content-type": "text/html; charset=utf-8"},
+        ),
+    )
+    monkeypatch.setattr(archive_service, "ARCHIVE_EXCERPT_CHARS", 100)
+
+    page = await fetch_page("https://news.example/a")
+
+    assert page.content_hash == generate_content_hash(body)
+    assert page.size == len(body.encode("utf-8"))
+    assert len(page.excerpt) <= 100
+    assert page.excerpt.startswith("<p>café claim</p> ")
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_rejects_oversized_body(monkeypatch):
+    use_transport(
+        monkeypatch,
+        lambda request: httpx.Response(
+            200,
+            content=b"x" * 2048,
+            headers={"content-type": "text/plain"},
+        ),
+    )
+
+    with pytest.raises(FetchRejected):
+        await fetch_page("https://news.example/big", max_bytes=1024)
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_rejects_disallowed_content_type(monkeypatch):
+    use_transport(
+        monkeypatch,
+        lambda request: httpx.Response(
+            200,
+            content=b"\x00\x01",
+            headers={"content-type": "application/octet-stream"},
+        ),
+    )
+
+    with pytest.raises(FetchRejected):
+        await fetch_page("https://news.example/blob")
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_sends_validators_and_handles_304(monkeypatch):
+    seen = {}
+
+    def handler(request):
+        seen.update(request.headers)
+        return httpx.Response(304, headers={"etag": '"v1"'})
+
+    use_transport(monkeypatch, handler)
+
+    page = await fetch_page(
+        "https://news.example/a",
+        etag='"v1"',
+        last_modified="Wed, 01 Oct 2026 00:00:00 GMT",
+    )
+
+    assert page.not_modified
+    assert page.content_hash is None
+    assert page.etag == '"v1"'
+    assert seen["if-none-match"] == '"v1"'
+    assert seen["if-modified-since"] == "Wed, 01 Oct 2026 00:00:00 GMT"
@@ -0,0 +1,108 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.models.archive_blob import ArchiveBlob, ArchiveVersion
+from app.services import archive_store
+from app.services.archive_service import generate_content_hash
+from app.services.archive_store import compress_blob, decompress_blob
+
+
+@pytest_asyncio.fixture()
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: ArchiveBlob.metadata.create_all(
+                sync_conn,
+                tables=[ArchiveBlob.__table__, ArchiveVersion.__table__],
+            )
+        )
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    await engine.dispose()
+
+
+async def count_blobs(db):
+    return (await db.execute(select(func.count()).select_from(ArchiveBlob))).scalar_one()
+
+
+def test_delta_roundtrip_against_previous_version():
+    v1 = ("<p>Official figures show 120 cases.</p> " * 200).encode("utf-8")
+    v2 = v1.replace(b"120 cases", b"240 cases", 1)
+
+    _, full = compress_blob(v2)
+    codec, delta = compress_blob(v2, base=v1)
+
+    assert decompress_blob(codec, delta, base=v1) == v2
+    # The previous version as dictionary makes the new one nearly free
+    assert len(delta) < len(full)
+
+
+def test_zlib_fallback_roundtrip(monkeypatch):
+    monkeypatch.setattr(archive_store, "zstandard", None)
+
+    base = b"first snapshot " * 100
+    data = b"first snapshot " * 99 + b"second snapshot"
+
+    codec, payload = compress_blob(data, base=base)
+
+    assert codec == "zlib"
+    assert decompress_blob(codec, payload, base=base) == data
+
+
+@pytest.mark.asyncio
+async def test_put_blob_is_keyed_by_stored_text_and_dedups(db):
+    text = "<p>Official figures show 120 cases.</p>"
+
+    first = await archive_store.put_blob(db, text)
+    second = await archive_store.put_blob(db, text)
+
+    assert first.content_hash == generate_content_hash(text)
+    assert second is first
+    assert await count_blobs(db) == 1
+    assert await archive_store.read_blob(db, first.content_hash) == text
+
+
+@pytest.mark.asyncio
+async def test_record_version_appends_only_on_change(db):
+    url = "https://news.example/a"
+    v1 = "<p>Official figures show 120 cases.</p> " * 50
+    v2 = v1.replace("120 cases", "240 cases", 1)
+
+    first = await archive_store.record_version(db, url, v1)
+    again = await archive_store.record_version(db, url, v1)
+    second = await archive_store.record_version(db, url, v2)
+    # A page changing back is a new version; its blob is shared
+    third = await archive_store.record_version(db, url, v1)
+
+    assert [first.version, again.version, second.version, third.version] == [1, 1, 2, 3]
+    assert third.content_hash == first.content_hash
+    assert await count_blobs(db) == 2
+
+    delta = await db.get(ArchiveBlob, second.content_hash)
+    assert delta.base_hash == first.content_hash
+    assert await archive_store.read_blob(db, second.content_hash) == v2
+
+    diff = await archive_store.diff_versions(db, url, 1, 2)
+    assert any("240 cases" in line for line in diff)
+    assert await archive_store.diff_versions(db, url, 1, 9) is None
+
+
+@pytest.mark.asyncio
+async def test_delta_chain_is_cut_at_max_depth(db, monkeypatch):
+    monkeypatch.setattr(archive_store, "ARCHIVE_MAX_DELTA_CHAIN", 2)
+    url = "https://news.example/a"
+
+    depths = []
+    for n in range(5):
+        version = await archive_store.record_version(db, url, f"<p>revision {n}</p> " * 20)
+        blob = await db.get(ArchiveBlob, version.content_hash)
+        depths.append(blob.chain_depth)
+
+    assert depths == [0, 1, 2, 0, 1]
+    assert await archive_store.read_blob(db, version.content_hash) == "<p>revision 4</p> " * 20
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.enums import ContentStatus
+from app.core.models.claim_cluster import ClaimCluster
+from app.core.models.claim_signature import ClaimLshBucket, ClaimSignature
+from app.core.models.post import Post
+from app.services.claim_clustering import (
+    LSH_BANDS,
+    assign_claim_cluster,
+    estimate_similarity,
+    get_cluster_members,
+    lsh_buckets,
+    minhash_signature,
+    record_cluster_visibility,
+)
+
+
+ORIGINAL = "The city council secretly voted to sell the central park to a private developer last night"
+REWORDED = "BREAKING: the city council secretly voted to sell the central park to a private developer!"
+UNRELATED = "New study finds regular exercise improves sleep quality in older adults"
+
+
+def test_minhash_similarity_separates_rewording_from_unrelated():
+    original = minhash_signature(ORIGINAL)
+
+    assert estimate_similarity(original, minhash_signature(ORIGINAL)) == 1.0
+    assert estimate_similarity(original, minhash_signature(REWORDED)) >= 0.5
+    assert estimate_similarity(original, minhash_signature(UNRELATED)) < 0.2
+
+
+def test_lsh_buckets_are_stable_signed_64_bit():
+    buckets = lsh_buckets(minhash_signature(ORIGINAL))
+
+    assert len(buckets) == LSH_BANDS
+    assert buckets == lsh_buckets(minhash_signature(ORIGINAL))
+    assert all(-(1 << 63) <= bucket < (1 << 63) for _, bucket in buckets)
+
+
+@pytest_asyncio.fixture()
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    tables = [Post.__table__, ClaimCluster.__table__, ClaimSignature.__table__, ClaimLshBucket.__table__]
+
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Post.metadata.create_all(sync_conn, tables=tables))
+
+    async with AsyncSession(engine) as session:
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reworded_claim_joins_existing_cluster(db):
+    first, second, third = uuid4(), uuid4(), uuid4()
+
+    first_cluster, _ = await assign_claim_cluster(db, first, ORIGINAL)
+
+    # The candidate lookup reads the cluster id off the posts row
+    db.add(Post(id=first, author_id=uuid4(), post_type="claim", title=ORIGINAL, body="",
+                claim_cluster_id=first_cluster))
+    await db.flush()
+
+    cluster, score = await assign_claim_cluster(db, second, REWORDED)
+    assert cluster == first_cluster
+    assert score >= 0.5
+
+    cluster, _ = await assign_claim_cluster(db, third, UNRELATED)
+    assert cluster != first_cluster
+
+    # Re-running for a post replaces its index rows
+    await assign_claim_cluster(db, second, REWORDED)
+    buckets = await db.execute(select(ClaimLshBucket).where(ClaimLshBucket.post_id == second))
+    assert len(buckets.scalars().all()) == LSH_BANDS
+
+
+@pytest.mark.asyncio
+async def test_cluster_members_keyset_pages(db):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    posts = [
+        Post(id=uuid4(), author_id=uuid4(), post_type="claim", title=f"claim {i}", body="",
+             claim_cluster_id="cluster-a", created_at=start + timedelta(minutes=i))
+        for i in range(5)
+    ]
+    other = Post(id=uuid4(), author_id=uuid4(), post_type="claim", title="other", body="",
+                 claim_cluster_id="cluster-b", created_at=start)
+    db.add_all([*posts, other])
+    await db.flush()
+
+    seen, cursor = [], None
+
+    while True:
+        page, cursor = await get_cluster_members(db, "cluster-a", limit=2, cursor=cursor)
+        seen.extend(post.id for post in page)
+
+        if cursor is None:
+            break
+
+    assert seen == [post.id for post in reversed(posts)]
+
+
+@pytest.mark.asyncio
+async def test_member_count_tracks_listed_posts(db):
+    posts = [
+        Post(id=uuid4(), author_id=uuid4(), post_type="claim", title=f"claim {i}", body="",
+             claim_cluster_id="cluster-a")
+        for i in range(2)
+    ]
+    db.add_all([*posts, ClaimCluster(id="cluster-a", member_count=2)])
+    await db.flush()
+
+    async def moderate(post, status):
+        previous, post.status = post.status, status
+        await record_cluster_visibility(db, post, previous)
+        await db.flush()
+
+        cluster = (await db.execute(select(ClaimCluster.member_count))).scalar_one()
+        listed, _ = await get_cluster_members(db, "cluster-a", limit=10)
+
+        assert cluster == len(listed)
+
+    await moderate(posts[0], ContentStatus.locked)
+    await moderate(posts[0], ContentStatus.removed_illegal)
+    await moderate(posts[0], ContentStatus.active)
@@ -0,0 +1,33 @@
+import pytest
+
+from app.core.utils.cursor import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(0.4137, "6f1c2f0e-7f43-4a55-9d43-2b8d1b1f3a10")
+
+    assert decode_cursor(cursor) == ["0.4137", "6f1c2f0e-7f43-4a55-9d43-2b8d1b1f3a10"]
+
+
+def test_cursor_is_opaque():
+    cursor = encode_cursor("2026-01-01T00:00:00+00:00", "abc")
+
+    assert "|" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "", encode_cursor("only-one-part")])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_created_at_cursor_round_trip():
+    from datetime import datetime, timezone
+    from uuid import uuid4
+
+    from app.core.utils.cursor import encode_created_at_cursor, decode_created_at_cursor
+
+    created_at = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    assert decode_created_at_cursor(encode_created_at_cursor(created_at, row_id)) == (created_at, row_id)
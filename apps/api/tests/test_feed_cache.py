@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import fakeredis.aioredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.cache import redis as redis_cache
+from app.core.enums import FeedMode
+from app.services import feed_cache
+
+
+def make_post():
+    author = SimpleNamespace(id=uuid4(), username="author", display_name=None, bio=None)
+    return SimpleNamespace(
+        id=uuid4(),
+        post_type="claim",
+        title="A claim",
+        created_at=datetime.now(timezone.utc),
+        status="active",
+        reply_count=0,
+        like_count=0,
+        trending_score=0.0,
+        liked_by_current_user=False,
+        author=author,
+    )
+
+
+@pytest.fixture
+def fake_feed(monkeypatch):
+    posts = [make_post(), make_post()]
+    calls = []
+
+    async def fake_get_feed(db, **kwargs):
+        calls.append(kwargs)
+        return posts, None
+
+    async def fake_network(db, post_ids):
+        return {}
+
+    monkeypatch.setattr(feed_cache, "get_feed", fake_get_feed)
+    monkeypatch.setattr(feed_cache, "analyze_posts_network", fake_network)
+    monkeypatch.setattr(redis_cache, "redis_client", fakeredis.aioredis.FakeRedis(decode_responses=True))
+    return posts, calls
+
+
+@pytest.mark.asyncio
+async def test_anonymous_page_is_served_from_cache(fake_feed):
+    posts, calls = fake_feed
+
+    first = await feed_cache.get_feed_page(None, mode=FeedMode.latest)
+    second = await feed_cache.get_feed_page(None, mode=FeedMode.latest)
+
+    assert first == second
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_post_invalidation_drops_tagged_pages(fake_feed):
+    posts, calls = fake_feed
+
+    await feed_cache.get_feed_page(None, mode=FeedMode.latest)
+    await feed_cache.invalidate_post(posts[0].id)
+    await feed_cache.get_feed_page(None, mode=FeedMode.latest)
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_falls_back_to_database(fake_feed, monkeypatch):
+    posts, calls = fake_feed
+
+    class BrokenRedis:
+        async def get(self, key):
+            raise RedisConnectionError("down")
+
+    monkeypatch.setattr(redis_cache, "redis_client", BrokenRedis())
+
+    page = await feed_cache.get_feed_page(None, mode=FeedMode.latest)
+
+    assert len(page["items"]) == 2
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_logged_in_user_shares_page_and_gets_liked_overlay(fake_feed):
+    from app.services import liked_posts_cache
+
+    posts, calls = fake_feed
+    user_id = uuid4()
+
+    await feed_cache.get_feed_page(None, mode=FeedMode.latest)
+    await redis_cache.redis_client.sadd(
+        f"likes:user:{user_id}", liked_posts_cache.LOADED_MARKER, str(posts[1].id)
+    )
+
+    page = await feed_cache.get_feed_page(None, mode=FeedMode.latest, current_user_id=user_id)
+
+    assert len(calls) == 1
+    assert [item["has_liked"] for item in page["items"]] == [False, True]
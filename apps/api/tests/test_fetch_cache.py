@@ -0,0 +1,82 @@
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from app.core.cache import redis as redis_cache
+from app.services import fetch_cache
+from app.services.archive_service import FetchedPage, FetchRejected
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_cache, "redis_client", client)
+    fetch_cache.clear_local_cache()
+    return client
+
+
+def test_normalize_url_drops_tracking_and_fragment():
+    assert fetch_cache.normalize_url(
+        "HTTPS://News.Example:443/story?utm_source=x&b=2&a=1#top"
+    ) == "https://news.example/story?a=1&b=2"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_fetch_once(monkeypatch, fake_redis):
+    calls = []
+
+    async def fake_fetch(url, **kwargs):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return FetchedPage(content_hash="abc", excerpt="text", size=4, content_type="text/html")
+
+    monkeypatch.setattr(fetch_cache, "fetch_page", fake_fetch)
+
+    pages = await asyncio.gather(
+        *(fetch_cache.get_or_fetch("https://news.example/story") for _ in range(20))
+    )
+
+    assert len(calls) == 1
+    assert {page.content_hash for page in pages} == {"abc"}
+
+    # Another process (empty LRU) is served from Redis
+    fetch_cache.clear_local_cache()
+    page = await fetch_cache.get_or_fetch("https://news.example/story?utm_medium=social")
+
+    assert page.content_hash == "abc"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_rejections_are_cached(monkeypatch, fake_redis):
+    calls = []
+
+    async def fake_fetch(url, **kwargs):
+        calls.append(url)
+        raise FetchRejected("too big")
+
+    monkeypatch.setattr(fetch_cache, "fetch_page", fake_fetch)
+
+    for _ in range(2):
+        with pytest.raises(FetchRejected):
+            await fetch_cache.get_or_fetch("https://news.example/huge.pdf")
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_release_keeps_a_lock_taken_over_by_another_worker(monkeypatch, fake_redis):
+    url = "https://news.example/slow"
+    lock_key = f"{fetch_cache.LOCK_KEY_PREFIX}:{fetch_cache._cache_key(fetch_cache.normalize_url(url))}"
+
+    async def slow_fetch(url, **kwargs):
+        # Our lock expired mid-fetch and another worker took it
+        await fake_redis.set(lock_key, "other-worker")
+        return FetchedPage(content_hash="abc", excerpt="text", size=4, content_type="text/html")
+
+    monkeypatch.setattr(fetch_cache, "fetch_page", slow_fetch)
+
+    await fetch_cache.get_or_fetch(url)
+
+    assert await fake_redis.get(lock_key) == "other-worker"
@@ -0,0 +1,85 @@
+from uuid import uuid4
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.cache import redis as redis_cache
+from app.core.models.evidence import Evidence
+from app.services import graph_intelligence
+
+
+@pytest_asyncio.fixture()
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Evidence.metadata.create_all(sync_conn, tables=[Evidence.__table__])
+        )
+
+    async with AsyncSession(engine) as session:
+        yield session
+
+    await engine.dispose()
+
+
+def make_evidence(post_id, direction, source_id=None):
+    return Evidence(
+        post_id=post_id,
+        submitted_by=uuid4(),
+        evidence_type="link",
+        direction=direction,
+        source_description="A source description",
+        source_id=source_id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_metrics_in_one_query_then_cached(db, monkeypatch):
+    monkeypatch.setattr(
+        redis_cache,
+        "redis_client",
+        fakeredis.aioredis.FakeRedis(decode_responses=True),
+    )
+
+    post_a, post_b, post_c = uuid4(), uuid4(), uuid4()
+    source = uuid4()
+
+    db.add_all([
+        make_evidence(post_a, "supports", source),
+        make_evidence(post_a, "supports", source),
+        make_evidence(post_a, "contradicts", source),
+        make_evidence(post_b, "supports", uuid4()),
+    ])
+    await db.commit()
+
+    loads = []
+    real_load = graph_intelligence._load_network_metrics
+
+    async def counting_load(session, post_ids):
+        loads.append(list(post_ids))
+        return await real_load(session, post_ids)
+
+    monkeypatch.setattr(graph_intelligence, "_load_network_metrics", counting_load)
+
+    metrics = await graph_intelligence.analyze_posts_network(db, [post_a, post_b, post_c])
+
+    assert metrics[str(post_a)] == {
+        "unique_sources": 1,
+        "supporting_evidence": 2,
+        "contradicting_evidence": 1,
+        "evidence_count": 3,
+    }
+    assert metrics[str(post_c)]["evidence_count"] == 0
+    assert graph_intelligence.detect_single_source_narrative(metrics[str(post_a)])
+    assert len(loads) == 1
+
+    # Served from cache until an evidence write invalidates it
+    await graph_intelligence.analyze_posts_network(db, [post_a, post_b, post_c])
+    assert len(loads) == 1
+
+    await graph_intelligence.invalidate_post_network(post_a)
+    await graph_intelligence.analyze_posts_network(db, [post_a, post_b])
+    assert loads[-1] == [post_a]
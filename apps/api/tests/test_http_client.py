@@ -0,0 +1,40 @@
+import httpx
+import pytest
+
+from app.core import http_client
+
+
+@pytest.mark.asyncio
+async def test_http_get_reuses_shared_client_and_counts(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("user-agent"))
+        return httpx.Response(200, text="ok")
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        headers={"User-Agent": http_client.USER_AGENT},
+    )
+    monkeypatch.setattr(http_client, "_client", client)
+    monkeypatch.setattr(
+        http_client,
+        "_stats",
+        {"requests": 0, "new_connections": 0, "tls_handshakes": 0, "errors": 0},
+    )
+
+    assert http_client.get_http_client() is client
+
+    for _ in range(3):
+        response = await http_client.http_get("https://news.example/a")
+        assert response.text == "ok"
+
+    stats = http_client.get_http_client_stats()
+    assert stats["requests"] == 3
+    assert stats["errors"] == 0
+    assert seen == [http_client.USER_AGENT] * 3
+    # Per-host slots are released once nothing is in flight for the host
+    assert http_client._host_slots == {}
+
+    await http_client.close_http_client()
+    assert http_client._client is None
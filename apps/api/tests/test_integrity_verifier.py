@@ -0,0 +1,109 @@
+import asyncio
+from uuid import uuid4
+
+import fakeredis.aioredis
+import pytest
+
+from app.core.cache import redis as redis_cache
+from app.core.models.evidence import Evidence
+from app.services import fetch_cache, integrity_verifier
+from app.services.archive_service import FetchedPage
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_caps_in_flight_fetches_per_host(monkeypatch):
+    in_flight = {}
+    peak = {}
+
+    async def fake_fetch(url, **kwargs):
+        host = url.split("/")[2]
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return FetchedPage(content_hash="h", excerpt="", size=0, content_type=None)
+
+    monkeypatch.setattr(integrity_verifier, "fetch_page", fake_fetch)
+    monkeypatch.setattr(
+        redis_cache,
+        "redis_client",
+        fakeredis.aioredis.FakeRedis(decode_responses=True),
+    )
+    fetch_cache.clear_local_cache()
+
+    limiter = integrity_verifier.HostLimiter(concurrency=10, per_host=2)
+    urls = [f"https://news-a.example/{i}" for i in range(6)] + [
+        f"https://news-b.example/{i}" for i in range(6)
+    ]
+
+    await asyncio.gather(*(limiter.fetch(url) for url in urls))
+
+    assert peak == {"news-a.example": 2, "news-b.example": 2}
+
+
+class FakeScalars:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Serves pre-cut keyset batches; records which ids each commit covered."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.commits = 0
+
+    async def execute(self, stmt):
+        return FakeScalars(self.batches.pop(0) if self.batches else [])
+
+    async def commit(self):
+        self.commits += 1
+
+    def expunge(self, instance):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_slow_host_does_not_stall_the_pass_or_the_checkpoint(monkeypatch):
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_cache, "redis_client", redis)
+    fetch_cache.clear_local_cache()
+
+    rows = sorted(
+        (Evidence(id=uuid4(), source_url=f"https://fast.example/{i}") for i in range(6)),
+        key=lambda evidence: evidence.id,
+    )
+    rows[1].source_url = "https://slow.example/1"
+
+    slow_released = asyncio.Event()
+    fetched = []
+    checkpoints = []
+
+    async def fake_fetch(url, **kwargs):
+        if "slow" in url:
+            await slow_released.wait()
+        fetched.append(url)
+        if len(fetched) == len(rows) - 1:
+            # Every other row finished while the slow one is still out
+            checkpoints.append(await integrity_verifier.load_checkpoint())
+            slow_released.set()
+        return FetchedPage(content_hash=None, excerpt="", size=0, content_type=None, not_modified=True)
+
+    monkeypatch.setattr(integrity_verifier, "fetch_page", fake_fetch)
+
+    session = FakeSession([rows[:3], rows[3:]])
+    stats = await integrity_verifier.verify_evidence_integrity(
+        session, batch_size=2, concurrency=4, per_host=4, resume=False,
+    )
+
+    assert fetched[-1] == "https://slow.example/1"
+    # Committed rows past the slow one were not checkpointed over it
+    assert checkpoints == [rows[0].id]
+    assert stats["checked"] == stats["unchanged"] == len(rows)
+    assert await integrity_verifier.load_checkpoint() is None
@@ -0,0 +1,121 @@
+import json
+
+import fakeredis.aioredis
+import pytest
+
+from app.core import job_queue
+from app.core.cache import redis as redis_cache
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_cache, "redis_client", client)
+    return client
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    received = []
+
+    async def ok_job(value):
+        received.append(value)
+
+    async def failing_job(value):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(job_queue, "_handlers", {})
+    job_queue.register_job("ok")(ok_job)
+    job_queue.register_job("fails")(failing_job)
+    return received
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_deduplicates_enqueue(fake_redis):
+    first = await job_queue.enqueue("ok", {"value": 1}, idempotency_key="ok:1")
+    second = await job_queue.enqueue("ok", {"value": 1}, idempotency_key="ok:1")
+
+    assert first is not None
+    assert second is None
+    assert (await job_queue.get_queue_stats())["queued"] == 1
+
+
+@pytest.mark.asyncio
+async def test_successful_job_is_acknowledged(fake_redis, calls):
+    await job_queue.enqueue("ok", {"value": 7})
+
+    raw = await job_queue.fetch_job("w1", timeout=0.1)
+    assert await job_queue.run_job("w1", raw) is True
+
+    assert calls == [7]
+    stats = await job_queue.get_queue_stats()
+    assert stats["queued"] == stats["processing"] == stats["delayed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_dead_lettered(fake_redis, calls):
+    await job_queue.enqueue("fails", {"value": 1}, max_attempts=2)
+
+    raw = await job_queue.fetch_job("w1", timeout=0.1)
+    assert await job_queue.run_job("w1", raw) is False
+    assert (await job_queue.get_queue_stats())["delayed"] == 1
+
+    await job_queue.promote_due_jobs(now=float("inf"))
+    raw = await job_queue.fetch_job("w1", timeout=0.1)
+    assert json.loads(raw)["attempts"] == 1
+    await job_queue.run_job("w1", raw)
+
+    stats = await job_queue.get_queue_stats()
+    assert stats["dead"] == 1
+    assert stats["delayed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_orphaned_jobs_are_requeued(fake_redis):
+    await job_queue.enqueue("ok", {"value": 1})
+    await job_queue.fetch_job("crashed", timeout=0.1)
+
+    assert await job_queue.requeue_orphans("crashed") == 1
+    assert (await job_queue.get_queue_stats())["queued"] == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesce_key_folds_pending_jobs_until_started(fake_redis, calls):
+    assert await job_queue.enqueue("ok", {"value": 1}, coalesce_key="post:1")
+    assert await job_queue.enqueue("ok", {"value": 2}, coalesce_key="post:1") is None
+
+    raw = await job_queue.fetch_job("w1", timeout=0.1)
+    await job_queue.run_job("w1", raw)
+
+    assert calls == [1]
+    assert await job_queue.enqueue("ok", {"value": 3}, coalesce_key="post:1")
+
+
+@pytest.mark.asyncio
+async def test_rejected_enqueue_claims_nothing(fake_redis):
+    assert await job_queue.enqueue("ok", {"value": 1}, coalesce_key="post:1")
+
+    # Coalesced away: its idempotency key must stay free for a later attempt
+    assert await job_queue.enqueue("ok", {"value": 2}, idempotency_key="ok:2", coalesce_key="post:1") is None
+    assert not await fake_redis.exists(f"{job_queue.IDEMPOTENCY_KEY_PREFIX}:ok:2")
+
+    assert await job_queue.enqueue("ok", {"value": 3}, delay_seconds=60)
+    stats = await job_queue.get_queue_stats()
+    assert (stats["queued"], stats["delayed"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_dead_workers_jobs_are_reaped(fake_redis):
+    assert job_queue.default_worker_id() != job_queue.default_worker_id()
+
+    await job_queue.enqueue("ok", {"value": 1})
+    await job_queue.enqueue("ok", {"value": 2})
+
+    await job_queue.heartbeat("alive")
+    await job_queue.fetch_job("alive", timeout=0.1)
+    await job_queue.fetch_job("dead", timeout=0.1)
+
+    assert await job_queue.reap_stale_workers() == 1
+
+    stats = await job_queue.get_queue_stats()
+    assert (stats["queued"], stats["processing"]) == (1, 1)
@@ -0,0 +1,81 @@
+from uuid import uuid4
+
+import fakeredis.aioredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.cache import redis as redis_cache
+from app.services import liked_posts_cache
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeDB:
+    """Returns a fixed post_likes snapshot; on_query runs while it is "in flight"."""
+
+    def __init__(self, post_ids, on_query=None):
+        self.post_ids = post_ids
+        self.on_query = on_query
+
+    async def execute(self, stmt):
+        rows = [(post_id,) for post_id in self.post_ids]
+        if self.on_query:
+            await self.on_query()
+        return FakeResult(rows)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_cache, "redis_client", client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_rebuild_then_warm_probe(redis):
+    user_id, liked, other = uuid4(), uuid4(), uuid4()
+    db = FakeDB([liked])
+
+    assert await liked_posts_cache.get_liked_post_ids(db, user_id, [liked, other]) == {str(liked)}
+    assert await redis.sismember(liked_posts_cache._liked_key(user_id), liked_posts_cache.LOADED_MARKER)
+
+    db.post_ids = []
+    # Warm set answers without touching the DB snapshot
+    assert await liked_posts_cache.get_liked_post_ids(db, user_id, [liked, other]) == {str(liked)}
+
+
+@pytest.mark.asyncio
+async def test_unlike_during_rebuild_does_not_resurrect_like(redis):
+    user_id, post_id = uuid4(), uuid4()
+
+    async def unlike():
+        await liked_posts_cache.remove_liked_post(user_id, post_id)
+
+    # The rebuild read the like before the unlike committed
+    db = FakeDB([post_id], on_query=unlike)
+    await liked_posts_cache.get_liked_post_ids(db, user_id, [post_id])
+
+    assert not await redis.exists(liked_posts_cache._liked_key(user_id))
+
+    db = FakeDB([])
+    assert await liked_posts_cache.get_liked_post_ids(db, user_id, [post_id]) == set()
+
+
+@pytest.mark.asyncio
+async def test_failed_write_drops_warm_set(redis, monkeypatch):
+    user_id, post_id = uuid4(), uuid4()
+    await liked_posts_cache.get_liked_post_ids(FakeDB([post_id]), user_id, [post_id])
+
+    async def fail(*args, **kwargs):
+        raise RedisConnectionError("down")
+
+    monkeypatch.setattr(redis, "sadd", fail)
+    await liked_posts_cache.add_liked_post(user_id, uuid4())
+
+    assert not await redis.exists(liked_posts_cache._liked_key(user_id))
@@ -0,0 +1,48 @@
+import os
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import column, select, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.services.narrative_intelligence import cluster_id_aggregate, generate_cluster_id
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def test_cluster_id_ignores_source_order():
+    a, b = uuid4(), uuid4()
+
+    assert generate_cluster_id({a, b}) == generate_cluster_id([b, a])
+    assert len(generate_cluster_id([a])) == 16
+
+
+def test_cluster_id_sorts_like_uuid_text():
+    # refresh_all_narratives sorts source_id::text in SQL
+    ids = [uuid4() for _ in range(20)]
+
+    assert sorted(ids) == sorted(ids, key=str)
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="needs Postgres (set TEST_DATABASE_URL)")
+async def test_sql_cluster_id_matches_python():
+    # refresh_all_narratives relies on sha256/string_agg/COLLATE "C" behaving
+    # exactly like generate_cluster_id; only Postgres can check that
+    engine = create_async_engine(TEST_DATABASE_URL)
+
+    try:
+        async with engine.connect() as conn:
+            for n in (1, 2, 50):
+                ids = [uuid4() for _ in range(n)]
+                rows = values(column("source_id", UUID(as_uuid=True)), name="ids").data(
+                    [(source_id,) for source_id in ids]
+                )
+
+                result = await conn.execute(select(cluster_id_aggregate(rows.c.source_id)))
+
+                assert result.scalar_one() == generate_cluster_id(ids)
+    finally:
+        await engine.dispose()
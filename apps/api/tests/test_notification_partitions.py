@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+from app.services.notification_partitions import (
+    add_months,
+    expiry_candidates,
+    month_start,
+    partition_horizon,
+    partition_month,
+    partition_name,
+)
+
+
+def test_partition_names_round_trip_across_year_end():
+    month = month_start(datetime(2026, 12, 31, 23, 59, tzinfo=timezone.utc))
+
+    assert partition_name(month) == "notifications_p202612"
+    assert partition_name(add_months(month, 1)) == "notifications_p202701"
+    assert partition_name(add_months(month, -12)) == "notifications_p202512"
+    assert partition_month("notifications_p202701") == add_months(month, 1)
+    assert partition_month("notifications_default") is None
+
+
+def test_only_fully_expired_months_are_candidates():
+    names = [
+        "notifications_default",
+        "notifications_p202606",
+        "notifications_p202607",
+        "notifications_p202608",
+    ]
+    now = datetime(2026, 10, 30, tzinfo=timezone.utc)
+
+    # Cutoff 2026-08-01: July ends exactly there, August straddles it
+    assert expiry_candidates(names, now, 90) == ["notifications_p202606", "notifications_p202607"]
+
+
+def test_horizon_is_the_end_of_the_last_month():
+    names = ["notifications_p202612", "notifications_p202701", "notifications_p202611"]
+
+    assert partition_horizon(names) == datetime(2027, 2, 1, tzinfo=timezone.utc)
+    assert partition_horizon(["notifications_default"]) is None
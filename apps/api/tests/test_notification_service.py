@@ -0,0 +1,160 @@
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.models.notification import Notification
+from app.services import notification_service
+from app.services.notification_service import NotificationBatch, get_user_notifications
+
+
+@pytest_asyncio.fixture()
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Notification.metadata.create_all(sync_conn, tables=[Notification.__table__])
+        )
+
+    async with AsyncSession(engine) as session:
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_in_chunks_and_keeps_order(db, monkeypatch):
+    monkeypatch.setattr(notification_service, "NOTIFICATION_INSERT_BATCH_SIZE", 4)
+
+    statements = []
+    real_execute = db.execute
+
+    async def counting_execute(stmt, *args, **kwargs):
+        statements.append(stmt)
+        return await real_execute(stmt, *args, **kwargs)
+
+    monkeypatch.setattr(db, "execute", counting_execute)
+
+    user_id = uuid4()
+    batch = NotificationBatch()
+
+    for i in range(10):
+        batch.add(user_id=user_id, type="mention", payload={"n": i})
+
+    rows = await batch.flush(db)
+    await db.commit()
+
+    assert len(rows) == 10
+    assert len(batch) == 0
+    assert len(statements) == 3
+
+    # Newest first, in the reverse of the order they were added
+    page, _ = await get_user_notifications(db, user_id, limit=20)
+    assert [n.payload["n"] for n in page] == list(reversed(range(10)))
+
+
+@pytest.mark.asyncio
+async def test_group_window_is_shared_until_it_expires(monkeypatch):
+    import fakeredis.aioredis
+    from app.core.cache import redis as redis_cache
+
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_cache, "redis_client", client)
+
+    user_id = uuid4()
+
+    opened = await notification_service._group_window_start(user_id, "post_like:abc")
+    assert await notification_service._group_window_start(user_id, "post_like:abc") == opened
+
+    await client.flushall()
+    assert await notification_service._group_window_start(user_id, "post_like:abc") > opened
+
+
+@pytest.mark.asyncio
+async def test_group_window_falls_back_to_clock_buckets(monkeypatch):
+    from redis.exceptions import ConnectionError
+    from app.core.cache import redis as redis_cache
+
+    class DownRedis:
+        def pipeline(self):
+            raise ConnectionError("down")
+
+    monkeypatch.setattr(redis_cache, "redis_client", DownRedis())
+    monkeypatch.setattr(notification_service, "NOTIFICATION_COALESCE_WINDOW_SECONDS", 3600)
+
+    opened = await notification_service._group_window_start(uuid4(), "post_like:abc")
+
+    assert opened.minute == opened.second == opened.microsecond == 0
+
+
+@pytest.mark.asyncio
+async def test_reading_a_group_closes_its_window(db, monkeypatch):
+    import fakeredis.aioredis
+    from app.core.cache import redis as redis_cache
+
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_cache, "redis_client", client)
+
+    user_id = uuid4()
+    grouped = [
+        Notification(user_id=user_id, type="post_like", payload={}, group_key=f"post_like:{n}")
+        for n in range(2)
+    ]
+    db.add_all(grouped + [Notification(user_id=user_id, type="mention", payload={})])
+    await db.flush()
+    first_id = grouped[0].id
+    await db.commit()
+
+    opened = {}
+    for group_key in ("post_like:0", "post_like:1"):
+        opened[group_key] = await notification_service._group_window_start(user_id, group_key)
+
+    await notification_service.mark_notification_read(db, notification_id=first_id, user_id=user_id)
+
+    # The read group's next event opens a new window; the other keeps its own
+    assert await notification_service._group_window_start(user_id, "post_like:0") > opened["post_like:0"]
+    assert await notification_service._group_window_start(user_id, "post_like:1") == opened["post_like:1"]
+
+    assert await notification_service.mark_all_notifications_read(db, user_id=user_id) == 2
+    assert not await client.exists(notification_service._group_window_key(user_id, "post_like:1"))
+
+
+@pytest.mark.asyncio
+async def test_only_read_notifications_expire(db):
+    from datetime import datetime, timedelta, timezone
+    from app.services.notification_partitions import NOTIFICATION_RETENTION_DAYS
+
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=NOTIFICATION_RETENTION_DAYS + 1)
+    db.add_all([
+        Notification(user_id=user_id, type="mention", payload={"n": 0}, created_at=now),
+        Notification(user_id=user_id, type="mention", payload={"n": 1}, created_at=old, read_at=old),
+        Notification(user_id=user_id, type="mention", payload={"n": 2}, created_at=old),
+    ])
+    await db.commit()
+
+    page, _ = await get_user_notifications(db, user_id, limit=20)
+
+    assert [n.payload["n"] for n in page] == [0, 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_does_not_fail_the_callers_write(db):
+    user_id = uuid4()
+
+    # Stands in for the reply the batch belongs to
+    db.add(Notification(user_id=user_id, type="mention", payload={"n": 0}))
+    await db.flush()
+
+    batch = NotificationBatch()
+    batch.add(user_id=user_id, type="mention", payload={"n": 1})
+    batch._rows[0]["user_id"] = None
+
+    assert await batch.flush(db) == []
+    await db.commit()
+
+    page, _ = await get_user_notifications(db, user_id, limit=20)
+    assert [n.payload["n"] for n in page] == [0]
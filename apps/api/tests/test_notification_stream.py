@@ -0,0 +1,206 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cache import redis as redis_cache
+from app.core.models.notification import Notification
+from app.core.models.user import User
+from app.core.utils.cursor import encode_created_at_cursor
+from app.services import notification_stream
+from app.services.notification_stream import NotificationHub, NotificationListener
+
+
+@pytest_asyncio.fixture()
+async def stream_env(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Notification.metadata.create_all(
+                sync_conn, tables=[Notification.__table__, User.__table__]
+            )
+        )
+
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    monkeypatch.setattr(redis_cache, "redis_client", fakeredis.aioredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(notification_stream, "async_session", sessions)
+    monkeypatch.setattr(notification_stream, "hub", NotificationHub())
+
+    yield sessions
+
+    await notification_stream.hub.close()
+    await engine.dispose()
+
+
+async def make_user(sessions, **fields):
+    user = User(id=uuid4(), email=f"{uuid4().hex}@example.com", username=uuid4().hex,
+                password_hash="hashed", **fields)
+
+    async with sessions() as session:
+        session.add(user)
+        await session.commit()
+
+    return user.id
+
+
+def make_row(user_id, created_at, n):
+    return {
+        "id": uuid4(),
+        "user_id": user_id,
+        "type": "mention",
+        "payload": {"n": n},
+        "created_at": created_at,
+    }
+
+
+def parse(frame: str) -> dict:
+    fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return {"id": fields["id"], "data": json.loads(fields["data"])}
+
+
+async def next_frame(stream):
+    return await asyncio.wait_for(stream.__anext__(), 2)
+
+
+@pytest.mark.asyncio
+async def test_live_events_reach_only_the_recipient(stream_env):
+    user_id = uuid4()
+    stream = notification_stream.stream_notifications(user_id)
+
+    assert (await next_frame(stream)).startswith("retry:")
+    # Let the hub reader start polling before publishing
+    pending = asyncio.ensure_future(next_frame(stream))
+    await asyncio.sleep(0.05)
+
+    now = datetime.now(timezone.utc)
+    await notification_stream.publish_notifications([
+        make_row(uuid4(), now, 0),
+        make_row(user_id, now, 1),
+    ])
+
+    frame = parse(await pending)
+    assert frame["data"]["payload"] == {"n": 1}
+    assert notification_stream.get_notification_stream_stats() == {"channels": 1, "streams": 1}
+
+    await stream.aclose()
+    assert notification_stream.get_notification_stream_stats() == {"channels": 0, "streams": 0}
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_gap_then_skips_duplicates(stream_env):
+    user_id = uuid4()
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+    rows = [make_row(user_id, start + timedelta(seconds=i), i) for i in range(3)]
+
+    async with stream_env() as session:
+        session.add_all([Notification(**row) for row in rows])
+        await session.commit()
+
+    last_seen = encode_created_at_cursor(rows[0]["created_at"], rows[0]["id"])
+    stream = notification_stream.stream_notifications(user_id, last_seen)
+
+    await next_frame(stream)
+    replayed = [parse(await next_frame(stream))["data"]["payload"]["n"] for _ in range(2)]
+    assert replayed == [1, 2]
+
+    # Already replayed: dropped. Newer: delivered.
+    pending = asyncio.ensure_future(next_frame(stream))
+    await asyncio.sleep(0.05)
+    await notification_stream.publish_notifications([
+        rows[2],
+        make_row(user_id, start + timedelta(seconds=10), 3),
+    ])
+
+    assert parse(await pending)["data"]["payload"] == {"n": 3}
+
+    await stream.aclose()
+
+
+def test_slow_listener_is_closed_instead_of_buffering(monkeypatch):
+    monkeypatch.setattr(notification_stream, "SSE_QUEUE_SIZE", 2)
+    listener = NotificationListener(uuid4())
+
+    for i in range(5):
+        listener.deliver({"n": i})
+
+    assert listener.closed
+    assert listener.queue.qsize() <= 2
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_when_session_is_revoked(stream_env, monkeypatch):
+    monkeypatch.setattr(notification_stream, "SSE_HEARTBEAT_SECONDS", 0.05)
+    stream = notification_stream.stream_notifications(
+        await make_user(stream_env),
+        session_id="sid-1",
+        expires_at=time.time() + 3600,
+    )
+
+    await next_frame(stream)
+    assert await next_frame(stream) == ": keepalive\n\n"
+    # Survives a session check while still valid
+    assert await next_frame(stream) == ": keepalive\n\n"
+
+    await redis_cache.redis_client.set("revoked:sid-1", "1")
+
+    with pytest.raises(StopAsyncIteration):
+        while True:
+            await next_frame(stream)
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_when_token_expires(stream_env, monkeypatch):
+    monkeypatch.setattr(notification_stream, "SSE_HEARTBEAT_SECONDS", 0.05)
+    stream = notification_stream.stream_notifications(
+        await make_user(stream_env),
+        session_id="sid-1",
+        expires_at=time.time() + 0.1,
+    )
+
+    with pytest.raises(StopAsyncIteration):
+        while True:
+            await next_frame(stream)
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_when_account_is_locked(stream_env, monkeypatch):
+    monkeypatch.setattr(notification_stream, "SSE_HEARTBEAT_SECONDS", 0.05)
+    locked = await make_user(stream_env, locked_until=datetime.now(timezone.utc) + timedelta(minutes=15))
+    stream = notification_stream.stream_notifications(
+        locked,
+        session_id="sid-1",
+        expires_at=time.time() + 3600,
+    )
+
+    with pytest.raises(StopAsyncIteration):
+        while True:
+            await next_frame(stream)
+
+
+@pytest.mark.asyncio
+async def test_failed_subscribe_leaves_no_listener(stream_env):
+    hub = notification_stream.hub
+    user_id = uuid4()
+
+    async def fail(*channels):
+        raise RedisConnectionError("down")
+
+    listener = await hub.subscribe(uuid4())
+    hub._pubsub.subscribe = fail
+
+    with pytest.raises(RedisConnectionError):
+        await hub.subscribe(user_id)
+
+    assert hub.stats() == {"channels": 1, "streams": 1}
+
+    del hub._pubsub.subscribe
+    await hub.unsubscribe(listener)
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.api.deps.reply_tree import build_reply_tree
+
+
+def make_reply(depth, parent=None):
+    return SimpleNamespace(
+        id=uuid4(),
+        parent_reply_id=parent.id if parent else None,
+        depth=depth,
+    )
+
+
+@pytest.mark.asyncio
+async def test_flat_window_is_assembled_into_tree():
+    root = make_reply(1)
+    child = make_reply(2, root)
+    grandchild = make_reply(3, child)
+    other_root = make_reply(1)
+
+    tree = await build_reply_tree([root, other_root, child, grandchild])
+
+    assert tree == [root, other_root]
+    assert root.children == [child]
+    assert child.children == [grandchild]
+    assert other_root.children == []
+
+
+@pytest.mark.asyncio
+async def test_replies_at_max_depth_are_left_for_lazy_loading():
+    root = make_reply(1)
+    child = make_reply(2, root)
+
+    await build_reply_tree([root, child], max_depth=2)
+
+    assert root.children == [child]
+    assert child.children is None
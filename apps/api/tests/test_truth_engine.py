@@ -0,0 +1,25 @@
+from app.services.truth_engine import derive_truth, evidence_score
+
+
+def test_derive_truth_matches_full_rescan_rules():
+    scores = [("supports", 0.9), ("supports", None), ("contradicts", 0.4)]
+
+    support = sum(evidence_score(s) for d, s in scores if d == "supports")
+    contradict = sum(evidence_score(s) for d, s in scores if d != "supports")
+
+    truth_score, confidence = derive_truth(support, contradict, len(scores))
+
+    assert abs(truth_score - 0.9) < 1e-9
+    assert abs(confidence - 0.6) < 1e-9
+
+
+def test_derive_truth_clamps_and_resets():
+    assert derive_truth(5.0, 0.0, 12) == (1, 1)
+    assert derive_truth(0.0, 5.0, 2)[0] == 0.0
+    assert derive_truth(0.0, 0.0, 0) == (None, None)
+
+
+def test_zero_credibility_weighs_the_default_like_unrated():
+    # Baseline rule was `credibility_score or 0.3`; tampered evidence is rated 0.0
+    assert evidence_score(0.0) == evidence_score(None) == 0.3
+    assert evidence_score(0.8) == 0.8
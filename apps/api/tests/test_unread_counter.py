@@ -0,0 +1,70 @@
+from uuid import uuid4
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.cache import redis as redis_cache
+from app.core.models.notification import Notification
+from app.services import unread_counter
+
+
+@pytest_asyncio.fixture()
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Notification.metadata.create_all(sync_conn, tables=[Notification.__table__])
+        )
+
+    async with AsyncSession(engine) as session:
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.fixture()
+def redis(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_cache, "redis_client", client)
+    return client
+
+
+async def add_unread(db, user_id, n):
+    db.add_all([Notification(user_id=user_id, type="mention", payload={}) for _ in range(n)])
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_counter_rebuilds_lazily_then_tracks_writes(db, redis):
+    user_id = uuid4()
+    await add_unread(db, user_id, 3)
+
+    # Writers never create a counter from a delta
+    await unread_counter.increment_unread_counts([user_id])
+    assert await redis.get(unread_counter._unread_key(user_id)) is None
+
+    assert await unread_counter.get_cached_unread_count(db, user_id) == 3
+
+    await unread_counter.increment_unread_counts([user_id, user_id])
+    await unread_counter.decrement_unread_count(user_id)
+    assert await unread_counter.get_cached_unread_count(db, user_id) == 4
+
+    await unread_counter.decrement_unread_count(user_id, 10)
+    assert await unread_counter.get_cached_unread_count(db, user_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_corrects_drifted_counters(db, redis):
+    drifted, accurate = uuid4(), uuid4()
+    await add_unread(db, drifted, 2)
+    await add_unread(db, accurate, 1)
+
+    await redis.set(unread_counter._unread_key(drifted), 7)
+    await redis.set(unread_counter._unread_key(accurate), 1)
+
+    assert await unread_counter.sweep_unread_counters(db, batch_size=1) == 1
+    assert await redis.get(unread_counter._unread_key(drifted)) == "2"
+    assert await redis.get(unread_counter._unread_key(accurate)) == "1"